@@ -1,5 +1,33 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from app_auth.tokens import RevocableRefreshToken
+
+
+class DuplicateUserError(Exception):
+    """Raised by `RegistrationSerializer.save` for a taken username/email.
+
+    Attributes:
+    - field (str): `"username"` or `"email"`.
+    - message (str): The client-facing error message for `field`.
+    """
+
+    MESSAGES = {
+        "username": "A user with this username already exists.",
+        "email": "A user with this email already exists.",
+    }
+
+    def __init__(self, field: str):
+        self.field = field
+        self.message = self.MESSAGES[field]
+        super().__init__(self.message)
+
+    @classmethod
+    def from_integrity_error(cls, exc: IntegrityError) -> "DuplicateUserError":
+        """Return the error for the unique constraint violated in `exc`."""
+        return cls("email" if "email" in str(exc).lower() else "username")
 
 
 class RegistrationSerializer(serializers.ModelSerializer):
@@ -11,10 +39,13 @@ class RegistrationSerializer(serializers.ModelSerializer):
 
     Validation:
     - `validate_confirmed_password` ensures the two password fields match.
-    - `validate_email` checks uniqueness of the email address.
 
-    The `save` method creates the `User` instance and sets the hashed
-    password using `set_password`.
+    Uniqueness of `username` and `email` is not checked with queries; the
+    database enforces it (see `app_auth.migrations.0002_user_email_unique`)
+    and `save` raises `DuplicateUserError` when the single INSERT violates
+    one of those constraints.
+
+    The `save` method creates the `User` instance with a hashed password.
     """
 
     confirmed_password = serializers.CharField(write_only=True)
@@ -25,6 +56,8 @@ class RegistrationSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             "password": {"write_only": True},
             "email": {"required": True, "allow_blank": False},
+            # Drop the UniqueValidator query; the unique constraint decides.
+            "username": {"validators": [User.username_validator]},
         }
 
     def validate_confirmed_password(self, value):
@@ -38,19 +71,29 @@ class RegistrationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Passwords do not match")
         return value
 
-    def validate_email(self, value):
-        """Validate email uniqueness. Raises ValidationError if already used."""
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("Email already exists")
-        return value
-
     def save(self):
-        """Create and return a new `User` with a hashed password."""
-        pw = self.validated_data["password"]
+        """Create and return a new `User` with a hashed password.
 
+        Raises `DuplicateUserError` when the username or email is taken.
+        """
         account = User(
-            email=self.validated_data["email"], username=self.validated_data["username"]
+            email=self.validated_data["email"],
+            username=self.validated_data["username"],
+            password=make_password(self.validated_data["password"]),
         )
-        account.set_password(pw)
-        account.save()
+        try:
+            with transaction.atomic():
+                account.save(force_insert=True)
+        except IntegrityError as exc:
+            raise DuplicateUserError.from_integrity_error(exc) from exc
         return account
+
+
+class CookieTokenRefreshSerializer(TokenRefreshSerializer):
+    """`TokenRefreshSerializer` that rejects revoked refresh tokens.
+
+    Revocation is checked while the token is verified, before the user is
+    loaded, so a revoked token costs no user query.
+    """
+
+    token_class = RevocableRefreshToken
@@ -0,0 +1,153 @@
+"""Sliding-window rate limits for the unauthenticated auth endpoints.
+
+`LoginView` and `RegistrationView` hash passwords with PBKDF2, so a burst
+of attempts can saturate every CPU. The throttles below run in DRF's
+`check_throttles` step, before the request body is validated, so rejected
+requests cost neither a password hash nor a database query.
+
+Each key uses the sliding-window counter approximation: one counter for the
+current fixed window and one for the previous window, weighted by how much
+of the previous window still overlaps the sliding window. That is two
+integers per key, independent of the rate, instead of one timestamp per
+request like DRF's `SimpleRateThrottle`.
+
+Counters and rejection totals live in the cache `AUTH_STATE_CACHE_ALIAS`;
+use a shared cache backend so limits apply across worker processes.
+
+Settings:
+- `AUTH_THROTTLE_RATES`: Mapping of scope to rate ("<count>/<period>",
+  period s/m/h/d as in DRF) or None to disable the scope.
+"""
+
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+_DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def get_cache():
+    return caches[settings.AUTH_STATE_CACHE_ALIAS]
+
+
+def parse_rate(rate):
+    """Return `(num_requests, duration_seconds)` for a rate like "5/min"."""
+    if rate is None:
+        return None, None
+    num, period = rate.split("/")
+    return int(num), _DURATIONS[period[0]]
+
+
+def _rejections_key(scope: str) -> str:
+    return f"throttle:rejections:{scope}"
+
+
+def rejection_counts() -> dict:
+    """Return the number of rejected requests per throttle scope."""
+    scopes = list(settings.AUTH_THROTTLE_RATES)
+    counts = get_cache().get_many([_rejections_key(scope) for scope in scopes])
+    return {scope: counts.get(_rejections_key(scope), 0) for scope in scopes}
+
+
+def _incr(cache, key, timeout) -> None:
+    if not cache.add(key, 1, timeout=timeout):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # The key expired between add() and incr().
+            cache.set(key, 1, timeout=timeout)
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """Base class: limit requests per `get_ident_key()` within a sliding window.
+
+    Subclasses set `scope` (a key of `settings.AUTH_THROTTLE_RATES`) and
+    implement `get_ident_key()`; returning None skips the throttle.
+    """
+
+    scope = None
+
+    def get_ident_key(self, request, view) -> str | None:
+        raise NotImplementedError(".get_ident_key() must be overridden")
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        num_requests, duration = parse_rate(
+            settings.AUTH_THROTTLE_RATES.get(self.scope)
+        )
+        if num_requests is None:
+            return True
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return True
+
+        now = time.time()
+        window = int(now // duration)
+        elapsed = (now - window * duration) / duration
+        current_key = f"throttle:{self.scope}:{ident}:{window}"
+        previous_key = f"throttle:{self.scope}:{ident}:{window - 1}"
+
+        cache = get_cache()
+        counts = cache.get_many([current_key, previous_key])
+        previous = counts.get(previous_key, 0)
+        current = counts.get(current_key, 0)
+        estimate = previous * (1 - elapsed) + current
+        if estimate >= num_requests:
+            self.wait_seconds = self._wait(
+                previous, current, num_requests, elapsed, duration
+            )
+            _incr(cache, _rejections_key(self.scope), None)
+            logger.warning("Throttled %s request for %s", self.scope, ident)
+            return False
+
+        _incr(cache, current_key, duration * 2)
+        return True
+
+    @staticmethod
+    def _wait(previous, current, num_requests, elapsed, duration) -> float:
+        """Seconds until the weighted count drops below `num_requests`."""
+        if current >= num_requests:
+            return (1 - elapsed) * duration
+        # previous * (1 - elapsed - t / duration) + current < num_requests
+        needed = 1 - elapsed - (num_requests - current) / previous
+        return max(0.0, needed * duration)
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPThrottle(SlidingWindowThrottle):
+    """Limit requests per client IP (honours DRF's `NUM_PROXIES`)."""
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class UsernameThrottle(SlidingWindowThrottle):
+    """Limit attempts per submitted username, from any IP."""
+
+    def get_ident_key(self, request, view):
+        username = (
+            request.data.get("username") if hasattr(request.data, "get") else None
+        )
+        if not isinstance(username, str) or not username:
+            return None
+        return hashlib.sha1(username.lower().encode("utf-8")).hexdigest()
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = "login_ip"
+
+
+class LoginUsernameThrottle(UsernameThrottle):
+    scope = "login_username"
+
+
+class RegistrationIPThrottle(IPThrottle):
+    scope = "register_ip"
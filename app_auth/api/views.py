@@ -1,43 +1,48 @@
-from django.contrib.auth import authenticate
 from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from .serializers import RegistrationSerializer
-from django.contrib.auth.models import User
+from app_auth import auth_cache, revocation
+from .serializers import (
+    CookieTokenRefreshSerializer,
+    DuplicateUserError,
+    RegistrationSerializer,
+)
+from .throttles import LoginIPThrottle, LoginUsernameThrottle, RegistrationIPThrottle
 from django.conf import settings
 
 class RegistrationView(APIView):
     """API endpoint to register a new user.
 
     Accepts POST requests with `username`, `email`, `password`, and
-    `confirmed_password`. Performs basic uniqueness checks for username and
-    email, delegates detailed validation to `RegistrationSerializer`, and
-    returns HTTP 201 on success.
+    `confirmed_password`. Validation is delegated to `RegistrationSerializer`;
+    username and email uniqueness are enforced by the database on the single
+    INSERT, so a duplicate is reported as HTTP 400 without any lookup
+    queries. Returns HTTP 201 on success.
+
+    Requests are rate limited per client IP (`RegistrationIPThrottle`)
+    before any validation or database work. Like login, the view does not
+    authenticate auth cookies, so a throttled request costs no token check.
     """
 
+    authentication_classes = []
     permission_classes = [AllowAny]
+    throttle_classes = [RegistrationIPThrottle]
 
     def post(self, request):
         serializer = RegistrationSerializer(data=request.data)
-        username = request.data.get("username")
-        email = request.data.get("email")
-
-        if User.objects.filter(username=username).exists():
-            return Response(
-                {"username": "A user with this username already exists."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        if User.objects.filter(email=email).exists():
-            return Response(
-                {"email": "A user with this email already exists."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
 
         if serializer.is_valid():
-            serializer.save()
+            try:
+                serializer.save()
+            except DuplicateUserError as exc:
+                return Response(
+                    {exc.field: exc.message}, status=status.HTTP_400_BAD_REQUEST
+                )
             return Response(
                 {"detail": "User created successfully!"}, status=status.HTTP_201_CREATED
             )
@@ -50,33 +55,44 @@ class LoginView(TokenObtainPairView):
 
     Expects `username` and `password` in the POST body. On success, sets
     `access_token` and `refresh_token` cookies and returns basic user info.
+
+    Credentials are verified exactly once: `TokenObtainPairSerializer`
+    authenticates the user (one password hash) and issues the token pair
+    from that same result, which the view turns into cookies directly.
+
+    Attempts are rate limited per client IP and per username before the
+    password is hashed (HTTP 429, see `throttles`).
     """
 
     permission_classes = [AllowAny]
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
 
-
-        try:    
+        try:
             serializer.is_valid(raise_exception=True)
-        except Exception:
-            return Response({"error": "Username oder Passwort falsch"}, status=status.HTTP_401_UNAUTHORIZED)
-        
-        user = authenticate(username=request.data.get("username"), password=request.data.get("password"))
-
-        if not user:
+        except (ValidationError, AuthenticationFailed, TokenError):
             return Response(
                 {"error": "Username oder Passwort falsch"},
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        response = super().post(request, *args, **kwargs)
-
-
+        user = serializer.user
         access_token = serializer.validated_data.get("access")
         refresh_token = serializer.validated_data.get("refresh")
 
+        response = Response(
+            {
+                "detail": "Login successfully!",
+                "user": {
+                    "id": user.id,
+                    "username": user.username,
+                    "email": user.email,
+                },
+            },
+            status=status.HTTP_200_OK,
+        )
 
         cookie_settings = {
             "httponly": True,
@@ -87,25 +103,28 @@ class LoginView(TokenObtainPairView):
         response.set_cookie(key="access_token", value=access_token, **cookie_settings)
         response.set_cookie(key="refresh_token", value=refresh_token, **cookie_settings)
 
-        response.data = {
-            "detail": "Login successfully!",
-            "user": {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-            },
-        }
-
         return response
 
 
 class LogoutView(APIView):
     """Log out the current user by deleting authentication cookies.
 
-    Returns HTTP 200 and clears `access_token` and `refresh_token` cookies.
+    Revokes the current access token (see `app_auth.auth_cache`) and the
+    refresh token from the `refresh_token` cookie (see
+    `app_auth.revocation`) so neither works if a copy of the cookies is
+    replayed, then returns HTTP 200 and clears both cookies.
     """
 
     def post(self, request):
+        if request.auth is not None and hasattr(request.auth, "get"):
+            auth_cache.revoke_access_token(request.auth)
+        refresh_token = request.COOKIES.get("refresh_token")
+        if refresh_token:
+            try:
+                revocation.revoke(RefreshToken(refresh_token))
+            except TokenError:
+                # Already expired or invalid; nothing left to revoke.
+                pass
         response = Response(
             {
                 "detail": "Log-Out successfully! All Tokens will be deleted. Refresh token is now invalid."
@@ -122,8 +141,11 @@ class CookieTokenRefreshView(TokenRefreshView):
 
     Reads the `refresh_token` cookie, validates it via the serializer, and
     returns a new `access` token. On success, sets a new `access_token` cookie.
+    Refresh tokens revoked by `LogoutView` are rejected with HTTP 401.
     """
 
+    serializer_class = CookieTokenRefreshSerializer
+
     def post(self, request, *args, **kwargs):
         refresh_token = request.COOKIES.get("refresh_token")
         if refresh_token is None:
@@ -4,3 +4,18 @@ from django.apps import AppConfig
 class AppAuthConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app_auth"
+
+    def ready(self):
+        from app_auth import signals  # noqa: F401
+        from app_auth.api import throttles
+        from core import metrics
+
+        metrics.register_collector(
+            "quizly_throttle_rejections_total",
+            "counter",
+            "Requests rejected by the auth throttles per scope.",
+            lambda: [
+                ({"scope": scope}, count)
+                for scope, count in throttles.rejection_counts().items()
+            ],
+        )
@@ -0,0 +1,127 @@
+"""Cached user resolution and access-token invalidation.
+
+`CookieJWTAuthentication` can resolve the request user without a database
+query (see `settings.AUTH_USER_RESOLUTION`):
+
+- `db`: Load the user from the database on every request (default).
+- `cache`: Keep user objects in a short-lived per-process cache keyed by
+  `(user_id, iat)`.
+- `claims`: For safe methods (GET/HEAD/OPTIONS) return a `TokenUser` built
+  from the token claims; writes still load the real user.
+
+Because cached or claims-only users can no longer notice a password change,
+a deactivation or a logout on their own, those events are recorded in the
+Django cache and checked on every request in every mode:
+
+- `invalidate_user()` stores a "valid after" timestamp for the user. Access
+  tokens issued earlier are rejected (password change, deactivation).
+- `revoke_access_token()` blocks one token's `jti` until it expires (logout).
+
+Both checks are a single cache `get_many` and never touch the database.
+With the local-memory cache backend they are per process; use a shared
+cache backend to propagate them across worker processes.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework_simplejwt.settings import api_settings
+
+
+_users = OrderedDict()
+_users_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[settings.AUTH_STATE_CACHE_ALIAS]
+
+
+def _user_key(user_id) -> str:
+    # The id claim is a string in tokens and an int on model instances.
+    return str(user_id)
+
+
+def _valid_after_key(user_id) -> str:
+    return f"auth:user-valid-after:{_user_key(user_id)}"
+
+
+def _revoked_access_key(jti) -> str:
+    return f"auth:revoked-access:{jti}"
+
+
+def _access_lifetime_seconds() -> int:
+    return int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+
+
+def is_token_invalidated(validated_token) -> bool:
+    """Return True if `validated_token` was revoked or predates invalidation."""
+    user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+    jti = validated_token.get(api_settings.JTI_CLAIM)
+    keys = [_valid_after_key(user_id), _revoked_access_key(jti)]
+    state = get_cache().get_many(keys)
+    if state.get(keys[1]):
+        return True
+    valid_after = state.get(keys[0])
+    return valid_after is not None and validated_token.get("iat", 0) < valid_after
+
+
+def invalidate_user(user_id) -> None:
+    """Reject access tokens of `user_id` issued before now and drop cache entries.
+
+    Tokens issued within the current second stay valid, so a login right
+    after a password change is not rejected.
+    """
+    get_cache().set(
+        _valid_after_key(user_id), int(time.time()), _access_lifetime_seconds()
+    )
+    with _users_lock:
+        for key in [key for key in _users if key[0] == _user_key(user_id)]:
+            del _users[key]
+
+
+def revoke_access_token(validated_token) -> None:
+    """Block a single access token until its expiry (used on logout)."""
+    jti = validated_token.get(api_settings.JTI_CLAIM)
+    remaining = int(validated_token.get("exp", 0) - time.time())
+    if jti and remaining > 0:
+        get_cache().set(_revoked_access_key(jti), True, remaining)
+    user_id = _user_key(validated_token.get(api_settings.USER_ID_CLAIM))
+    with _users_lock:
+        _users.pop((user_id, validated_token.get("iat")), None)
+
+
+def get_user(validated_token, loader):
+    """Return the user for `validated_token`, calling `loader` on a miss.
+
+    Entries expire after `AUTH_USER_CACHE_TTL` seconds; the cache holds at
+    most `AUTH_USER_CACHE_SIZE` users (least recently used are dropped).
+    Callers receive a shallow copy so per-request changes do not leak.
+    """
+    key = (
+        _user_key(validated_token.get(api_settings.USER_ID_CLAIM)),
+        validated_token.get("iat"),
+    )
+    now = time.monotonic()
+    with _users_lock:
+        entry = _users.get(key)
+        if entry is not None and entry[0] > now:
+            _users.move_to_end(key)
+            return copy.copy(entry[1])
+
+    user = loader(validated_token)
+    with _users_lock:
+        _users[key] = (now + settings.AUTH_USER_CACHE_TTL, user)
+        _users.move_to_end(key)
+        while len(_users) > settings.AUTH_USER_CACHE_SIZE:
+            _users.popitem(last=False)
+    return copy.copy(user)
+
+
+def clear() -> None:
+    """Drop all cached users (used by tests)."""
+    with _users_lock:
+        _users.clear()
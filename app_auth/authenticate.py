@@ -1,7 +1,43 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from . import auth_cache
+
+
+class ClaimsUser(TokenUser):
+    """`TokenUser` whose `id`/`pk` has the type of the user model's primary key.
+
+    simplejwt stores the user id claim as a string; converting it back lets
+    views compare `request.user.id` with foreign keys like `creator_id`.
+    """
+
+    @cached_property
+    def id(self):
+        return get_user_model()._meta.pk.to_python(
+            self.token[api_settings.USER_ID_CLAIM]
+        )
+
+    @cached_property
+    def pk(self):
+        return self.id
 
 
 class CookieJWTAuthentication(JWTAuthentication):
+    """Authenticate requests with the JWT stored in the `access_token` cookie.
+
+    How the user is resolved depends on `settings.AUTH_USER_RESOLUTION`
+    (`db`, `cache` or `claims`, see `app_auth.auth_cache`). In every mode
+    tokens invalidated by a logout, password change or deactivation are
+    rejected without a database query.
+    """
+
     def authenticate(self, request):
         raw_token = request.COOKIES.get('access_token') or None
 
@@ -9,4 +45,17 @@ class CookieJWTAuthentication(JWTAuthentication):
             return None
 
         validated_token = self.get_validated_token(raw_token)
-        return self.get_user(validated_token), validated_token
+        if auth_cache.is_token_invalidated(validated_token):
+            raise AuthenticationFailed("Token has been revoked.", code="token_revoked")
+        return self.resolve_user(request, validated_token), validated_token
+
+    def resolve_user(self, request, validated_token):
+        """Return the request user according to `AUTH_USER_RESOLUTION`."""
+        mode = settings.AUTH_USER_RESOLUTION
+        if mode == "claims" and request.method in SAFE_METHODS:
+            if api_settings.USER_ID_CLAIM not in validated_token:
+                raise InvalidToken("Token contained no recognizable user identification")
+            return ClaimsUser(validated_token)
+        if mode in ("cache", "claims"):
+            return auth_cache.get_user(validated_token, self.get_user)
+        return self.get_user(validated_token)
@@ -0,0 +1,187 @@
+"""Bulk-create users from a CSV or NDJSON file.
+
+Usage:
+    python manage.py import_users users.csv [--batch-size 500] [--workers 4]
+
+Each record needs `username`, `email` and `password` (`confirmed_password`
+defaults to `password`). Records are streamed, validated with the same
+rules as `RegistrationSerializer`, hashed in parallel on a process pool and
+inserted with one `bulk_create` per batch. Invalid records and duplicates
+(within the file or already in the database) are reported and skipped.
+"""
+
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from app_auth.api.serializers import DuplicateUserError, RegistrationSerializer
+
+
+def _init_worker():
+    # Needed with the "spawn" start method; harmless in forked workers.
+    django.setup()
+
+
+def read_records(fh, fmt):
+    """Yield `(line_number, record)` pairs from an open CSV/NDJSON file.
+
+    Unparseable NDJSON lines are yielded as `(line_number, None)`.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(fh)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(fh, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield line_number, record if isinstance(record, dict) else None
+
+
+class Command(BaseCommand):
+    help = "Bulk-create users from a CSV or NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON (.ndjson/.jsonl) file.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="File format; inferred from the file extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Users per bulk_create batch (default: 500).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Hashing processes; 0 hashes in this process (default: CPUs).",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or (
+            "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+        )
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        self.workers = options["workers"]
+        self.stats = {"created": 0, "duplicates": 0, "invalid": 0}
+        self.seen_usernames = set()
+        self.seen_emails = set()
+        executor = (
+            ProcessPoolExecutor(self.workers, initializer=_init_worker)
+            if self.workers > 0
+            else None
+        )
+        try:
+            with open(path, newline="", encoding="utf-8") as fh:
+                valid = self.validated(read_records(fh, fmt))
+                while batch := list(islice(valid, options["batch_size"])):
+                    self.insert_batch(batch, executor)
+        except OSError as exc:
+            raise CommandError(f"Cannot read {path}: {exc}") from exc
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Created {created} users, skipped {duplicates} duplicates "
+                "and {invalid} invalid records.".format(**self.stats)
+            )
+        )
+
+    def skip(self, line_number, kind, reason):
+        self.stats[kind] += 1
+        self.stdout.write(self.style.WARNING(f"Line {line_number}: {reason}"))
+
+    def validated(self, records):
+        """Yield `(line_number, validated_data)` for new, valid records."""
+        for line_number, record in records:
+            if record is None:
+                self.skip(line_number, "invalid", "not a JSON object")
+                continue
+            data = dict(record)
+            data.setdefault("confirmed_password", data.get("password"))
+            serializer = RegistrationSerializer(data=data)
+            if not serializer.is_valid():
+                self.skip(line_number, "invalid", json.dumps(serializer.errors))
+                continue
+            username = serializer.validated_data["username"]
+            email = serializer.validated_data["email"]
+            if username in self.seen_usernames:
+                self.skip(line_number, "duplicates", f"duplicate username {username!r}")
+                continue
+            if email in self.seen_emails:
+                self.skip(line_number, "duplicates", f"duplicate email {email!r}")
+                continue
+            self.seen_usernames.add(username)
+            self.seen_emails.add(email)
+            yield line_number, serializer.validated_data
+
+    def insert_batch(self, batch, executor):
+        """Drop users that already exist, hash passwords and bulk-insert."""
+        taken = User.objects.filter(
+            Q(username__in=[data["username"] for _, data in batch])
+            | Q(email__in=[data["email"] for _, data in batch])
+        ).values_list("username", "email")
+        taken_usernames, taken_emails = set(), set()
+        for username, email in taken:
+            taken_usernames.add(username)
+            taken_emails.add(email)
+        new = []
+        for line_number, data in batch:
+            if data["username"] in taken_usernames:
+                error = DuplicateUserError("username")
+            elif data["email"] in taken_emails:
+                error = DuplicateUserError("email")
+            else:
+                new.append((line_number, data))
+                continue
+            self.skip(line_number, "duplicates", error.message)
+        if not new:
+            return
+
+        passwords = [data["password"] for _, data in new]
+        if executor is None:
+            hashes = [make_password(password) for password in passwords]
+        else:
+            chunksize = max(1, len(passwords) // (self.workers * 4))
+            hashes = list(executor.map(make_password, passwords, chunksize=chunksize))
+        users = [
+            User(username=data["username"], email=data["email"], password=hashed)
+            for (_, data), hashed in zip(new, hashes)
+        ]
+
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+            self.stats["created"] += len(users)
+        except IntegrityError:
+            # A user was registered concurrently; insert one by one.
+            for (line_number, _), user in zip(new, users):
+                try:
+                    with transaction.atomic():
+                        user.save(force_insert=True)
+                    self.stats["created"] += 1
+                except IntegrityError as exc:
+                    error = DuplicateUserError.from_integrity_error(exc)
+                    self.skip(line_number, "duplicates", error.message)
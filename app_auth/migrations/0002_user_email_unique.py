@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Enforce unique non-empty emails on `auth_user` with a partial index.
+
+    `RegistrationSerializer.save` relies on this index instead of querying
+    for an existing email before the INSERT. Blank emails (e.g. superusers
+    created without one) stay allowed.
+    """
+
+    dependencies = [
+        ("app_auth", "0001_initial"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX auth_user_email_uniq ON auth_user (email) "
+            "WHERE email <> ''",
+            reverse_sql="DROP INDEX auth_user_email_uniq",
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Index `RevokedToken.revoked_at` for the incremental revocation sync.
+
+    `app_auth.revocation` reads new revocations by `revoked_at` instead of
+    by primary key, see `_sync`.
+    """
+
+    dependencies = [
+        ("app_auth", "0002_user_email_unique"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="revokedtoken",
+            name="revoked_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
@@ -1,3 +1,17 @@
 from django.db import models
 
-# Create your models here.
+
+class RevokedToken(models.Model):
+    """A refresh token revoked before its expiry (e.g. by logout).
+
+    Rows are keyed by the token's `jti` and only need to be kept until
+    `expires_at`; afterwards the token is rejected anyway and the row is
+    pruned (see `app_auth.revocation`).
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.jti
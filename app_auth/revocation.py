@@ -0,0 +1,222 @@
+"""Revocation store for refresh tokens.
+
+Revoked refresh tokens are stored in the `RevokedToken` table keyed by
+`jti` until they expire. Every refresh has to check that table, so each
+process keeps a Bloom filter of all revoked `jti`s in front of it:
+
+- Not in the filter (the common case): the token is not revoked and the
+  database is not queried.
+- In the filter: confirm with one indexed lookup, since Bloom filters can
+  report false positives (rate `REFRESH_REVOCATION_FALSE_POSITIVE_RATE`).
+
+The filter is built from the table on first use. Revocations made by other
+processes are picked up incrementally whenever the revocation counter in
+the Django cache changes, and at the latest after
+`REFRESH_REVOCATION_SYNC_INTERVAL` seconds, so a local-memory cache still
+converges across worker processes.
+
+The incremental sync reads rows by `revoked_at` and re-reads the last
+`REFRESH_REVOCATION_SYNC_OVERLAP` seconds each time. Primary keys cannot
+be used as a high-water mark: on PostgreSQL or MySQL ids are assigned
+before commit, so a row committed after a higher id was seen would be
+skipped for good. The overlap has to cover the longest revoking
+transaction plus the clock skew between application servers.
+
+Expired rows are deleted at most every `REFRESH_REVOCATION_PRUNE_INTERVAL`
+seconds when a token is revoked; the filter is rebuilt afterwards because
+Bloom filters cannot forget entries.
+
+Settings:
+- `REFRESH_REVOCATION_BLOOM_CAPACITY`: Minimum number of entries the filter
+  is sized for; it grows when the table holds more.
+- `REFRESH_REVOCATION_FALSE_POSITIVE_RATE`: Target false positive rate.
+- `REFRESH_REVOCATION_SYNC_INTERVAL`: Max. staleness in seconds.
+- `REFRESH_REVOCATION_SYNC_OVERLAP`: Seconds of `revoked_at` re-read by
+  every incremental sync.
+- `REFRESH_REVOCATION_PRUNE_INTERVAL`: Min. seconds between prunes.
+- `AUTH_STATE_CACHE_ALIAS`: Cache holding the revocation counter.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from app_auth.models import RevokedToken
+
+_COUNTER_KEY = "auth:refresh-revocations"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing."""
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = max(
+            8,
+            math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2),
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+class _State:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bloom = None
+        # `revoked_at` up to which the table has been read, and the jtis of
+        # the overlap window that are already in the filter.
+        self.synced_until = None
+        self.recent = {}
+        self.counter = None
+        self.synced_at = 0.0
+        self.pruned_at = time.monotonic()
+
+
+_state = _State()
+
+
+def get_cache():
+    return caches[settings.AUTH_STATE_CACHE_ALIAS]
+
+
+def _overlap() -> timedelta:
+    return timedelta(seconds=settings.REFRESH_REVOCATION_SYNC_OVERLAP)
+
+
+def _rebuild() -> None:
+    """Reload the filter from all unexpired rows (caller holds the lock)."""
+    started = timezone.now()
+    rows = RevokedToken.objects.filter(expires_at__gt=started)
+    bloom = BloomFilter(
+        max(settings.REFRESH_REVOCATION_BLOOM_CAPACITY, rows.count() * 2),
+        settings.REFRESH_REVOCATION_FALSE_POSITIVE_RATE,
+    )
+    since = started - _overlap()
+    recent = {}
+    for jti, revoked_at in rows.values_list("jti", "revoked_at").iterator(
+        chunk_size=10000
+    ):
+        bloom.add(jti)
+        if revoked_at >= since:
+            recent[jti] = revoked_at
+    _state.bloom = bloom
+    _state.recent = recent
+    _state.synced_until = started
+
+
+def _sync(force: bool = False) -> BloomFilter:
+    """Bring the filter up to date with revocations from other processes."""
+    now = time.monotonic()
+    counter = get_cache().get(_COUNTER_KEY)
+    with _state.lock:
+        if _state.bloom is None:
+            _rebuild()
+        elif (
+            force
+            or counter != _state.counter
+            or now - _state.synced_at >= settings.REFRESH_REVOCATION_SYNC_INTERVAL
+        ):
+            started = timezone.now()
+            new_rows = RevokedToken.objects.filter(
+                revoked_at__gte=_state.synced_until - _overlap()
+            )
+            for jti, revoked_at in new_rows.values_list("jti", "revoked_at"):
+                if jti not in _state.recent:
+                    _state.bloom.add(jti)
+                    _state.recent[jti] = revoked_at
+            since = started - _overlap()
+            _state.recent = {
+                jti: revoked_at
+                for jti, revoked_at in _state.recent.items()
+                if revoked_at >= since
+            }
+            _state.synced_until = started
+            if _state.bloom.count > _state.bloom.capacity:
+                _rebuild()
+        else:
+            return _state.bloom
+        _state.counter = counter
+        _state.synced_at = now
+        return _state.bloom
+
+
+def is_revoked(jti: str) -> bool:
+    """Return True if the refresh token with `jti` has been revoked."""
+    if jti not in _sync():
+        return False
+    return RevokedToken.objects.filter(jti=jti, expires_at__gt=timezone.now()).exists()
+
+
+def revoke(token) -> None:
+    """Revoke the refresh `token` until its `exp` claim.
+
+    Parameters:
+    - token: A validated simplejwt `RefreshToken`.
+    """
+    jti = token.get(api_settings.JTI_CLAIM)
+    if not jti:
+        return
+    expires_at = datetime.fromtimestamp(token["exp"], tz=dt_timezone.utc)
+    RevokedToken.objects.bulk_create(
+        [RevokedToken(jti=jti, expires_at=expires_at)], ignore_conflicts=True
+    )
+    cache = get_cache()
+    if not cache.add(_COUNTER_KEY, 1, timeout=None):
+        try:
+            cache.incr(_COUNTER_KEY)
+        except ValueError:
+            cache.set(_COUNTER_KEY, 1, timeout=None)
+
+    if (
+        time.monotonic() - _state.pruned_at
+        >= settings.REFRESH_REVOCATION_PRUNE_INTERVAL
+    ):
+        prune_expired()
+    else:
+        _sync(force=True)
+
+
+def prune_expired() -> int:
+    """Delete expired revocations, rebuild the filter and return the count."""
+    deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    with _state.lock:
+        _rebuild()
+        _state.counter = get_cache().get(_COUNTER_KEY)
+        _state.synced_at = _state.pruned_at = time.monotonic()
+    return deleted
+
+
+def clear() -> None:
+    """Drop the in-process filter so it is rebuilt on next use (tests)."""
+    with _state.lock:
+        _state.bloom = None
+        _state.synced_until = None
+        _state.recent = {}
+        _state.counter = None
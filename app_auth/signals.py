@@ -0,0 +1,35 @@
+"""Model signal handlers for `app_auth`.
+
+Invalidate cached users and outstanding access tokens (see
+`app_auth.auth_cache`) when a user's password or active flag changes.
+"""
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+
+from . import auth_cache
+
+
+def _auth_snapshot(instance):
+    return (instance.__dict__.get("password"), instance.__dict__.get("is_active"))
+
+
+@receiver(post_init, sender=User)
+def remember_auth_fields(sender, instance, **kwargs):
+    instance._auth_snapshot = _auth_snapshot(instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_changed_user(sender, instance, created, update_fields, **kwargs):
+    if created:
+        instance._auth_snapshot = _auth_snapshot(instance)
+        return
+    if update_fields is not None and not {"password", "is_active"} & set(
+        update_fields
+    ):
+        return
+    snapshot = _auth_snapshot(instance)
+    if snapshot != getattr(instance, "_auth_snapshot", snapshot):
+        auth_cache.invalidate_user(instance.pk)
+    instance._auth_snapshot = snapshot
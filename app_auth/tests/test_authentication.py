@@ -0,0 +1,124 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import RefreshToken
+from app_auth import auth_cache
+
+
+class TestCookieJWTAuthentication(APITestCase):
+    """Tests for cached user resolution in `CookieJWTAuthentication`.
+
+    Authenticated reads must not query the user table in `cache` and
+    `claims` mode, while logouts, password changes and deactivations still
+    invalidate outstanding access tokens.
+    """
+
+    def setUp(self):
+        cache.clear()
+        auth_cache.clear()
+        self.user = User.objects.create_user(
+            username="your_username",
+            password="your_password",
+            email="email@mail.de",
+        )
+        self.client = self.client_for(self.user)
+        self.url = reverse("quiz_list")
+
+    def client_for(self, user, issued_at=None):
+        refresh = RefreshToken.for_user(user)
+        access = refresh.access_token
+        if issued_at is not None:
+            access["iat"] = int(issued_at)
+        client = APIClient()
+        client.cookies["access_token"] = str(access)
+        client.cookies["refresh_token"] = str(refresh)
+        return client
+
+    def get_counting_user_queries(self, client):
+        """GET `self.url` and return the response and number of user queries."""
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.url)
+        user_queries = [q for q in queries if '"auth_user"' in q["sql"]]
+        return response, len(user_queries)
+
+    def test_db_mode_loads_user_per_request(self):
+        self.client.get(self.url)
+        response, user_queries = self.get_counting_user_queries(self.client)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries, 1)
+        self.assertEqual(response.wsgi_request.user.pk, self.user.pk)
+
+    @override_settings(AUTH_USER_RESOLUTION="cache")
+    def test_cache_mode_resolves_user_without_queries(self):
+        self.client.get(self.url)
+        response, user_queries = self.get_counting_user_queries(self.client)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries, 0)
+        self.assertIsInstance(response.wsgi_request.user, User)
+        self.assertEqual(response.wsgi_request.user.pk, self.user.pk)
+
+    @override_settings(AUTH_USER_RESOLUTION="claims")
+    def test_claims_mode_uses_token_user_for_reads(self):
+        self.client.get(self.url)
+        response, user_queries = self.get_counting_user_queries(self.client)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries, 0)
+        self.assertIsInstance(response.wsgi_request.user, TokenUser)
+        self.assertEqual(response.wsgi_request.user.id, self.user.pk)
+
+    @override_settings(AUTH_USER_RESOLUTION="claims")
+    def test_claims_mode_loads_real_user_for_writes(self):
+        response = self.client.post(reverse("logout"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.wsgi_request.user, User)
+
+    @override_settings(AUTH_USER_RESOLUTION="cache")
+    def test_password_change_rejects_older_tokens(self):
+        client = self.client_for(self.user, issued_at=time.time() - 60)
+        self.assertEqual(client.get(self.url).status_code, status.HTTP_200_OK)
+
+        self.user.set_password("new_password")
+        self.user.save()
+
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        fresh_client = self.client_for(self.user)
+        self.assertEqual(fresh_client.get(self.url).status_code, status.HTTP_200_OK)
+
+    @override_settings(AUTH_USER_RESOLUTION="cache")
+    def test_deactivation_rejects_older_tokens(self):
+        client = self.client_for(self.user, issued_at=time.time() - 60)
+        self.assertEqual(client.get(self.url).status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unrelated_save_keeps_tokens_valid(self):
+        client = self.client_for(self.user, issued_at=time.time() - 60)
+        self.user.email = "new@mail.de"
+        self.user.save()
+        self.assertEqual(client.get(self.url).status_code, status.HTTP_200_OK)
+
+    @override_settings(AUTH_USER_RESOLUTION="claims")
+    def test_logout_revokes_access_token(self):
+        access_token = self.client.cookies["access_token"].value
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        response = self.client.post(reverse("logout"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        replay = APIClient()
+        replay.cookies["access_token"] = access_token
+        response = replay.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class TestImportUsers(TestCase):
+    """Tests for the `import_users` management command.
+
+    Valid records are created in batches with hashed passwords; invalid
+    records and duplicates are reported and skipped without aborting.
+    """
+
+    def setUp(self):
+        User.objects.create_user(
+            username="taken", password="password123", email="taken@mail.de"
+        )
+
+    def write_file(self, suffix, content):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def import_users(self, path, *args):
+        out = StringIO()
+        call_command("import_users", path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_import_csv_in_batches(self):
+        rows = ["username,email,password"] + [
+            f"user_{i},user_{i}@mail.de,password{i}" for i in range(5)
+        ]
+        path = self.write_file(".csv", "\n".join(rows) + "\n")
+
+        # Per batch: one lookup, then savepoint, INSERT and release.
+        with self.assertNumQueries(3 * 4):
+            output = self.import_users(path, "--batch-size", "2", "--workers", "0")
+
+        self.assertIn("Created 5 users, skipped 0 duplicates", output)
+        user = User.objects.get(username="user_3")
+        self.assertEqual(user.email, "user_3@mail.de")
+        self.assertTrue(user.check_password("password3"))
+
+    def test_duplicates_are_reported_and_skipped(self):
+        rows = [
+            "username,email,password",
+            "taken,new@mail.de,password123",
+            "new_user,taken@mail.de,password123",
+            "fresh,fresh@mail.de,password123",
+            "fresh,other@mail.de,password123",
+        ]
+        path = self.write_file(".csv", "\n".join(rows) + "\n")
+
+        output = self.import_users(path, "--workers", "0")
+
+        self.assertIn("Line 2: A user with this username already exists.", output)
+        self.assertIn("Line 3: A user with this email already exists.", output)
+        self.assertIn("Line 5: duplicate username 'fresh'", output)
+        self.assertIn("Created 1 users, skipped 3 duplicates", output)
+        self.assertTrue(User.objects.filter(username="fresh").exists())
+
+    def test_import_ndjson_with_process_pool(self):
+        records = [
+            {"username": "a_user", "email": "a@mail.de", "password": "password123"},
+            {"username": "b_user", "email": "b@mail.de", "password": "password123"},
+        ]
+        lines = [json.dumps(record) for record in records] + ["not json"]
+        path = self.write_file(".ndjson", "\n".join(lines) + "\n")
+
+        output = self.import_users(path, "--workers", "2")
+
+        self.assertIn("Line 3: not a JSON object", output)
+        self.assertIn("Created 2 users, skipped 0 duplicates and 1 invalid", output)
+        self.assertTrue(User.objects.get(username="b_user").check_password("password123"))
+
+    def test_registration_rules_are_applied(self):
+        rows = [
+            "username,email,password,confirmed_password",
+            "user_x,not-an-email,password123,password123",
+            "user_y,y@mail.de,password123,other",
+        ]
+        path = self.write_file(".csv", "\n".join(rows) + "\n")
+
+        output = self.import_users(path, "--workers", "0")
+
+        self.assertIn("Line 2:", output)
+        self.assertIn("Passwords do not match", output)
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_missing_file(self):
+        with self.assertRaises(CommandError):
+            self.import_users("/nonexistent/users.csv", "--workers", "0")
@@ -1,4 +1,6 @@
+from unittest.mock import patch
 from django.urls import reverse
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
 from django.contrib.auth.models import User
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
@@ -56,6 +58,20 @@ class TestLogin(APITestCase):
         self.assertTrue(response.cookies["access_token"].value)
         self.assertTrue(response.cookies["refresh_token"].value)
 
+    def test_login_hashes_password_once(self):
+        """A successful login verifies the password exactly once."""
+        url = reverse("login")
+        payload = {"username": "your_username", "password": "your_password"}
+        with patch.object(
+            PBKDF2PasswordHasher,
+            "verify",
+            autospec=True,
+            side_effect=PBKDF2PasswordHasher.verify,
+        ) as mock_verify:
+            response = self.user_client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mock_verify.call_count, 1)
+
     def test_login_user_401(self):
         """Negative tests: various invalid credentials should return 401.
 
@@ -1,5 +1,8 @@
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
@@ -91,3 +94,59 @@ class TestRegistration(APITestCase):
                 response = self.user_client.post(url, payload, format="json")
                 self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
                 self.assertIsInstance(response.json(), dict)
+
+
+class TestRegistrationUniqueness(APITestCase):
+    """Duplicate usernames/emails are rejected by the database constraints.
+
+    A registration must issue a single INSERT and no lookup queries, and
+    constraint violations must map to the API's error messages.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user_client = APIClient()
+        self.url = reverse("registration")
+        get_user_model().objects.create_user(
+            username="taken", password="password123", email="taken@mail.de"
+        )
+
+    def payload(self, username="user_test", email="user@mail.de"):
+        return {
+            "username": username,
+            "password": "password123",
+            "confirmed_password": "password123",
+            "email": email,
+        }
+
+    def test_register_without_lookup_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.user_client.post(self.url, self.payload(), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        statements = [q["sql"].split()[0].upper() for q in queries]
+        self.assertEqual(statements.count("INSERT"), 1)
+        self.assertNotIn("SELECT", statements)
+
+    def test_duplicate_username_400(self):
+        response = self.user_client.post(
+            self.url, self.payload(username="taken"), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(), {"username": "A user with this username already exists."}
+        )
+
+    def test_duplicate_email_400(self):
+        response = self.user_client.post(
+            self.url, self.payload(email="taken@mail.de"), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(), {"email": "A user with this email already exists."}
+        )
+        self.assertEqual(get_user_model().objects.count(), 1)
+
+    def test_blank_emails_are_not_unique(self):
+        get_user_model().objects.create_user(username="admin1", password="x")
+        get_user_model().objects.create_user(username="admin2", password="x")
+        self.assertEqual(get_user_model().objects.filter(email="").count(), 2)
@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from app_auth import revocation
+from app_auth.models import RevokedToken
+
+
+class TestBloomFilter(TestCase):
+    def test_no_false_negatives(self):
+        bloom = revocation.BloomFilter(1000, 0.01)
+        values = [f"jti-{i}" for i in range(1000)]
+        for value in values:
+            bloom.add(value)
+        self.assertTrue(all(value in bloom for value in values))
+
+    def test_false_positive_rate_close_to_target(self):
+        bloom = revocation.BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f"jti-{i}")
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class TestRefreshRevocation(APITestCase):
+    """Tests for refresh-token revocation on logout and refresh.
+
+    Logged-out refresh tokens must be rejected, while refreshing a token
+    that was never revoked must not query the revocation table.
+    """
+
+    def setUp(self):
+        cache.clear()
+        revocation.clear()
+        self.user = User.objects.create_user(
+            username="your_username",
+            password="your_password",
+            email="email@mail.de",
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client = APIClient()
+        self.client.cookies["access_token"] = str(self.refresh.access_token)
+        self.client.cookies["refresh_token"] = str(self.refresh)
+        self.refresh_url = reverse("token_refresh")
+
+    def count_revocation_queries(self, queries):
+        return len([q for q in queries if "app_auth_revokedtoken" in q["sql"]])
+
+    def test_logout_revokes_refresh_token(self):
+        response = self.client.post(reverse("logout"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(RevokedToken.objects.filter(jti=self.refresh["jti"]).exists())
+
+        replay = APIClient()
+        replay.cookies["refresh_token"] = str(self.refresh)
+        response = replay.post(self.refresh_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json(), {"error": "Invalid refresh token"})
+
+    def test_other_tokens_still_refresh_after_logout(self):
+        other = RefreshToken.for_user(self.user)
+        self.client.post(reverse("logout"))
+
+        client = APIClient()
+        client.cookies["refresh_token"] = str(other)
+        response = client.post(self.refresh_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unrevoked_refresh_skips_revocation_table(self):
+        RevokedToken.objects.create(
+            jti="revoked-elsewhere", expires_at=timezone.now() + timedelta(days=1)
+        )
+        self.client.post(self.refresh_url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.refresh_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.count_revocation_queries(queries), 0)
+
+    def test_revocations_from_other_processes_are_picked_up(self):
+        self.assertFalse(revocation.is_revoked(self.refresh["jti"]))
+        RevokedToken.objects.create(
+            jti=self.refresh["jti"], expires_at=timezone.now() + timedelta(days=1)
+        )
+        cache.set("auth:refresh-revocations", 42, timeout=None)
+
+        response = self.client.post(self.refresh_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(REFRESH_REVOCATION_SYNC_INTERVAL=0)
+    def test_sync_interval_bounds_staleness(self):
+        self.assertFalse(revocation.is_revoked(self.refresh["jti"]))
+        RevokedToken.objects.create(
+            jti=self.refresh["jti"], expires_at=timezone.now() + timedelta(days=1)
+        )
+        self.assertTrue(revocation.is_revoked(self.refresh["jti"]))
+
+    @override_settings(REFRESH_REVOCATION_SYNC_INTERVAL=0)
+    def test_late_committed_revocation_is_picked_up(self):
+        """A row committed after newer ones were synced is not skipped."""
+        expires_at = timezone.now() + timedelta(days=1)
+        RevokedToken.objects.create(pk=100, jti="newer", expires_at=expires_at)
+        self.assertTrue(revocation.is_revoked("newer"))
+
+        late = RevokedToken.objects.create(
+            pk=50, jti=self.refresh["jti"], expires_at=expires_at
+        )
+        RevokedToken.objects.filter(pk=late.pk).update(
+            revoked_at=timezone.now() - timedelta(seconds=10)
+        )
+        self.assertTrue(revocation.is_revoked(self.refresh["jti"]))
+
+    def test_prune_removes_expired_entries(self):
+        RevokedToken.objects.create(
+            jti="expired", expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        revocation.revoke(self.refresh)
+
+        self.assertEqual(revocation.prune_expired(), 1)
+        self.assertEqual(
+            list(RevokedToken.objects.values_list("jti", flat=True)),
+            [self.refresh["jti"]],
+        )
+        self.assertTrue(revocation.is_revoked(self.refresh["jti"]))
+        self.assertFalse(revocation.is_revoked("expired"))
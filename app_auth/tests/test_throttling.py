@@ -0,0 +1,145 @@
+from unittest.mock import patch
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from app_auth.api import throttles
+from app_auth.authenticate import CookieJWTAuthentication
+
+
+THROTTLE_RATES = {
+    "login_ip": "5/min",
+    "login_username": "3/min",
+    "register_ip": "2/min",
+}
+
+
+@override_settings(AUTH_THROTTLE_RATES=THROTTLE_RATES)
+class TestAuthThrottling(APITestCase):
+    """Tests for the sliding-window limits on login and registration.
+
+    Over-limit requests must be answered with HTTP 429 before any password
+    hashing or database work, and every rejection must be counted.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(
+            username="your_username",
+            password="your_password",
+            email="email@mail.de",
+        )
+        self.client = APIClient()
+        self.login_url = reverse("login")
+
+    def login(self, username="your_username", ip="10.0.0.1"):
+        return self.client.post(
+            self.login_url,
+            {"username": username, "password": "wrong"},
+            format="json",
+            REMOTE_ADDR=ip,
+        )
+
+    def test_login_rejected_per_username_without_hashing(self):
+        for _ in range(3):
+            self.assertEqual(self.login().status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with patch.object(
+            PBKDF2PasswordHasher, "verify", autospec=True
+        ) as verify, self.assertNumQueries(0):
+            response = self.login(ip="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        verify.assert_not_called()
+        self.assertIn("Retry-After", response)
+
+        other = self.login(username="someone_else", ip="10.0.0.2")
+        self.assertEqual(other.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_login_rejected_per_ip(self):
+        for i in range(5):
+            self.login(username=f"user_{i}")
+        response = self.login(username="user_5")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        response = self.login(username="user_5", ip="10.0.0.9")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_registration_rejected_per_ip(self):
+        url = reverse("registration")
+        for i in range(2):
+            payload = {
+                "username": f"user_{i}",
+                "password": "password123",
+                "confirmed_password": "password123",
+                "email": f"user_{i}@mail.de",
+            }
+            response = self.client.post(url, payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(0):
+            response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_registration_does_not_authenticate_cookies(self):
+        self.client.cookies["access_token"] = str(
+            RefreshToken.for_user(self.user).access_token
+        )
+        payload = {
+            "username": "new_user",
+            "password": "password123",
+            "confirmed_password": "password123",
+            "email": "new_user@mail.de",
+        }
+
+        with patch.object(CookieJWTAuthentication, "authenticate") as authenticate:
+            response = self.client.post(reverse("registration"), payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        authenticate.assert_not_called()
+
+    def test_rejections_are_counted(self):
+        for _ in range(5):
+            self.login()
+        self.assertEqual(
+            throttles.rejection_counts(),
+            {"login_ip": 0, "login_username": 2, "register_ip": 0},
+        )
+
+    @override_settings(AUTH_THROTTLE_RATES={**THROTTLE_RATES, "login_username": None})
+    def test_scope_can_be_disabled(self):
+        for _ in range(5):
+            self.assertEqual(self.login().status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(AUTH_THROTTLE_RATES={"login_ip": "10/min"})
+class TestSlidingWindow(SimpleTestCase):
+    """The previous window's count decays linearly as the window slides."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.throttle = throttles.LoginIPThrottle()
+
+    def allow_at(self, now):
+        request = type("Request", (), {"META": {"REMOTE_ADDR": "10.0.0.1"}})()
+        with patch("app_auth.api.throttles.time.time", return_value=now):
+            return self.throttle.allow_request(request, None)
+
+    def test_previous_window_is_weighted(self):
+        start = 60 * 1000
+        self.assertTrue(all(self.allow_at(start + 59) for _ in range(10)))
+        self.assertFalse(self.allow_at(start + 59))
+
+        # 15s into the next window 75% of the previous 10 still count.
+        self.assertTrue(all(self.allow_at(start + 75) for _ in range(3)))
+        self.assertFalse(self.allow_at(start + 75))
+        self.assertAlmostEqual(self.throttle.wait(), 3.0)
+
+        # 45s in only 25% count: 2.5 + 3 requests leaves room for 5 more.
+        self.assertTrue(all(self.allow_at(start + 105) for _ in range(5)))
+        self.assertFalse(self.allow_at(start + 105))
@@ -0,0 +1,14 @@
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import revocation
+
+
+class RevocableRefreshToken(RefreshToken):
+    """Refresh token that fails verification once revoked (see `revocation`)."""
+
+    def verify(self):
+        super().verify()
+        if revocation.is_revoked(self.payload.get(api_settings.JTI_CLAIM)):
+            raise TokenError("Token is revoked")
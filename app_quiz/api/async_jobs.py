@@ -0,0 +1,176 @@
+"""Asyncio execution of quiz-generation jobs for `createQuiz/async/`.
+
+The thread pool in `jobs` ties up one thread per job for the whole
+pipeline, most of which is spent waiting on YouTube and Gemini. Here each
+job is a coroutine on a single process-wide event loop, so hundreds of
+jobs can be in flight at once:
+
+- The Gemini call is awaited through the GenAI client's async API
+  (`utils.generate_quiz_from_text_async`).
+- Blocking stages run on dedicated bounded executors: yt-dlp downloads,
+  Whisper transcription (CPU-bound, kept small) and ORM calls.
+- `QUIZ_ASYNC_MAX_IN_FLIGHT` caps concurrently running jobs; further jobs
+  wait on the loop without holding a thread. A job is kept fresh
+  (`single_flight.mark_alive`) from the moment it is scheduled, and starts
+  only if `jobs.claim_job` still finds it `queued`.
+
+The loop runs in a daemon thread rather than on the ASGI server's loop, so
+jobs outlive the request and the same runner also works under WSGI.
+
+Settings:
+- `QUIZ_ASYNC_MAX_IN_FLIGHT`: Jobs allowed past the admission semaphore.
+- `QUIZ_ASYNC_DOWNLOAD_WORKERS`: Threads for audio downloads.
+- `QUIZ_TRANSCRIBE_WORKERS`: Threads for Whisper (caps CPU-bound work).
+- `QUIZ_ASYNC_DB_WORKERS`: Threads (and DB connections) for ORM calls.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from app_quiz.models import QuizJob
+from . import jobs, pipeline_metrics, single_flight, transcript_cache, utils
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_loop = None
+_in_flight = None
+_executors = {}
+
+_POOL_SETTINGS = {
+    "download": "QUIZ_ASYNC_DOWNLOAD_WORKERS",
+    "transcribe": "QUIZ_TRANSCRIBE_WORKERS",
+    "db": "QUIZ_ASYNC_DB_WORKERS",
+}
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the job event loop, starting its thread on first use."""
+    global _loop, _in_flight
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="quiz-job-loop", daemon=True
+            ).start()
+            _in_flight = asyncio.Semaphore(settings.QUIZ_ASYNC_MAX_IN_FLIGHT)
+            _loop = loop
+        return _loop
+
+
+def _get_executor(pool: str) -> ThreadPoolExecutor:
+    with _lock:
+        executor = _executors.get(pool)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, _POOL_SETTINGS[pool]),
+                thread_name_prefix=f"quiz-{pool}",
+            )
+            _executors[pool] = executor
+        return executor
+
+
+async def run_blocking(pool: str, func, *args, **kwargs):
+    """Run `func(*args, **kwargs)` on the bounded executor `pool`."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(pool), functools.partial(func, *args, **kwargs)
+    )
+
+
+def _with_connection(func, *args, **kwargs):
+    # Drop connections that outlived CONN_MAX_AGE or became unusable.
+    close_old_connections()
+    return func(*args, **kwargs)
+
+
+async def run_db(func, *args, **kwargs):
+    """Run an ORM call on the database executor."""
+    return await run_blocking("db", _with_connection, func, *args, **kwargs)
+
+
+async def run_quiz_job_async(job_id: int) -> QuizJob:
+    """Run the generation pipeline for job `job_id` on the event loop.
+
+    Same stages and outcome as `jobs.run_quiz_job`; any exception marks the
+    job `failed` instead of propagating. A job that is no longer `queued`
+    once it gets a slot is returned without running.
+    """
+    try:
+        async with _in_flight:
+            job = await run_db(QuizJob.objects.get, pk=job_id)
+            if await run_db(jobs.claim_job, job):
+                await _run_stages(job)
+            else:
+                await run_db(job.refresh_from_db)
+            return job
+    finally:
+        single_flight.release(job_id)
+
+
+async def _run_stages(job: QuizJob) -> None:
+    """Run the stages of `job` and store the quiz or the failure."""
+    try:
+        text = await run_db(transcript_cache.get, job.video_id)
+        if text is None:
+            with pipeline_metrics.stage("download", job):
+                audio_path = await run_blocking(
+                    "download", utils.download_audio, job.video_url
+                )
+            pipeline_metrics.record_download(audio_path)
+
+            await run_db(jobs.set_status, job, QuizJob.Status.TRANSCRIBING)
+            try:
+                with pipeline_metrics.stage("transcribe", job):
+                    text = await run_blocking(
+                        "transcribe", utils.parse_audio_into_text, audio_path
+                    )
+            finally:
+                utils.remove_audio(audio_path)
+            pipeline_metrics.record_transcript(text)
+            await run_db(transcript_cache.put, job.video_id, text)
+
+        await run_db(jobs.set_status, job, QuizJob.Status.GENERATING)
+        with pipeline_metrics.stage("generate", job):
+            quiz_data_response = await utils.generate_quiz_from_text_async(text)
+        with pipeline_metrics.stage("parse", job):
+            quiz_dict = utils.parse_quiz_response(quiz_data_response)
+
+        await run_db(jobs.persist_quiz, job, quiz_dict)
+    except Exception as e:
+        await run_db(jobs.fail_job, job, e)
+
+
+def _log_crash(job_id, future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Quiz job %s crashed", job_id, exc_info=future.exception())
+
+
+def start_quiz_job(job_id: int) -> Future:
+    """Schedule job `job_id` on the job loop; safe to call from any thread.
+
+    Returns a `concurrent.futures.Future` resolving to the finished job.
+    """
+    single_flight.mark_alive(job_id)
+    future = asyncio.run_coroutine_threadsafe(run_quiz_job_async(job_id), get_loop())
+    future.add_done_callback(functools.partial(_log_crash, job_id))
+    return future
+
+
+def shutdown() -> None:
+    """Stop the loop and executors so settings are re-read (used by tests)."""
+    global _loop, _in_flight
+    with _lock:
+        loop, _loop, _in_flight = _loop, None, None
+        executors = list(_executors.values())
+        _executors.clear()
+    if loop is not None:
+        loop.call_soon_threadsafe(loop.stop)
+    for executor in executors:
+        executor.shutdown(wait=True)
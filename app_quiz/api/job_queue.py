@@ -0,0 +1,305 @@
+"""Durable, database-backed queue of quiz-generation jobs.
+
+With `QUIZ_JOB_BACKEND = "database"` a committed `QuizJob` row in state
+`queued` is the queue entry. `manage.py run_quiz_workers` processes claim
+rows, run the pipeline from `jobs.run_pipeline` and record the outcome, so
+jobs survive restarts and can be spread over any number of processes and
+hosts sharing the database.
+
+- Claiming is a compare-and-swap `UPDATE ... WHERE pk = ? AND <still
+  claimable>`; only one worker's update matches a row. Backends that
+  support it first pick the candidate with `SELECT ... FOR UPDATE SKIP
+  LOCKED` so concurrent workers do not contend for the same row.
+- A claim sets `locked_by`, `claimed_at` and a lease (`lease_expires_at`).
+  Workers extend the leases of their running jobs with `extend_leases()`,
+  but only until `QUIZ_JOB_MAX_RUNTIME_SECONDS` after the claim. A job
+  whose lease ran out (its worker crashed, or the job hung past its
+  maximum runtime) becomes claimable again.
+- Status changes (`set_status_if_leased`) and the result
+  (`persist_if_leased`) are only written while the lease is still held, so
+  a worker that lost its job cannot overwrite the new owner's progress and
+  a reclaimed job never produces two quizzes.
+- Failed attempts are retried with exponential backoff. After
+  `QUIZ_JOB_MAX_ATTEMPTS` the job is dead-lettered: it ends `failed` with
+  `dead_lettered_at` set and can be re-queued with `requeue_dead_jobs()`.
+
+Settings:
+- `QUIZ_JOB_BACKEND`: Must be "database" for views to leave jobs here.
+- `QUIZ_JOB_MAX_ATTEMPTS`: Attempts (including reclaimed ones) per job.
+- `QUIZ_JOB_LEASE_SECONDS`: Lease length granted by a claim or heartbeat.
+- `QUIZ_JOB_MAX_RUNTIME_SECONDS`: Time after a claim beyond which leases
+  are no longer renewed.
+- `QUIZ_JOB_RETRY_BACKOFF_SECONDS`: Delay before the first retry; doubles
+  with every further attempt.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from app_quiz.models import QuizJob
+from . import jobs, pipeline_metrics, single_flight
+
+
+logger = logging.getLogger(__name__)
+
+IN_PROGRESS = (
+    QuizJob.Status.CLAIMED,
+    QuizJob.Status.DOWNLOADING,
+    QuizJob.Status.TRANSCRIBING,
+    QuizJob.Status.GENERATING,
+)
+
+_CANDIDATES = 10
+
+
+class LeaseLost(Exception):
+    """Raised when a worker no longer holds the lease of its job."""
+
+
+def _claimable(now) -> Q:
+    # Followers (see `single_flight`) wait for their leader and never run.
+    return Q(leader__isnull=True) & (
+        Q(status=QuizJob.Status.QUEUED, available_at__lte=now)
+        | Q(status__in=IN_PROGRESS, lease_expires_at__lt=now)
+    )
+
+
+def _lease_until(now):
+    return now + timedelta(seconds=settings.QUIZ_JOB_LEASE_SECONDS)
+
+
+def _try_claim(pk, worker_id: str, now) -> bool:
+    # Compare-and-swap: matches only while the row is still claimable.
+    return bool(
+        QuizJob.objects.filter(_claimable(now), pk=pk).update(
+            status=QuizJob.Status.CLAIMED,
+            locked_by=worker_id,
+            claimed_at=now,
+            lease_expires_at=_lease_until(now),
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+    )
+
+
+def _claim_next_id(worker_id: str, now):
+    """Claim the oldest claimable job and return its pk (None if none is due)."""
+    queryset = QuizJob.objects.filter(_claimable(now)).order_by("available_at", "pk")
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            pks = list(
+                queryset.select_for_update(skip_locked=True).values_list(
+                    "pk", flat=True
+                )[:1]
+            )
+            if pks and _try_claim(pks[0], worker_id, now):
+                return pks[0]
+            return None
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:_CANDIDATES])
+        if not pks:
+            return None
+        for pk in pks:
+            if _try_claim(pk, worker_id, now):
+                return pk
+
+
+def claim_job(worker_id: str) -> QuizJob | None:
+    """Claim the next runnable job for `worker_id`.
+
+    Queued jobs whose `available_at` has passed and in-progress jobs with
+    an expired lease are eligible, oldest first. A reclaimed job that has
+    already used up its attempts is dead-lettered instead of returned.
+
+    Parameters:
+    - worker_id (str): Identifier stored in `locked_by`.
+
+    Returns:
+    - The claimed `QuizJob` (status `claimed`), or None if nothing is due.
+    """
+    while True:
+        pk = _claim_next_id(worker_id, timezone.now())
+        if pk is None:
+            return None
+        job = QuizJob.objects.get(pk=pk)
+        if job.attempts > settings.QUIZ_JOB_MAX_ATTEMPTS:
+            # The claim counted an attempt the job was not entitled to.
+            job.attempts -= 1
+            _dead_letter(job, job.error or "Worker lease expired.")
+            continue
+        return job
+
+
+def extend_leases(worker_ids) -> int:
+    """Renew the leases of the running jobs held by `worker_ids`.
+
+    Jobs claimed more than `QUIZ_JOB_MAX_RUNTIME_SECONDS` ago are skipped,
+    so the lease of a job stuck in a stage runs out and another worker
+    reclaims it.
+
+    Returns the number of jobs whose lease was extended.
+    """
+    now = timezone.now()
+    return QuizJob.objects.filter(
+        locked_by__in=list(worker_ids),
+        status__in=IN_PROGRESS,
+        claimed_at__gt=now - timedelta(seconds=settings.QUIZ_JOB_MAX_RUNTIME_SECONDS),
+    ).update(lease_expires_at=_lease_until(now))
+
+
+def _held(job: QuizJob):
+    """Queryset matching `job` only while its worker still holds the lease."""
+    return QuizJob.objects.filter(
+        pk=job.pk, locked_by=job.locked_by, status__in=IN_PROGRESS
+    )
+
+
+def set_status_if_leased(job: QuizJob, status: str) -> None:
+    """Record a stage change like `jobs.set_status` if the lease is held.
+
+    Raises:
+    - LeaseLost: If another worker reclaimed the job in the meantime.
+    """
+    job.status = status
+    updated = _held(job).update(
+        status=status, timings=job.timings, updated_at=timezone.now()
+    )
+    if not updated:
+        raise LeaseLost(f"Lease of quiz job {job.pk} was lost")
+
+
+def persist_if_leased(job: QuizJob, quiz_dict: dict):
+    """Store the quiz like `jobs.persist_quiz` if `job`'s lease is still held.
+
+    The lease is released in the same transaction as the quiz is stored.
+    Followers are completed after that transaction commits, so the write
+    lock is not held while their copies are cloned.
+
+    Raises:
+    - LeaseLost: If another worker reclaimed the job in the meantime.
+    """
+    with transaction.atomic():
+        released = _held(job).update(locked_by="", lease_expires_at=None)
+        if not released:
+            raise LeaseLost(f"Lease of quiz job {job.pk} was lost")
+        job.locked_by = ""
+        job.lease_expires_at = None
+        quiz = jobs.store_quiz(job, quiz_dict)
+    single_flight.complete_followers(job, quiz)
+    return quiz
+
+
+def _dead_letter(job: QuizJob, error: str) -> None:
+    now = timezone.now()
+    QuizJob.objects.filter(pk=job.pk).update(
+        status=QuizJob.Status.FAILED,
+        error=error,
+        attempts=job.attempts,
+        locked_by="",
+        lease_expires_at=None,
+        dead_lettered_at=now,
+        timings=job.timings,
+        updated_at=now,
+    )
+    pipeline_metrics.JOBS_TOTAL.inc(outcome="dead_lettered")
+    single_flight.fail_followers(job, error)
+    logger.warning(
+        "Quiz job %s dead-lettered after %d attempts: %s", job.pk, job.attempts, error
+    )
+
+
+def retry_or_dead_letter(job: QuizJob, exc: Exception) -> bool:
+    """Record a failed attempt of `job`.
+
+    The job is re-queued with exponential backoff while attempts remain,
+    otherwise it is dead-lettered. Nothing is recorded if the worker lost
+    the lease, because the job's new owner is responsible for it now.
+
+    Returns:
+    - True if the job will be retried.
+    """
+    error = jobs.describe_error(exc)
+    now = timezone.now()
+    held = _held(job)
+    if job.attempts >= settings.QUIZ_JOB_MAX_ATTEMPTS:
+        if held.exists():
+            _dead_letter(job, error)
+        return False
+    delay = settings.QUIZ_JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+    retried = held.update(
+        status=QuizJob.Status.QUEUED,
+        error=error,
+        locked_by="",
+        lease_expires_at=None,
+        available_at=now + timedelta(seconds=delay),
+        timings=job.timings,
+        updated_at=now,
+    )
+    if retried:
+        pipeline_metrics.JOBS_TOTAL.inc(outcome="retried")
+        logger.info(
+            "Quiz job %s failed (attempt %d), retrying in %ds: %s",
+            job.pk,
+            job.attempts,
+            delay,
+            error,
+        )
+    return bool(retried)
+
+
+def run_job(job: QuizJob) -> None:
+    """Run a claimed `job` and record success, a retry or a dead letter."""
+    try:
+        jobs.run_pipeline(
+            job, persist=persist_if_leased, set_status=set_status_if_leased
+        )
+    except LeaseLost:
+        logger.warning("Quiz job %s was reclaimed by another worker", job.pk)
+    except Exception as e:
+        retry_or_dead_letter(job, e)
+
+
+def process_next(worker_id: str) -> bool:
+    """Claim and run one job. Returns False if no job was due."""
+    close_old_connections()
+    try:
+        job = claim_job(worker_id)
+        if job is None:
+            return False
+        run_job(job)
+        return True
+    finally:
+        close_old_connections()
+
+
+def requeue_dead_jobs(job_ids=None) -> int:
+    """Put dead-lettered jobs (all, or those in `job_ids`) back in the queue.
+
+    Their attempt counter is reset. A job whose video is already being
+    processed by another job is skipped. Returns the number of re-queued
+    jobs.
+    """
+    queryset = QuizJob.objects.filter(dead_lettered_at__isnull=False)
+    if job_ids is not None:
+        queryset = queryset.filter(pk__in=job_ids)
+    requeued = 0
+    for pk in queryset.values_list("pk", flat=True):
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                requeued += QuizJob.objects.filter(pk=pk).update(
+                    status=QuizJob.Status.QUEUED,
+                    error="",
+                    attempts=0,
+                    available_at=now,
+                    dead_lettered_at=None,
+                    updated_at=now,
+                )
+        except IntegrityError:
+            logger.info("Quiz job %s not re-queued: video already in flight", pk)
+    return requeued
@@ -0,0 +1,259 @@
+"""Background execution of quiz-generation jobs.
+
+`createQuiz/` only records a `QuizJob` and hands it to this module; the
+slow pipeline (audio download, Whisper transcription, Gemini generation)
+runs on a small thread pool outside the request/response cycle. Each stage
+updates `QuizJob.status` so clients can poll `jobs/<id>/` for progress.
+
+With `QUIZ_JOB_BACKEND = "database"` nothing is submitted in-process; the
+row itself is the queue entry and `manage.py run_quiz_workers` claims and
+runs it (see `job_queue`).
+
+Settings:
+- `QUIZ_JOB_BACKEND`: "thread" (in-process pool) or "database" (durable
+  queue drained by `run_quiz_workers`).
+- `QUIZ_JOB_WORKERS`: Size of the in-process worker pool.
+- `QUIZ_JOBS_EAGER`: Run jobs inline in the calling thread (used by tests).
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from app_quiz.models import Quiz, QuizJob
+from . import pipeline_metrics, single_flight, transcript_cache, utils
+
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide executor, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.QUIZ_JOB_WORKERS,
+                thread_name_prefix="quiz-job",
+            )
+        return _executor
+
+
+def uses_database_queue() -> bool:
+    return settings.QUIZ_JOB_BACKEND == "database"
+
+
+def enqueue_quiz_job(job: QuizJob) -> None:
+    """Schedule `job` for execution.
+
+    The job is submitted once the surrounding transaction commits so the
+    worker thread never looks up a row it cannot see yet. From then on it
+    is kept fresh (`single_flight.mark_alive`) while it waits for a free
+    worker. With
+    `QUIZ_JOBS_EAGER` enabled the job runs immediately on `job` itself.
+    With the database backend the committed `queued` row is picked up by
+    `run_quiz_workers`, so there is nothing to submit.
+    """
+    if uses_database_queue():
+        return
+    if settings.QUIZ_JOBS_EAGER:
+        run_quiz_job(job)
+        return
+    transaction.on_commit(lambda: _submit(job.pk))
+
+
+def _submit(job_id: int) -> None:
+    single_flight.mark_alive(job_id)
+    get_executor().submit(_run_in_worker, job_id)
+
+
+def complete_job_from_quiz(job: QuizJob, source_quiz: Quiz) -> QuizJob:
+    """Finish `job` by cloning `source_quiz` instead of running the pipeline.
+
+    Used when a quiz for the same video already exists. The clone and the
+    job are saved in one transaction and the job is returned as `done`.
+    """
+    with transaction.atomic():
+        job.quiz = utils.clone_quiz(source_quiz, job.creator_id)
+        job.status = QuizJob.Status.DONE
+        job.error = ""
+        job.save()
+    return job
+
+
+def _run_in_worker(job_id: int) -> None:
+    """Thread-pool entry point: load the job and manage DB connections."""
+    close_old_connections()
+    try:
+        job = QuizJob.objects.get(pk=job_id)
+        run_quiz_job(job)
+    except Exception:
+        logger.exception("Quiz job %s crashed", job_id)
+    finally:
+        single_flight.release(job_id)
+        close_old_connections()
+
+
+def claim_job(job: QuizJob) -> bool:
+    """Start `job` by moving it from `queued` to `downloading`.
+
+    The update is conditional, so a job that was started elsewhere or
+    abandoned (`single_flight` takes over leaders that look orphaned) while
+    it waited for a worker is not run again.
+
+    Returns:
+    - True if the caller claimed the job and has to run it.
+    """
+    now = timezone.now()
+    claimed = QuizJob.objects.filter(pk=job.pk, status=QuizJob.Status.QUEUED).update(
+        status=QuizJob.Status.DOWNLOADING, updated_at=now
+    )
+    if not claimed:
+        logger.info("Quiz job %s is no longer queued; not running it", job.pk)
+        return False
+    job.status = QuizJob.Status.DOWNLOADING
+    job.updated_at = now
+    return True
+
+
+def set_status(job: QuizJob, status: str) -> None:
+    job.status = status
+    job.save(update_fields=["status", "timings", "updated_at"])
+
+
+def fail_job(job: QuizJob, exc: Exception) -> None:
+    """Mark `job` and its followers as `failed` with a message for `exc`."""
+    job.status = QuizJob.Status.FAILED
+    job.error = describe_error(exc)
+    logger.warning("Quiz job %s failed: %s", job.pk, job.error)
+    job.save(update_fields=["status", "error", "timings", "updated_at"])
+    pipeline_metrics.JOBS_TOTAL.inc(outcome="failed")
+    single_flight.fail_followers(job, job.error)
+
+
+def describe_error(exc: Exception) -> str:
+    """Return a client-facing message for an exception raised by a stage."""
+    if isinstance(exc, serializers.ValidationError):
+        detail = exc.detail
+        if isinstance(detail, dict) and "error" in detail:
+            detail = detail["error"]
+        if isinstance(detail, list) and len(detail) == 1:
+            detail = detail[0]
+        return str(detail)
+    return str(exc) or exc.__class__.__name__
+
+
+def store_quiz(job: QuizJob, quiz_dict: dict) -> Quiz:
+    """Save the generated quiz for `job` and mark the job `done` atomically.
+
+    Followers are not completed; see `persist_quiz`.
+    """
+    with transaction.atomic():
+        quiz_instance = Quiz.objects.create(
+            creator_id=job.creator_id,
+            video_url=job.video_url,
+            title=quiz_dict["title"],
+            description=quiz_dict["description"],
+        )
+        with pipeline_metrics.stage("store", job):
+            utils.create_quiz_questions(quiz_instance, quiz_dict)
+        job.quiz = quiz_instance
+        job.status = QuizJob.Status.DONE
+        job.error = ""
+        job.save(update_fields=["quiz", "status", "error", "timings", "updated_at"])
+    pipeline_metrics.JOBS_TOTAL.inc(outcome="done")
+    return quiz_instance
+
+
+def persist_quiz(job: QuizJob, quiz_dict: dict) -> Quiz:
+    """Store the generated quiz for `job` and mark the job `done`.
+
+    Followers of `job` (see `single_flight`) receive their copies of the
+    quiz right after the transaction commits. This is the only atomic step
+    of the pipeline. Everything before it
+    (download, transcription, generation) runs in autocommit mode, so no
+    write transaction - and on SQLite no database-wide write lock - is held
+    while waiting on the network or the CPU.
+    """
+    quiz_instance = store_quiz(job, quiz_dict)
+    single_flight.complete_followers(job, quiz_instance)
+    return quiz_instance
+
+
+def run_pipeline(job: QuizJob, persist=persist_quiz, set_status=set_status) -> Quiz:
+    """Run the generation pipeline for `job` and return the stored quiz.
+
+    Steps:
+    - Look up the transcript in `transcript_cache`; on a miss download the
+      audio, transcribe it to text and store the transcript.
+    - Generate quiz JSON via Gemini and parse it.
+    - Save the `Quiz` and its questions and mark the job `done` in one
+      short transaction (`persist`, `persist_quiz` by default). Status
+      updates before that are committed immediately so they are visible to
+      `jobs/<id>/`; a job claimed by `claim_job` is already `downloading`.
+
+    Parameters:
+    - job (QuizJob): The job to run.
+    - persist (callable): Called as `persist(job, quiz_dict)` to store the
+      result; the database queue passes a lease-checking variant.
+    - set_status (callable): Called as `set_status(job, status)` before
+      each stage; the database queue passes a lease-checking variant.
+
+    Each stage is timed (see `pipeline_metrics`).
+
+    Raises:
+    - Any exception raised by a stage; the caller decides how to record it.
+    """
+    job.timings = {}
+    text = transcript_cache.get(job.video_id)
+    if text is None:
+        if job.status != QuizJob.Status.DOWNLOADING:
+            set_status(job, QuizJob.Status.DOWNLOADING)
+        with pipeline_metrics.stage("download", job):
+            audio_path = utils.download_audio(job.video_url)
+        pipeline_metrics.record_download(audio_path)
+
+        set_status(job, QuizJob.Status.TRANSCRIBING)
+        try:
+            with pipeline_metrics.stage("transcribe", job):
+                text = utils.parse_audio_into_text(audio_path)
+        finally:
+            utils.remove_audio(audio_path)
+        pipeline_metrics.record_transcript(text)
+        transcript_cache.put(job.video_id, text)
+
+    set_status(job, QuizJob.Status.GENERATING)
+    with pipeline_metrics.stage("generate", job):
+        quiz_data_response = utils.generate_quiz_from_text(text)
+    with pipeline_metrics.stage("parse", job):
+        quiz_dict = utils.parse_quiz_response(quiz_data_response)
+
+    return persist(job, quiz_dict)
+
+
+def run_quiz_job(job: QuizJob) -> QuizJob:
+    """Claim `job`, run `run_pipeline` for it and record the outcome.
+
+    A job that is no longer `queued` (see `claim_job`) is reloaded and
+    returned without running. Any exception marks the job `failed` with a
+    readable `error`; it is not re-raised so a single bad video cannot take
+    down a worker. While the pipeline runs the job is kept fresh
+    (`single_flight.keep_alive`).
+    """
+    if not claim_job(job):
+        job.refresh_from_db()
+        return job
+    with single_flight.keep_alive(job):
+        try:
+            run_pipeline(job)
+        except Exception as e:
+            fail_job(job, e)
+    return job
@@ -0,0 +1,241 @@
+"""Reusable view mixins for the quiz API."""
+
+import hashlib
+
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from app_quiz.models import Quiz, Question
+from core import db_router
+from . import payload_cache
+from .serializers import QuizSerializer
+
+
+class QuizFieldsetMixin:
+    """Sparse fieldsets for quiz read endpoints.
+
+    Query parameters (GET only):
+    - `?view=summary`: Render `QuizSerializer.SUMMARY_FIELDS`.
+    - `?fields=id,title,...`: Render exactly the listed fields.
+
+    The selection trims the SQL as well as the payload: only the needed
+    columns are loaded (`only()`), questions are prefetched only when
+    `questions` is requested, and `question_count` is computed by a
+    correlated subquery in the same statement. Unknown field names or views
+    are rejected with HTTP 400.
+    """
+
+    # Columns always loaded: the pk, the owner for `IsOwner` and the
+    # pagination cursor position.
+    required_columns = ("id", "creator", "created_at")
+
+    def get_requested_fields(self):
+        """Return the requested field names, or None for the default set."""
+        if self.request.method not in SAFE_METHODS:
+            return None
+        params = self.request.query_params
+        if "fields" in params:
+            fields = [name.strip() for name in params["fields"].split(",")]
+            fields = [name for name in fields if name]
+            unknown = sorted(set(fields) - set(QuizSerializer.Meta.fields))
+            if not fields or unknown:
+                raise serializers.ValidationError(
+                    {"fields": f"Unknown fields: {', '.join(unknown) or '(none)'}"}
+                )
+            return fields
+        view = params.get("view")
+        if view is None:
+            return None
+        if view != "summary":
+            raise serializers.ValidationError({"view": "Unknown view."})
+        return QuizSerializer.SUMMARY_FIELDS
+
+    def get_quiz_queryset(self, queryset):
+        """Apply column, prefetch and annotation trimming to `queryset`."""
+        if self.request.method == "DELETE":
+            return queryset
+        fields = self.get_requested_fields()
+        if fields is None:
+            return queryset.prefetch_related("questions")
+
+        model_columns = {field.name for field in Quiz._meta.concrete_fields}
+        columns = {*self.required_columns, *(set(fields) & model_columns)}
+        queryset = queryset.only(*columns)
+        if "questions" in fields:
+            queryset = queryset.prefetch_related("questions")
+        if "question_count" in fields:
+            question_counts = (
+                Question.objects.filter(quiz=OuterRef("pk"))
+                .order_by()
+                .values("quiz")
+                .annotate(count=Count("pk"))
+                .values("count")
+            )
+            queryset = queryset.annotate(
+                question_count=Coalesce(
+                    Subquery(question_counts, output_field=IntegerField()), 0
+                )
+            )
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """ETag / Last-Modified support with cheap 304 responses for GET.
+
+    Subclasses implement `get_conditional_state()` and return a dict of
+    aggregates that changes whenever the rendered resource would change
+    (max `updated_at`, row counts, id sums), or None to skip conditional
+    handling. The state is computed with one aggregate query. When the
+    client's `If-None-Match` / `If-Modified-Since` still match, a 304 is
+    returned without loading or serializing any rows. Otherwise the normal
+    response is rendered with `ETag` and `Last-Modified` headers.
+
+    The ETag also covers the request path and query string so different
+    pages and fieldsets get different tags. `Last-Modified` is the newest of
+    the `timestamp_keys`; views whose rows can disappear without advancing
+    any of them set `timestamp_keys = ()` and rely on the ETag alone.
+    """
+
+    timestamp_keys = ("quiz_updated", "question_updated")
+
+    def get_conditional_state(self):
+        raise NotImplementedError
+
+    def get_conditional_validators(self):
+        """Return `(etag, last_modified)` for the current request.
+
+        The aggregate state is kept on `self.conditional_state`.
+        """
+        state = self.conditional_state = self.get_conditional_state()
+        if state is None:
+            return None, None
+        timestamps = [state[key] for key in self.timestamp_keys if state.get(key)]
+        last_modified = int(max(timestamps).timestamp()) if timestamps else None
+        fingerprint = repr(
+            (
+                self.request.get_full_path(),
+                sorted(
+                    (key, value.isoformat() if hasattr(value, "isoformat") else value)
+                    for key, value in state.items()
+                ),
+            )
+        )
+        etag = quote_etag(hashlib.sha1(fingerprint.encode("utf-8")).hexdigest())
+        return etag, last_modified
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_conditional_validators()
+        if etag is not None:
+            not_modified = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if not_modified is not None:
+                return not_modified
+
+        response = super().get(request, *args, **kwargs)
+        if etag is not None and response.status_code == 200:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class ReplicaReadMixin:
+    """Run GET requests against a read replica (see `core.db_router`).
+
+    Must be the first base so the payload cache, conditional checks and the
+    view itself all read from the same database. Users who recently wrote
+    quiz data keep reading from the primary.
+    """
+
+    def get(self, request, *args, **kwargs):
+        with db_router.read_from_replica(request.user.id):
+            return super().get(request, *args, **kwargs)
+
+
+class CachedPayloadMixin:
+    """Serve GET responses from `payload_cache` when possible.
+
+    Must precede `ConditionalGetMixin` in the bases. Subclasses implement
+    `get_payload_cache_scope()` and return `(scope, ident)`: `("detail",
+    quiz_id)` or `("list", user_id)`. The payload is stored with its ETag,
+    Last-Modified and owner id (`get_payload_owner_id()`).
+
+    On a hit the owner is checked against `request.user` and the response
+    (or a 304) is built from the cached entry without any query. On a miss
+    the regular view runs and a 200 is stored. Writes invalidate entries
+    via model signals (see `app_quiz.signals`).
+    """
+
+    def get_payload_cache_scope(self):
+        raise NotImplementedError
+
+    def get_payload_owner_id(self):
+        """Return the id of the user allowed to read the rendered payload.
+
+        Defaults to the owner in `conditional_state`; views whose payload
+        belongs to the requesting user even without rows override this.
+        """
+        return self.conditional_state["creator_id"]
+
+    def get(self, request, *args, **kwargs):
+        if not settings.QUIZ_CACHE_ENABLED:
+            return super().get(request, *args, **kwargs)
+
+        scope, ident = self.get_payload_cache_scope()
+        key = payload_cache.entry_key(scope, ident, request.get_full_path())
+        entry = payload_cache.lookup(key)
+        if entry is not None and entry["creator_id"] == request.user.id:
+            not_modified = get_conditional_response(
+                request, etag=entry["etag"], last_modified=entry["last_modified"]
+            )
+            if not_modified is not None:
+                return not_modified
+            response = Response(entry["data"])
+            response["ETag"] = entry["etag"]
+            if entry["last_modified"] is not None:
+                response["Last-Modified"] = http_date(entry["last_modified"])
+            return response
+
+        response = super().get(request, *args, **kwargs)
+        state = getattr(self, "conditional_state", None)
+        if response.status_code == 200 and state is not None:
+            last_modified = response.get("Last-Modified")
+            payload_cache.store(
+                key,
+                {
+                    "data": response.data,
+                    "etag": response["ETag"],
+                    "last_modified": last_modified
+                    and parse_http_date_safe(last_modified),
+                    "creator_id": self.get_payload_owner_id(),
+                },
+            )
+        return response
+
+
+def quiz_change_state(queryset):
+    """Aggregate change markers for a set of quizzes and their questions.
+
+    Runs a single query. `creator_id` is the (largest) owner id in the set,
+    which lets single-quiz callers check ownership without loading the row.
+    """
+    return queryset.order_by().aggregate(
+        creator_id=Max("creator_id"),
+        quiz_count=Count("id", distinct=True),
+        quiz_ids=Sum("id", distinct=True),
+        quiz_updated=Max("updated_at"),
+        question_count=Count("questions"),
+        question_ids=Sum("questions__id"),
+        question_updated=Max("questions__updated_at"),
+    )
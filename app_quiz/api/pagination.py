@@ -0,0 +1,22 @@
+"""Pagination classes for the quiz API."""
+
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class QuizCursorPagination(CursorPagination):
+    """Cursor pagination for quiz listings, newest first.
+
+    Pages are ordered by `(created_at, id)` descending. This matches the
+    `(creator, created_at)` index on `Quiz`, so each page is an index range
+    scan. Cursor pages stay stable under concurrent inserts and never need
+    a `COUNT(*)`.
+
+    Page size defaults to `settings.QUIZ_PAGE_SIZE` and can be lowered or
+    raised per request with `?page_size=` up to `QUIZ_MAX_PAGE_SIZE`.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = settings.QUIZ_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.QUIZ_MAX_PAGE_SIZE
@@ -0,0 +1,80 @@
+"""Server-side cache of rendered quiz payloads.
+
+Quiz detail responses and each user's list pages are stored in the Django
+cache together with their ETag, so hot reads are answered without touching
+the ORM or `QuizSerializer`.
+
+Entries live under versioned keys. Writes do not delete entries; they
+replace the version token of the affected quiz (detail) and owner (list).
+Entries stored under an old token are never read again and expire with
+their TTL. This also makes invalidation race-free: a reader that started
+before a write stores its payload under the old version.
+
+Settings:
+- `QUIZ_CACHE_ENABLED`: Turn payload caching on or off.
+- `QUIZ_CACHE_ALIAS`: Cache alias from `CACHES` to use.
+- `QUIZ_CACHE_TIMEOUT`: TTL of cached payloads in seconds.
+"""
+
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+def get_cache():
+    return caches[settings.QUIZ_CACHE_ALIAS]
+
+
+def _version_key(scope: str, ident) -> str:
+    return f"quiz-payload:version:{scope}:{ident}"
+
+
+def get_version(scope: str, ident) -> str:
+    """Return the current version token for `scope` (`detail`/`list`)."""
+    cache = get_cache()
+    key = _version_key(scope, ident)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(scope: str, ident) -> None:
+    get_cache().set(_version_key(scope, ident), uuid.uuid4().hex, timeout=None)
+
+
+def entry_key(scope: str, ident, path: str) -> str:
+    """Return the key of the payload for `path` under the current version."""
+    version = get_version(scope, ident)
+    digest = hashlib.sha1(path.encode("utf-8")).hexdigest()
+    return f"quiz-payload:{scope}:{ident}:{version}:{digest}"
+
+
+def lookup(key: str) -> dict | None:
+    return get_cache().get(key)
+
+
+def store(key: str, entry: dict) -> None:
+    get_cache().set(key, entry, timeout=settings.QUIZ_CACHE_TIMEOUT)
+
+
+def invalidate_quiz(quiz_id=None, creator_id=None) -> None:
+    """Invalidate the detail payloads of `quiz_id` and lists of `creator_id`.
+
+    Versions are bumped right away and again when the surrounding
+    transaction commits. The second bump drops anything a concurrent reader
+    cached from the pre-commit state.
+    """
+
+    def bump():
+        if quiz_id is not None:
+            bump_version("detail", quiz_id)
+        if creator_id is not None:
+            bump_version("list", creator_id)
+
+    bump()
+    transaction.on_commit(bump)
@@ -11,9 +11,12 @@ class IsOwner(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         """Return True if `request.user` is the creator/owner of `obj`.
 
+        Compares ids so no query is needed to load `obj.creator` and
+        claims-only users (`TokenUser`) are supported.
+
         Parameters:
         - request: Django REST Framework `Request` instance.
         - view: DRF view instance.
-        - obj: The object being accessed (must have a `creator` attribute).
+        - obj: The object being accessed (must have a `creator` foreign key).
         """
-        return obj.creator == request.user
+        return obj.creator_id == request.user.id
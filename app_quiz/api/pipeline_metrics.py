@@ -0,0 +1,87 @@
+"""Timing and size metrics of the quiz-generation pipeline.
+
+Every stage (`download`, `transcribe`, `generate`, `parse`, `store`) is
+timed with a monotonic clock. The durations go to the
+`quizly_pipeline_stage_seconds` histogram, to the `Server-Timing` header
+when the stage runs inside a request (eager jobs) and to `QuizJob.timings`,
+which `jobs/<id>/` reports in its own `Server-Timing` header. Downloaded
+bytes, audio duration and transcript length are recorded as histograms.
+See `core.metrics` for the `/metrics` endpoint.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from core import metrics
+
+
+KIB = 1024
+
+STAGE_SECONDS = metrics.histogram(
+    "quizly_pipeline_stage_seconds", "Time spent in each quiz-generation stage."
+)
+DOWNLOAD_BYTES = metrics.histogram(
+    "quizly_audio_download_bytes",
+    "Size of downloaded audio files in bytes.",
+    buckets=[KIB * 2**power for power in range(6, 20, 2)],
+)
+AUDIO_SECONDS = metrics.histogram(
+    "quizly_audio_duration_seconds",
+    "Duration of transcribed audio in seconds.",
+    buckets=[30, 60, 120, 300, 600, 1200, 1800, 3600, 7200],
+)
+TRANSCRIPT_CHARACTERS = metrics.histogram(
+    "quizly_transcript_characters",
+    "Length of transcripts in characters.",
+    buckets=[1000, 5000, 10000, 25000, 50000, 100000, 250000],
+)
+JOBS_TOTAL = metrics.counter(
+    "quizly_quiz_jobs_total", "Quiz-generation job attempts by outcome."
+)
+
+
+@contextmanager
+def stage(name: str, job=None):
+    """Time the enclosed block as pipeline stage `name`.
+
+    Parameters:
+    - name (str): Stage label.
+    - job (QuizJob | None): Job whose `timings` receive the duration.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        STAGE_SECONDS.observe(seconds, stage=name)
+        metrics.record_timing(name, seconds)
+        if job is not None:
+            job.timings[name] = round(seconds, 6)
+
+
+def record_download(audio_path: str) -> None:
+    """Record the size of the downloaded file at `audio_path`."""
+    try:
+        DOWNLOAD_BYTES.observe(os.path.getsize(audio_path))
+    except OSError:
+        pass
+
+
+def record_transcription(result: dict) -> None:
+    """Record the audio duration of a Whisper `result`."""
+    segments = result.get("segments") or []
+    if segments:
+        AUDIO_SECONDS.observe(segments[-1]["end"])
+
+
+def record_transcript(text: str) -> None:
+    """Record the length of a fresh transcript."""
+    TRANSCRIPT_CHARACTERS.observe(len(text))
+
+
+def job_timing_header(job) -> str:
+    """Return the `Server-Timing` value for the stage timings of `job`."""
+    return metrics.server_timing_header(
+        (f"job_{name}", seconds) for name, seconds in job.timings.items()
+    )
@@ -1,20 +1,28 @@
 """Serializers for quiz and question models.
 
-This module provides three serializers used by the quiz API:
+This module provides the serializers used by the quiz API:
 - `QuestionSerializer` - serializes `Question` model fields for read operations.
-- `QuizSerializer` - read-only representation of `Quiz` with nested questions.
+- `QuizSerializer` - read-only representation of `Quiz` with nested questions
+  and optional sparse fieldsets.
 - `QuizCreateSerializer` - write serializer that accepts a YouTube `url`
   and validates/extracts the `video_id` used to populate `video_url` and
   generate questions.
+- `QuizJobSerializer` - read-only status of a background quiz-generation
+  job started by `createQuiz/`.
 
 Docstring style follows the conventions used in `app_auth.api.serializers`:
 - Module-level description followed by concise per-class docstrings.
 """
 
 from rest_framework import serializers
-import re
 import urllib.parse
-from app_quiz.models import Quiz, Question
+from app_quiz.models import (
+    YOUTUBE_DOMAINS,
+    Question,
+    Quiz,
+    QuizJob,
+    extract_youtube_video_id,
+)
 
 
 class QuestionSerializer(serializers.ModelSerializer):
@@ -49,10 +57,30 @@ class QuizSerializer(serializers.ModelSerializer):
     Provides a representation suitable for list/detail views. It exposes a
     read-only `url` field (source is populated by the view) and a nested
     `questions` list using `QuestionSerializer`.
+
+    Sparse fieldsets:
+    - Pass `fields=[...]` to render only a subset of `Meta.fields`. This
+      also makes the optional `question_count` field available, which
+      expects the queryset to annotate `question_count`.
+    - Without `fields`, `DEFAULT_FIELDS` are rendered.
+    - `SUMMARY_FIELDS` is the lightweight set used by `?view=summary`.
     """
 
     url = serializers.URLField(read_only=True)
     questions = QuestionSerializer(many=True, read_only=True)
+    question_count = serializers.IntegerField(read_only=True)
+
+    DEFAULT_FIELDS = [
+        "id",
+        "title",
+        "description",
+        "created_at",
+        "updated_at",
+        "url",
+        "video_url",
+        "questions",
+    ]
+    SUMMARY_FIELDS = ["id", "title", "created_at", "updated_at", "question_count"]
 
     class Meta:
         model = Quiz
@@ -65,11 +93,18 @@ class QuizSerializer(serializers.ModelSerializer):
             "url",
             "video_url",
             "questions",
+            "question_count",
         ]
         read_only_fields = [
             "questions",
         ]
 
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = set(self.DEFAULT_FIELDS if fields is None else fields)
+        for name in set(self.fields) - selected:
+            self.fields.pop(name)
+
 
 class QuizCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating a `Quiz` from a YouTube link.
@@ -83,6 +118,9 @@ class QuizCreateSerializer(serializers.ModelSerializer):
 
     Fields:
     - `url` (write-only): YouTube URL provided by the client.
+    - `reuse_existing` (write-only, optional): Copy an existing quiz for the
+      same video instead of generating a new one. Defaults to
+      `settings.QUIZ_REUSE_EXISTING`.
     - `questions` (read-only): Nested `QuestionSerializer` populated after
       quiz generation.
 
@@ -94,6 +132,7 @@ class QuizCreateSerializer(serializers.ModelSerializer):
     """
 
     url = serializers.URLField(write_only=True)
+    reuse_existing = serializers.BooleanField(write_only=True, required=False)
     questions = QuestionSerializer(many=True, read_only=True)
 
     class Meta:
@@ -105,6 +144,7 @@ class QuizCreateSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "url",
+            "reuse_existing",
             "video_url",
             "questions",
         ]
@@ -122,19 +162,37 @@ class QuizCreateSerializer(serializers.ModelSerializer):
         quiz. Raises `serializers.ValidationError` with a German message when
         the URL or video id is invalid to match existing project messages.
         """
-        parsed = urllib.parse.urlparse(value)
-        domain = parsed.netloc.lower()
-
-        if domain == "youtu.be":
-            video_id = parsed.path.lstrip("/")
-        elif domain in ("www.youtube.com", "youtube.com"):
-            query = urllib.parse.parse_qs(parsed.query)
-            video_id = query.get("v", [None])[0]
-        else:
-            raise serializers.ValidationError("Ungültige YouTube-URL.")
-
-        if not video_id or not re.match(r"^[\w-]{11}$", video_id):
+        video_id = extract_youtube_video_id(value)
+        if not video_id:
+            domain = urllib.parse.urlparse(value).netloc.lower()
+            if domain not in YOUTUBE_DOMAINS:
+                raise serializers.ValidationError("Ungültige YouTube-URL.")
             raise serializers.ValidationError("Ungültige YouTube-Video-ID.")
 
         self.video_id = video_id
         return value
+
+
+class QuizJobSerializer(serializers.ModelSerializer):
+    """Read-only serializer for `QuizJob`.
+
+    Exposes the job `status` (queued/claimed/downloading/transcribing/
+    generating/done/failed), an `error` message for failed jobs and the
+    primary key of the resulting quiz as `quiz_id` once the job is done. A
+    job re-queued for a retry is `queued` again with the last `error`.
+    """
+
+    quiz_id = serializers.IntegerField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = QuizJob
+        fields = [
+            "id",
+            "status",
+            "error",
+            "video_url",
+            "quiz_id",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,232 @@
+"""Single-flight coordination of quiz jobs for the same video.
+
+When a link is shared, many users submit the same video within seconds.
+Only one job per video - the leader - runs the pipeline; jobs submitted
+while it is in flight are saved as its followers (`QuizJob.leader`) and
+are never handed to a worker. Followers stay `queued` until the leader
+finishes; then each receives its own copy of the quiz
+(`complete_followers`) or the leader's error (`fail_followers`).
+
+At most one in-flight leader per video is enforced by the partial unique
+constraint `quizjob_single_flight`, so the coordination holds across
+worker processes and hosts: a submission that loses the race to become
+leader gets an `IntegrityError` and attaches to the winner instead.
+
+With the in-process thread backend a leader can be orphaned by a process
+restart. A leader that has not changed for `QUIZ_SINGLE_FLIGHT_STALE_SECONDS`
+is therefore abandoned and the new job takes over its followers. From the
+moment a process enqueues a leader until its run ends (`mark_alive`,
+`keep_alive`), a heartbeat thread refreshes the leader's `updated_at` every
+third of that time, so neither a leader waiting for a free worker nor a
+long download or transcription is mistaken for an orphan. Takeover only
+succeeds if the leader is unchanged since it was read, and a job only
+starts through a conditional `queued` -> `downloading` update
+(`jobs.claim_job`), so an abandoned leader is never run. The database job
+queue recovers crashed jobs through leases instead.
+
+Settings:
+- `QUIZ_SINGLE_FLIGHT_STALE_SECONDS`: Age after which a thread-backend
+  leader without progress is considered orphaned.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from app_quiz.models import QuizJob
+from . import utils
+
+
+logger = logging.getLogger(__name__)
+
+IN_FLIGHT = (
+    QuizJob.Status.QUEUED,
+    QuizJob.Status.CLAIMED,
+    QuizJob.Status.DOWNLOADING,
+    QuizJob.Status.TRANSCRIBING,
+    QuizJob.Status.GENERATING,
+)
+
+_MAX_ATTEMPTS = 5
+
+# Leaders enqueued or running in this process, kept fresh by the heartbeat.
+_alive = set()
+_alive_lock = threading.Lock()
+_heartbeat = None
+
+
+def find_idempotent_job(creator, key: str) -> QuizJob | None:
+    """Return the job `creator` submitted with Idempotency-Key `key`."""
+    if not key:
+        return None
+    return QuizJob.objects.filter(creator=creator, idempotency_key=key).first()
+
+
+def _in_flight_leader(video_id: str) -> QuizJob | None:
+    return QuizJob.objects.filter(
+        video_id=video_id, leader__isnull=True, status__in=IN_FLIGHT
+    ).first()
+
+
+def _is_stale(leader: QuizJob) -> bool:
+    if settings.QUIZ_JOB_BACKEND == "database":
+        return False
+    cutoff = timezone.now() - timedelta(
+        seconds=settings.QUIZ_SINGLE_FLIGHT_STALE_SECONDS
+    )
+    return leader.updated_at < cutoff
+
+
+def submit(job: QuizJob) -> tuple[QuizJob, bool]:
+    """Save the new `job` as leader or as follower of an in-flight leader.
+
+    Parameters:
+    - job (QuizJob): Unsaved job; `video_id` must be set.
+
+    Returns:
+    - `(job, is_leader)`. Only a leader has to be handed to the workers.
+
+    Raises:
+    - IntegrityError: If `job.idempotency_key` was used concurrently by the
+      same user, or if no leader could be settled after several races.
+    """
+    for attempt in range(_MAX_ATTEMPTS):
+        leader = _in_flight_leader(job.video_id)
+        try:
+            with transaction.atomic():
+                if leader is not None:
+                    leader = (
+                        QuizJob.objects.select_for_update()
+                        .filter(pk=leader.pk, status__in=IN_FLIGHT)
+                        .first()
+                    )
+                if leader is None:
+                    job.leader = None
+                    job.save(force_insert=True)
+                    return job, True
+                if _is_stale(leader) and _take_over(leader, job):
+                    return job, True
+                job.leader = leader
+                job.save(force_insert=True)
+                return job, False
+        except IntegrityError:
+            job.leader = None
+            if attempt == _MAX_ATTEMPTS - 1 or find_idempotent_job(
+                job.creator_id, job.idempotency_key
+            ):
+                raise
+
+
+def _take_over(stale: QuizJob, job: QuizJob) -> bool:
+    """Abandon the orphaned leader `stale` and make `job` lead its followers.
+
+    Returns False without changes if `stale` was started or refreshed
+    since it was read; `job` should then follow it.
+    """
+    error = "Quiz generation was interrupted. Please try again."
+    abandoned = QuizJob.objects.filter(
+        pk=stale.pk, status=stale.status, updated_at=stale.updated_at
+    ).update(status=QuizJob.Status.FAILED, error=error, updated_at=timezone.now())
+    if not abandoned:
+        return False
+    logger.warning(
+        "Quiz job %s looks orphaned; job for %s takes over", stale.pk, stale.video_id
+    )
+    job.leader = None
+    job.save(force_insert=True)
+    QuizJob.objects.filter(leader=stale, status__in=IN_FLIGHT).update(leader=job)
+    return True
+
+
+def refresh_alive_leaders() -> int:
+    """Bump `updated_at` of the in-flight leaders running in this process.
+
+    Returns the number of refreshed jobs.
+    """
+    with _alive_lock:
+        pks = list(_alive)
+    if not pks:
+        return 0
+    return QuizJob.objects.filter(pk__in=pks, status__in=IN_FLIGHT).update(
+        updated_at=timezone.now()
+    )
+
+
+def _heartbeat_loop() -> None:
+    while True:
+        time.sleep(max(settings.QUIZ_SINGLE_FLIGHT_STALE_SECONDS / 3, 1))
+        try:
+            refresh_alive_leaders()
+        except Exception:
+            logger.exception("Refreshing running quiz jobs failed")
+        finally:
+            close_old_connections()
+
+
+def mark_alive(job_id: int) -> None:
+    """Keep job `job_id` from looking orphaned until `release(job_id)`.
+
+    Call when the job is handed to this process's workers, so the time it
+    waits for a free worker is covered as well.
+    """
+    global _heartbeat
+    with _alive_lock:
+        _alive.add(job_id)
+        if _heartbeat is None:
+            _heartbeat = threading.Thread(
+                target=_heartbeat_loop, name="quiz-job-heartbeat", daemon=True
+            )
+            _heartbeat.start()
+
+
+def release(job_id: int) -> None:
+    """Stop refreshing job `job_id`."""
+    with _alive_lock:
+        _alive.discard(job_id)
+
+
+@contextmanager
+def keep_alive(job: QuizJob):
+    """Keep `job` from looking orphaned while its pipeline runs here."""
+    mark_alive(job.pk)
+    try:
+        yield job
+    finally:
+        release(job.pk)
+
+
+def complete_followers(leader: QuizJob, quiz) -> int:
+    """Give every waiting follower of `leader` its own copy of `quiz`.
+
+    Call after the leader was committed as `done`. `submit()` only attaches
+    followers to a leader row it locked while still in flight, so every
+    follower is committed by then and no new one can attach. Each copy is
+    stored in its own short transaction.
+
+    Returns the number of completed followers.
+    """
+    followers = list(
+        QuizJob.objects.filter(leader=leader, status__in=IN_FLIGHT).only(
+            "pk", "creator_id"
+        )
+    )
+    for follower in followers:
+        with transaction.atomic():
+            follower.quiz = utils.clone_quiz(quiz, follower.creator_id)
+            follower.status = QuizJob.Status.DONE
+            follower.error = ""
+            follower.save(update_fields=["quiz", "status", "error", "updated_at"])
+    return len(followers)
+
+
+def fail_followers(leader: QuizJob, error: str) -> int:
+    """Mark every waiting follower of `leader` `failed` with `error`."""
+    return QuizJob.objects.filter(leader=leader, status__in=IN_FLIGHT).update(
+        status=QuizJob.Status.FAILED, error=error, updated_at=timezone.now()
+    )
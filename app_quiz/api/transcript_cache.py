@@ -0,0 +1,95 @@
+"""Persistent transcript cache keyed by YouTube video id.
+
+Popular videos are submitted many times. Transcripts are stored in the
+`Transcript` table keyed by (video_id, Whisper model, language) so a repeat
+submission skips both the audio download and the transcription.
+
+The cache is bounded by the total size of stored transcripts; when it grows
+beyond `TRANSCRIPT_CACHE_MAX_BYTES` the least recently used entries are
+evicted.
+
+Settings:
+- `TRANSCRIPT_CACHE_ENABLED`: Turn the cache on or off.
+- `TRANSCRIPT_CACHE_MAX_BYTES`: Upper bound for the summed transcript size.
+- `WHISPER_MODEL` / `WHISPER_LANGUAGE`: Part of the cache key.
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from app_quiz.models import Transcript
+
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_key(video_id: str) -> dict:
+    return {
+        "video_id": video_id,
+        "model_name": settings.WHISPER_MODEL,
+        "language": settings.WHISPER_LANGUAGE or "",
+    }
+
+
+def get(video_id: str) -> str | None:
+    """Return the cached transcript for `video_id` or None on a miss.
+
+    A hit refreshes the entry's `last_used_at` for LRU eviction.
+    """
+    if not settings.TRANSCRIPT_CACHE_ENABLED:
+        return None
+    entry = Transcript.objects.filter(**_cache_key(video_id)).only("pk", "text").first()
+    if entry is None:
+        return None
+    Transcript.objects.filter(pk=entry.pk).update(last_used_at=timezone.now())
+    return entry.text
+
+
+def put(video_id: str, text: str) -> None:
+    """Store `text` as the transcript for `video_id` and enforce the size cap."""
+    if not settings.TRANSCRIPT_CACHE_ENABLED:
+        return
+    size_bytes = len(text.encode("utf-8"))
+    try:
+        with transaction.atomic():
+            Transcript.objects.update_or_create(
+                **_cache_key(video_id),
+                defaults={
+                    "text": text,
+                    "size_bytes": size_bytes,
+                    "last_used_at": timezone.now(),
+                },
+            )
+    except IntegrityError:
+        # Another worker stored the same transcript concurrently.
+        return
+    evict()
+
+
+def evict(max_bytes: int | None = None) -> int:
+    """Delete least recently used transcripts until under `max_bytes`.
+
+    Returns the number of evicted entries.
+    """
+    if max_bytes is None:
+        max_bytes = settings.TRANSCRIPT_CACHE_MAX_BYTES
+    total = Transcript.objects.aggregate(total=Sum("size_bytes"))["total"] or 0
+    if total <= max_bytes:
+        return 0
+
+    evicted_ids = []
+    entries = Transcript.objects.order_by("last_used_at", "pk").values_list(
+        "pk", "size_bytes"
+    )
+    for pk, size_bytes in entries.iterator():
+        if total <= max_bytes:
+            break
+        evicted_ids.append(pk)
+        total -= size_bytes
+    Transcript.objects.filter(pk__in=evicted_ids).delete()
+    logger.info("Evicted %d transcripts from the cache", len(evicted_ids))
+    return len(evicted_ids)
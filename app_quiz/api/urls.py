@@ -1,15 +1,27 @@
 """URL patterns for the `app_quiz` API.
 
-Provides endpoints to create a quiz from a YouTube URL, list quizzes,
-and retrieve/update/delete a single quiz by ID.
+Provides endpoints to create a quiz from a YouTube URL (with a variant
+whose jobs run on the asyncio runner), list quizzes,
+retrieve/update/delete a single quiz by ID, and poll the state of a
+quiz-generation job.
 """
 
 from django.urls import path
-from .views import CreateQuizView, QuizListView, QuizDetailView
+from .views import (
+    AsyncCreateQuizView,
+    CreateQuizView,
+    QuizListView,
+    QuizDetailView,
+    QuizJobDetailView,
+)
 
 
 urlpatterns = [
     path("createQuiz/", CreateQuizView.as_view(), name="create_quiz"),
+    path(
+        "createQuiz/async/", AsyncCreateQuizView.as_view(), name="create_quiz_async"
+    ),
     path("quizzes/", QuizListView.as_view(), name="quiz_list"),
     path("quizzes/<int:id>/", QuizDetailView.as_view(), name="quiz_detail"),
+    path("jobs/<int:id>/", QuizJobDetailView.as_view(), name="quiz_job_detail"),
 ]
@@ -2,14 +2,21 @@ from django.conf import settings
 
 
 import json
+import os
+import shutil
 import tempfile
-import whisper
 from google import genai
 from google.genai.errors import ClientError
 from yt_dlp import YoutubeDL
 
 from rest_framework import serializers
 
+from app_quiz.models import Quiz, Question
+from . import pipeline_metrics, whisper_registry
+
+
+GEMINI_MODEL = "gemini-2.5-flash"
+AUDIO_DIR_PREFIX = "quizly-audio-"
 
 QUIZ_PROMPT_TEMPLATE = """
     Generate a JSON object with this exact structure:
@@ -44,15 +51,17 @@ def download_audio(video_url: str) -> str:
     - video_url (str): Full YouTube URL or watch link.
 
     Returns:
-    - str: Path to the downloaded audio file (m4a).
+    - str: Path to the downloaded audio file (m4a). Each call downloads
+      into its own temporary directory, so concurrent downloads of the same
+      video never share a file; remove it with `remove_audio`.
 
     Raises:
     - `serializers.ValidationError` if the download or extraction fails.
     """
-    temp_file = tempfile.gettempdir() + "/%(id)s.%(ext)s"
+    download_dir = tempfile.mkdtemp(prefix=AUDIO_DIR_PREFIX)
     ydl_opts = {
         "format": "bestaudio[ext=m4a]",
-        "outtmpl": temp_file,
+        "outtmpl": os.path.join(download_dir, "%(id)s.%(ext)s"),
         "quiet": True,
         "noplaylist": True,
         "postprocessors": [
@@ -68,23 +77,50 @@ def download_audio(video_url: str) -> str:
             audio_path = info["requested_downloads"][0]["filepath"]
             return audio_path
     except Exception as e:
+        shutil.rmtree(download_dir, ignore_errors=True)
         raise serializers.ValidationError({"error": f"Audio download failed: {e}"})
 
 
+def remove_audio(audio_path: str) -> None:
+    """Delete a file returned by `download_audio` and its temporary directory.
+
+    Paths outside a directory created by `download_audio` are left alone.
+    """
+    download_dir = os.path.dirname(audio_path)
+    if os.path.basename(download_dir).startswith(AUDIO_DIR_PREFIX):
+        shutil.rmtree(download_dir, ignore_errors=True)
+
+
 def parse_audio_into_text(audio_path: str) -> str:
     """Transcribe audio at `audio_path` to plain text using Whisper.
 
+    Uses the process-wide model from `whisper_registry` (size configured by
+    `settings.WHISPER_MODEL`) instead of loading the weights per call. When
+    `settings.WHISPER_LANGUAGE` is set, language detection is skipped.
+
     Parameters:
     - audio_path (str): Filesystem path to the audio file.
 
     Returns:
     - str: Transcribed text.
     """
-    model = whisper.load_model("tiny")
-    result = model.transcribe(audio_path, fp16=False)
+    options = {}
+    if settings.WHISPER_LANGUAGE:
+        options["language"] = settings.WHISPER_LANGUAGE
+    result = whisper_registry.transcribe(audio_path, **options)
+    pipeline_metrics.record_transcription(result)
     return result["text"]
 
 
+def _generation_error(e: ClientError) -> serializers.ValidationError:
+    """Map a GenAI `ClientError` to the error reported to the client."""
+    if e.response.status_code == 429:
+        return serializers.ValidationError(
+            {"error": "Quota exceeded for Gemini API. Please try again later."}
+        )
+    return serializers.ValidationError({"error": f"Error generating quiz: {e}"})
+
+
 def generate_quiz_from_text(transcript: str) -> dict:
     """Call Google Gemini to generate a quiz JSON from `transcript`.
 
@@ -101,16 +137,27 @@ def generate_quiz_from_text(transcript: str) -> dict:
     client = genai.Client(api_key=settings.GEMINI_API_KEY)
     prompt = QUIZ_PROMPT_TEMPLATE.format(transcript=transcript)
     try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash", contents=prompt
-        )
+        response = client.models.generate_content(model=GEMINI_MODEL, contents=prompt)
         return response
     except ClientError as e:
-        if e.response.status_code == 429:
-            raise serializers.ValidationError(
-                {"error": "Quota exceeded for Gemini API. Please try again later."}
-            )
-        raise serializers.ValidationError({"error": f"Error generating quiz: {e}"})
+        raise _generation_error(e)
+
+
+async def generate_quiz_from_text_async(transcript: str) -> dict:
+    """Async variant of `generate_quiz_from_text` using the client's `aio` API.
+
+    The request is awaited on the event loop instead of blocking a thread.
+    Parameters, return value and errors are the same as for
+    `generate_quiz_from_text`.
+    """
+    client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    prompt = QUIZ_PROMPT_TEMPLATE.format(transcript=transcript)
+    try:
+        return await client.aio.models.generate_content(
+            model=GEMINI_MODEL, contents=prompt
+        )
+    except ClientError as e:
+        raise _generation_error(e)
 
 
 def parse_quiz_response(quiz_response: dict) -> dict:
@@ -137,20 +184,123 @@ def parse_quiz_response(quiz_response: dict) -> dict:
         raise ValueError(f"Invalid response structure: {e}")
 
 
-def create_quiz_questions(quiz_instance, quiz_dict):
+def validate_quiz_questions(quiz_dict: dict) -> list:
+    """Validate every question in `quiz_dict` before anything is stored.
+
+    Parameters:
+    - quiz_dict (dict): Parsed quiz dictionary containing `questions`.
+
+    Returns:
+    - list: The validated question dicts.
+
+    Raises:
+    - ValueError naming the first invalid question. Each question needs a
+      non-empty `question_title` and `answer` (at most 255 characters), a
+      `question_options` list of 4 strings, and an answer contained in the
+      options.
+    """
+    questions = quiz_dict.get("questions")
+    if not isinstance(questions, list) or not questions:
+        raise ValueError("Quiz contains no questions")
+
+    max_length = Question._meta.get_field("question_title").max_length
+    for index, q in enumerate(questions, start=1):
+        if not isinstance(q, dict):
+            raise ValueError(f"Question {index} is not an object")
+        title = q.get("question_title")
+        options = q.get("question_options")
+        answer = q.get("answer")
+        if not isinstance(title, str) or not title.strip():
+            raise ValueError(f"Question {index} has no title")
+        if not isinstance(answer, str) or not answer.strip():
+            raise ValueError(f"Question {index} has no answer")
+        if len(title) > max_length or len(answer) > max_length:
+            raise ValueError(f"Question {index} exceeds {max_length} characters")
+        if (
+            not isinstance(options, list)
+            or len(options) != 4
+            or not all(isinstance(option, str) for option in options)
+        ):
+            raise ValueError(f"Question {index} must have exactly 4 options")
+        if answer not in options:
+            raise ValueError(f"Answer of question {index} is not one of its options")
+    return questions
+
+
+def create_quiz_questions(quiz_instance, quiz_dict) -> list:
     """Persist questions from `quiz_dict` onto the given `quiz_instance`.
 
+    The whole payload is validated first (`validate_quiz_questions`) and
+    then written with a single batched INSERT.
+
     Parameters:
     - quiz_instance: Saved `Quiz` model instance.
     - quiz_dict (dict): Parsed quiz dictionary containing `questions`.
 
-    Notes:
-    - Expects each question dict to include `question_title`,
-      `question_options` (list of 4), and `answer`.
+    Returns:
+    - list: The created `Question` instances, with primary keys set on
+      backends that return them from bulk inserts.
+
+    Raises:
+    - ValueError if any question is invalid; nothing is written then.
     """
-    for q in quiz_dict["questions"]:
-        quiz_instance.questions.create(
-            question_title=q["question_title"],
-            question_options=q["question_options"],
-            answer=q["answer"],
-        )
+    questions = validate_quiz_questions(quiz_dict)
+    return Question.objects.bulk_create(
+        [
+            Question(
+                quiz=quiz_instance,
+                question_title=q["question_title"],
+                question_options=q["question_options"],
+                answer=q["answer"],
+            )
+            for q in questions
+        ]
+    )
+
+
+def find_reusable_quiz(video_id: str):
+    """Return the most recent `Quiz` generated for `video_id`, if any.
+
+    Parameters:
+    - video_id (str): Normalized 11-character YouTube video id.
+
+    Returns:
+    - `Quiz` instance or None. The lookup uses the index on `video_id`.
+    """
+    return (
+        Quiz.objects.filter(video_id=video_id, questions__isnull=False)
+        .order_by("-created_at")
+        .first()
+    )
+
+
+def clone_quiz(source_quiz, creator):
+    """Deep-copy `source_quiz` and its questions for `creator`.
+
+    Parameters:
+    - source_quiz: Existing `Quiz` instance to copy.
+    - creator: `User` (or user id) who will own the copy.
+
+    Returns:
+    - The new `Quiz` instance. Call inside a transaction so the quiz and its
+      questions are stored together.
+    """
+    creator_id = getattr(creator, "pk", creator)
+    quiz_instance = Quiz.objects.create(
+        creator_id=creator_id,
+        title=source_quiz.title,
+        description=source_quiz.description,
+        video_url=source_quiz.video_url,
+    )
+    Question.objects.bulk_create(
+        [
+            Question(
+                quiz=quiz_instance,
+                question_title=question.question_title,
+                question_options=question.question_options,
+                answer=question.answer,
+            )
+            for question in source_quiz.questions.all()
+        ]
+    )
+    return quiz_instance
@@ -1,82 +1,208 @@
-from django.db import transaction
-from rest_framework import generics
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+
+from app_quiz.models import Quiz, QuizJob
+from .mixins import (
+    CachedPayloadMixin,
+    ConditionalGetMixin,
+    QuizFieldsetMixin,
+    ReplicaReadMixin,
+    quiz_change_state,
+)
+from .pagination import QuizCursorPagination
+from .serializers import QuizCreateSerializer, QuizJobSerializer, QuizSerializer
+from .permissions import IsOwner
 
+from . import async_jobs, jobs, pipeline_metrics, single_flight, utils
 
-from app_quiz.models import Quiz
-from .serializers import QuizCreateSerializer, QuizSerializer
-from .permissions import IsOwner
 
-from . import utils
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
 
 
 class CreateQuizView(generics.CreateAPIView):
-    """Create a `Quiz` from a YouTube video.
+    """Start generating a `Quiz` from a YouTube video.
 
     Workflow:
-    1. Download audio from a YouTube URL.
-    2. Transcribe audio to text using Whisper.
-    3. Send transcript to Google Gemini (GenAI) to generate a quiz JSON.
-    4. Parse the AI response and create `Quiz` and question objects.
-
-    The view uses `QuizCreateSerializer` for input validation and calls
-    `perform_create` to orchestrate the end-to-end process.
+    1. Validate the YouTube URL and record a `QuizJob` for the user.
+    2. If reuse is enabled (`reuse_existing` flag or
+       `settings.QUIZ_REUSE_EXISTING`) and a quiz for the same video exists,
+       copy it for the user and finish the job right away.
+    3. Otherwise hand the job to the background workers (see `jobs`), which download
+       the audio, transcribe it with Whisper, generate the quiz with
+       Google Gemini and persist the `Quiz` and its questions. If a job for
+       the same video is already running, the new job follows it instead
+       and receives a copy of its quiz (see `single_flight`).
+    4. Respond immediately with HTTP 202 and the job representation; the
+       client polls `jobs/<id>/` until the job is `done` or `failed`.
+
+    Clients may send an `Idempotency-Key` header. A retried request with a
+    key the user already used returns the original job (with the
+    `Idempotent-Replayed: true` header) instead of creating a new one.
+
+    The view uses `QuizCreateSerializer` for input validation and
+    `QuizJobSerializer` for the response body.
     """
 
     serializer_class = QuizCreateSerializer
 
-    def perform_create(self, serializer):
-        """Override to orchestrate quiz creation from validated input.
-
-        Steps:
-        - Validate serializer and extract `url`/`video_id`.
-        - Download audio and transcribe to text.
-        - Generate quiz JSON via Gemini and parse it.
-        - Save `Quiz` instance and create question records inside a DB
-          transaction (atomic).
+    def create(self, request, *args, **kwargs):
+        """Validate input, enqueue a job and return HTTP 202 Accepted."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        key = request.headers.get("Idempotency-Key", "").strip()
+        if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            return Response(
+                {"error": "Idempotency-Key must not exceed 255 characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        job = single_flight.find_idempotent_job(request.user, key)
+        replayed = job is not None
+        if job is None:
+            try:
+                job = self.perform_create(serializer, idempotency_key=key)
+            except IntegrityError:
+                # A concurrent request with the same key won the race.
+                job = single_flight.find_idempotent_job(request.user, key)
+                if job is None:
+                    raise
+                replayed = True
+        if replayed and job.video_id != serializer.video_id:
+            return Response(
+                {"error": "Idempotency-Key was already used for another video."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        headers = {"Location": reverse("quiz_job_detail", kwargs={"id": job.id})}
+        if replayed:
+            headers["Idempotent-Replayed"] = "true"
+        return Response(
+            QuizJobSerializer(job).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers=headers,
+        )
+
+    def perform_create(self, serializer, idempotency_key=""):
+        """Create the `QuizJob` for the validated `video_id` and enqueue it.
 
         Parameters:
-        - serializer: An instance of `QuizCreateSerializer` (must be valid).
+        - serializer: A validated instance of `QuizCreateSerializer`.
+        - idempotency_key (str): Client `Idempotency-Key`, stored on the job.
+
+        Returns:
+        - The created `QuizJob`. Only jobs that lead a pipeline run are
+          enqueued; followers are completed by their leader.
 
         Raises:
-        - Propagates `serializers.ValidationError` and `ValueError` from
-          called methods; transaction ensures rollback on failure.
+        - IntegrityError: If the user used `idempotency_key` concurrently.
         """
-        creator = self.request.user
-        video_url = serializer.validated_data.pop("url")
         video_id = serializer.video_id
-        video_url = f"https://www.youtube.com/watch?v={video_id}"
+        job = QuizJob(
+            creator=self.request.user,
+            video_id=video_id,
+            video_url=f"https://www.youtube.com/watch?v={video_id}",
+            idempotency_key=idempotency_key,
+        )
+        reuse_existing = serializer.validated_data.get(
+            "reuse_existing", settings.QUIZ_REUSE_EXISTING
+        )
+        if reuse_existing:
+            source_quiz = utils.find_reusable_quiz(video_id)
+            if source_quiz is not None:
+                return jobs.complete_job_from_quiz(job, source_quiz)
+
+        job, is_leader = single_flight.submit(job)
+        if is_leader:
+            self.enqueue_job(job)
+        return job
+
+    def enqueue_job(self, job):
+        """Hand `job` to the background workers (see `jobs`)."""
+        jobs.enqueue_quiz_job(job)
+
+
+class AsyncCreateQuizView(CreateQuizView):
+    """Variant of `CreateQuizView` whose jobs run on the asyncio runner.
+
+    The request itself is handled exactly like `createQuiz/` by the same
+    synchronous DRF view (under ASGI Django runs it in a worker thread).
+    Only the job differs: it runs as a coroutine on the event loop in
+    `async_jobs`, where downloads and Whisper use bounded executors and the
+    Gemini call is awaited, so a process can keep many generations in
+    flight without a thread each. With `QUIZ_JOBS_EAGER` the job runs
+    inline like in `CreateQuizView`, and with the database job backend it
+    is left to `run_quiz_workers`.
+    """
 
-        if serializer.is_valid(raise_exception=True):
-            with transaction.atomic():
-                audio_path = utils.download_audio(video_url)
-                text = utils.parse_audio_into_text(audio_path)
-                quiz_data_response = utils.generate_quiz_from_text(text)
-                quiz_dict = utils.parse_quiz_response(quiz_data_response)
+    def enqueue_job(self, job):
+        if settings.QUIZ_JOBS_EAGER or jobs.uses_database_queue():
+            super().enqueue_job(job)
+            return
+        transaction.on_commit(lambda: async_jobs.start_quiz_job(job.pk))
+
+
+class QuizListView(
+    ReplicaReadMixin,
+    CachedPayloadMixin,
+    ConditionalGetMixin,
+    QuizFieldsetMixin,
+    generics.ListAPIView,
+):
+    """List endpoint returning the requesting user's `Quiz` objects.
+
+    Results are cursor-paginated newest first (`QuizCursorPagination`).
+    Questions for the whole page are loaded with one prefetch query, so a
+    page costs two queries regardless of its size. `?view=summary` or
+    `?fields=` trim the payload and the SQL (see `QuizFieldsetMixin`).
+    Responses carry an `ETag`; matching conditional requests get a 304 from
+    a single aggregate query (see `ConditionalGetMixin`). No `Last-Modified`
+    is sent: deleting a quiz does not advance the newest `updated_at`, so
+    `If-Modified-Since` would keep answering 304. Rendered pages are cached
+    per user (see `CachedPayloadMixin`) and cache misses read from a
+    replica if configured (see `ReplicaReadMixin`).
 
+    Uses `QuizSerializer` to serialize quiz instances.
+    """
 
-                quiz_instance = serializer.save(
-                    creator=creator,
-                    video_url=video_url,
-                    title=quiz_dict["title"],
-                    description=quiz_dict["description"],
-                )
-                utils.create_quiz_questions(quiz_instance, quiz_dict)
+    serializer_class = QuizSerializer
+    pagination_class = QuizCursorPagination
+    timestamp_keys = ()
 
+    def get_queryset(self):
+        return self.get_quiz_queryset(
+            Quiz.objects.filter(creator_id=self.request.user.id)
+        )
 
-class QuizListView(generics.ListAPIView):
-    """List endpoint returning all `Quiz` objects.
+    def get_conditional_state(self):
+        return quiz_change_state(Quiz.objects.filter(creator_id=self.request.user.id))
 
-    Uses `QuizSerializer` to serialize quiz instances.
-    """
+    def get_payload_cache_scope(self):
+        return "list", self.request.user.id
 
-    serializer_class = QuizSerializer
-    queryset = Quiz.objects.all()
+    def get_payload_owner_id(self):
+        # The aggregate's creator_id is None while the user has no quizzes.
+        return self.request.user.id
 
 
-class QuizDetailView(generics.RetrieveUpdateDestroyAPIView):
+class QuizDetailView(
+    ReplicaReadMixin,
+    CachedPayloadMixin,
+    ConditionalGetMixin,
+    QuizFieldsetMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
     """Retrieve, update or delete a single `Quiz` by `id`.
 
+    GET supports `?view=summary` and `?fields=` (see `QuizFieldsetMixin`)
+    and conditional requests via `ETag`/`Last-Modified`
+    (see `ConditionalGetMixin`). Rendered payloads are cached and
+    invalidated on PATCH and DELETE (see `CachedPayloadMixin`). GETs read
+    from a replica if configured (see `ReplicaReadMixin`); writes always go
+    to the primary.
+
     Permissions:
     - Requires authentication and the `IsOwner` permission to modify/delete.
     """
@@ -85,3 +211,43 @@ class QuizDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Quiz.objects.all()
     lookup_field = "id"
     permission_classes = [IsAuthenticated, IsOwner]
+
+    def get_queryset(self):
+        return self.get_quiz_queryset(super().get_queryset())
+
+    def get_conditional_state(self):
+        """Aggregate state of the quiz, or None unless the caller owns it.
+
+        Missing quizzes and other users' quizzes fall through to the regular
+        404/403 handling instead of answering 304.
+        """
+        state = quiz_change_state(Quiz.objects.filter(pk=self.kwargs["id"]))
+        if state["creator_id"] != self.request.user.id:
+            return None
+        return state
+
+    def get_payload_cache_scope(self):
+        return "detail", self.kwargs["id"]
+
+
+class QuizJobDetailView(generics.RetrieveAPIView):
+    """Report the state of a quiz-generation job by `id`.
+
+    Returns the job status and, once it is `done`, the id of the created
+    quiz. Only the user who started the job may read it. The time spent in
+    each pipeline stage is reported in the `Server-Timing` header as
+    `job_<stage>` entries.
+    """
+
+    serializer_class = QuizJobSerializer
+    queryset = QuizJob.objects.all()
+    lookup_field = "id"
+    permission_classes = [IsAuthenticated, IsOwner]
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return the job and its stage timings as `Server-Timing`."""
+        job = self.get_object()
+        response = Response(self.get_serializer(job).data)
+        if job.timings:
+            response["Server-Timing"] = pipeline_metrics.job_timing_header(job)
+        return response
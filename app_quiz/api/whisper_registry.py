@@ -0,0 +1,178 @@
+"""Process-wide registry of loaded Whisper models.
+
+`whisper.load_model` reads the weights from disk and builds the torch
+module, which takes seconds and a sizeable chunk of memory. This module
+loads each model size at most once per process and hands the same instance
+to every caller. It also records how long each load and warm-up took and
+how much resident memory the model added, and exposes these figures of the
+serving process as `quizly_whisper_*` gauges on `/metrics` (see
+`core.metrics`) so worker processes can be sized.
+
+Settings:
+- `WHISPER_MODEL`: Default model size (e.g. "tiny", "base", "small").
+- `WHISPER_PREWARM`: Load and warm up the default model when the app starts
+  (see `AppQuizConfig.ready`).
+"""
+
+import functools
+import logging
+import os
+import threading
+import time
+
+import numpy
+import whisper
+from django.conf import settings
+
+from core import metrics
+
+
+logger = logging.getLogger(__name__)
+
+_models = {}
+_stats = {}
+_load_lock = threading.Lock()
+_transcribe_locks = {}
+
+# (metric name, `model_stats()` key, help text)
+STAT_GAUGES = (
+    ("quizly_whisper_load_seconds", "load_seconds", "Time to load the model."),
+    (
+        "quizly_whisper_warmup_seconds",
+        "warmup_seconds",
+        "Time of the warm-up transcription.",
+    ),
+    (
+        "quizly_whisper_rss_bytes",
+        "rss_bytes",
+        "Resident memory of the process after loading or warming up the model.",
+    ),
+    (
+        "quizly_whisper_rss_delta_bytes",
+        "rss_delta_bytes",
+        "Resident memory added by loading the model.",
+    ),
+)
+
+
+def current_rss_bytes() -> int | None:
+    """Return the resident set size of this process in bytes.
+
+    Reads `/proc/self/statm` where available and falls back to the peak RSS
+    reported by `resource`. Returns None if neither source is available.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        import sys
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def get_model(name: str | None = None):
+    """Return the Whisper model `name`, loading it on first use.
+
+    Parameters:
+    - name (str | None): Model size; defaults to `settings.WHISPER_MODEL`.
+
+    Returns:
+    - The loaded `whisper.model.Whisper` instance shared by this process.
+    """
+    name = name or settings.WHISPER_MODEL
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    with _load_lock:
+        model = _models.get(name)
+        if model is None:
+            rss_before = current_rss_bytes()
+            start = time.perf_counter()
+            model = whisper.load_model(name)
+            load_seconds = time.perf_counter() - start
+            rss_after = current_rss_bytes()
+            rss_delta = (
+                rss_after - rss_before
+                if rss_before is not None and rss_after is not None
+                else None
+            )
+            _stats[name] = {
+                "load_seconds": load_seconds,
+                "rss_bytes": rss_after,
+                "rss_delta_bytes": rss_delta,
+                "warmup_seconds": None,
+            }
+            _transcribe_locks[name] = threading.Lock()
+            _models[name] = model
+            logger.info(
+                "Loaded Whisper model %r in %.2fs (rss=%s bytes, delta=%s bytes)",
+                name,
+                load_seconds,
+                rss_after,
+                rss_delta,
+            )
+    return model
+
+
+def transcribe(audio, name: str | None = None, **options) -> dict:
+    """Transcribe `audio` (a path or float32 array) with a shared model.
+
+    Whisper installs decoding hooks on the model for every call, so
+    concurrent transcriptions on one instance are serialized per model.
+    `fp16=False` is used unless overridden in `options`.
+    """
+    name = name or settings.WHISPER_MODEL
+    model = get_model(name)
+    options.setdefault("fp16", False)
+    with _transcribe_locks[name]:
+        return model.transcribe(audio, **options)
+
+
+def warm_up(name: str | None = None) -> None:
+    """Load model `name` and run one dummy transcription of silence.
+
+    The first real transcription then skips lazy initialisation work
+    (mel filters, tokenizer, torch kernels). The time taken is recorded in
+    `model_stats()` as `warmup_seconds`.
+    """
+    name = name or settings.WHISPER_MODEL
+    start = time.perf_counter()
+    transcribe(numpy.zeros(whisper.audio.SAMPLE_RATE, dtype=numpy.float32), name)
+    warmup_seconds = time.perf_counter() - start
+    _stats[name]["warmup_seconds"] = warmup_seconds
+    _stats[name]["rss_bytes"] = current_rss_bytes()
+    logger.info("Warmed up Whisper model %r in %.2fs", name, warmup_seconds)
+
+
+def model_stats() -> dict:
+    """Return load/warm-up timings and memory figures per loaded model."""
+    return {name: dict(stats) for name, stats in _stats.items()}
+
+
+def _stat_samples(key: str) -> list:
+    return [
+        ({"model": name}, stats[key])
+        for name, stats in model_stats().items()
+        if stats[key] is not None
+    ]
+
+
+for _name, _key, _help_text in STAT_GAUGES:
+    metrics.register_collector(
+        _name, "gauge", _help_text, functools.partial(_stat_samples, _key)
+    )
+
+
+def clear() -> None:
+    """Drop all loaded models (used by tests)."""
+    with _load_lock:
+        _models.clear()
+        _stats.clear()
+        _transcribe_locks.clear()
@@ -1,6 +1,37 @@
+import logging
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
 
 
 class AppQuizConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app_quiz"
+
+    def ready(self):
+        """Connect signal handlers and optionally warm up Whisper.
+
+        Whisper is pre-loaded and warmed up only when `WHISPER_PREWARM` is
+        enabled. Warm-up runs in a background thread so process start-up is
+        not blocked; a request that needs the model before warm-up finishes
+        simply waits for the load to complete.
+        """
+        from app_quiz import signals  # noqa: F401
+
+        if settings.WHISPER_PREWARM:
+            threading.Thread(
+                target=self._warm_up_whisper, name="whisper-warmup", daemon=True
+            ).start()
+
+    @staticmethod
+    def _warm_up_whisper():
+        from app_quiz.api import whisper_registry
+
+        try:
+            whisper_registry.warm_up()
+        except Exception:
+            logger.exception("Whisper warm-up failed")
@@ -0,0 +1,404 @@
+"""Drive concurrent simulated users through the auth and quiz API.
+
+Usage:
+    python manage.py loadtest [--users 20] [--iterations 1] [--json report.json]
+    python manage.py loadtest --url http://127.0.0.1:8000 --users 20 \
+        --video-url https://www.youtube.com/watch?v=<id>
+
+Every simulated user registers once and then runs login -> createQuiz ->
+quiz list -> quiz detail -> PATCH -> token refresh -> logout
+`--iterations` times. All users start at the same moment, so the requests
+contend for the database like real traffic. The report lists, per
+endpoint, the number of requests, errors (any unexpected status, including
+connection failures) and p50/p95/p99 latency, plus the throughput over the
+whole run.
+
+Without `--url` the app is served in-process by a threaded WSGI server on
+a throw-away database (a temporary file for SQLite, so the production
+pragmas and locking apply). yt-dlp, Whisper and Gemini are replaced by the
+offline fakes from `app_quiz.offline`, quiz jobs run eagerly inside the
+`createQuiz/` request and the auth throttles are disabled. Every quiz is
+created for a made-up video id.
+
+With `--url` a running server is targeted as it is configured: its quiz
+pipeline runs for real (jobs are polled until they finish) and its
+throttles apply. A real pipeline cannot download made-up videos, so the
+quizzes are created for the videos given with `--video-url` (repeatable,
+used in turn). Without `--video-url` the createQuiz, job, quiz detail and
+PATCH steps are skipped and listed under `skipped` in the report.
+"""
+
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from contextlib import ExitStack, contextmanager
+from http.cookies import SimpleCookie
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app_quiz.offline import percentile
+
+
+ENDPOINTS = (
+    "register",
+    "login",
+    "create_quiz",
+    "job",
+    "list",
+    "detail",
+    "patch",
+    "refresh",
+    "logout",
+)
+
+PASSWORD = "Load-test-password-1"
+
+QUIZ_STEPS = ("create_quiz", "job", "detail", "patch")
+
+
+class Session:
+    """Minimal HTTP client for one simulated user.
+
+    Cookies are kept by hand because the auth cookies are marked `Secure`
+    outside DEBUG, which `http.cookiejar` would not send over plain HTTP.
+    """
+
+    def __init__(self, base_url: str, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cookies = {}
+        self.opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+    def request(self, method: str, path: str, payload=None):
+        """Send a JSON request and return `(status, parsed_body)`.
+
+        A connection failure is reported as status 0.
+        """
+        headers = {"Content-Type": "application/json"}
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        data = json.dumps(payload).encode() if payload is not None else None
+        request = urllib.request.Request(
+            self.base_url + path, data=data, method=method, headers=headers
+        )
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                status, body, reply_headers = (
+                    response.status,
+                    response.read(),
+                    response.headers,
+                )
+        except urllib.error.HTTPError as e:
+            status, body, reply_headers = e.code, e.read(), e.headers
+        except (urllib.error.URLError, OSError):
+            return 0, None
+        self._store_cookies(reply_headers.get_all("Set-Cookie") or [])
+        try:
+            return status, json.loads(body) if body else None
+        except ValueError:
+            return status, None
+
+    def _store_cookies(self, headers):
+        for header in headers:
+            for name, morsel in SimpleCookie(header).items():
+                if morsel.value and morsel["max-age"] != "0":
+                    self.cookies[name] = morsel.value
+                else:
+                    self.cookies.pop(name, None)
+
+
+class Recorder:
+    """Thread-safe collection of request outcomes per endpoint."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {name: [] for name in ENDPOINTS}
+        self.statuses = {name: {} for name in ENDPOINTS}
+        self.errors = dict.fromkeys(ENDPOINTS, 0)
+
+    def call(self, endpoint, session, method, path, payload=None, expected=200):
+        """Send a request, record it and return its body (None on error)."""
+        start = time.perf_counter()
+        status, body = session.request(method, path, payload)
+        seconds = time.perf_counter() - start
+        with self.lock:
+            self.samples[endpoint].append(seconds)
+            codes = self.statuses[endpoint]
+            codes[str(status)] = codes.get(str(status), 0) + 1
+            if status != expected:
+                self.errors[endpoint] += 1
+        if status != expected:
+            return None
+        return body if body is not None else {}
+
+
+def summarize(recorder, wall_seconds):
+    """Return the report: per-endpoint statistics and totals."""
+    endpoints = {}
+    for name in ENDPOINTS:
+        samples = recorder.samples[name]
+        if not samples:
+            continue
+        errors = recorder.errors[name]
+        endpoints[name] = {
+            "requests": len(samples),
+            "errors": errors,
+            "error_rate": errors / len(samples),
+            "statuses": recorder.statuses[name],
+            "mean_ms": statistics.fmean(samples) * 1000,
+            "p50_ms": percentile(samples, 0.50) * 1000,
+            "p95_ms": percentile(samples, 0.95) * 1000,
+            "p99_ms": percentile(samples, 0.99) * 1000,
+            "throughput_per_s": len(samples) / wall_seconds if wall_seconds else 0.0,
+        }
+    requests = sum(entry["requests"] for entry in endpoints.values())
+    errors = sum(entry["errors"] for entry in endpoints.values())
+    return {
+        "wall_s": wall_seconds,
+        "requests": requests,
+        "errors": errors,
+        "error_rate": errors / requests if requests else 0.0,
+        "throughput_per_s": requests / wall_seconds if wall_seconds else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def wait_for_job(recorder, session, job, timeout):
+    """Poll `jobs/<id>/` until the job finished; return the final body."""
+    deadline = time.monotonic() + timeout
+    while job is not None and job.get("status") not in ("done", "failed"):
+        if time.monotonic() > deadline:
+            return None
+        time.sleep(0.2)
+        job = recorder.call("job", session, "GET", f"/api/jobs/{job['id']}/")
+    return job
+
+
+def video_url_for(options, run_id, index, iteration):
+    """Return the video URL to create a quiz for, or None to skip the quiz.
+
+    Parameters:
+        options (dict): Command options (`url`, `video_urls`, `iterations`).
+        run_id (str): Random id of this run.
+        index (int): Number of the simulated user.
+        iteration (int): Number of the scenario run of that user.
+
+    Returns:
+        str | None: One of `--video-url` in turn, a made-up video for the
+        in-process server, or None when a running server is targeted
+        without `--video-url`.
+    """
+    if options["video_urls"]:
+        urls = options["video_urls"]
+        return urls[(index * options["iterations"] + iteration) % len(urls)]
+    if options["url"]:
+        return None
+    video_id = f"{run_id}{index:04d}{iteration:03d}"[-11:]
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+def simulate_user(recorder, base_url, index, run_id, options):
+    """Register one user and run the scenario `iterations` times."""
+    session = Session(base_url, options["timeout"])
+    username = f"load_{run_id}_{index}"
+    registered = recorder.call(
+        "register",
+        session,
+        "POST",
+        "/api/register/",
+        {
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": PASSWORD,
+            "confirmed_password": PASSWORD,
+        },
+        expected=201,
+    )
+    if registered is None:
+        return
+    for iteration in range(options["iterations"]):
+        credentials = {"username": username, "password": PASSWORD}
+        if recorder.call("login", session, "POST", "/api/login/", credentials) is None:
+            continue
+        video_url = video_url_for(options, run_id, index, iteration)
+        job = None
+        if video_url is not None:
+            job = recorder.call(
+                "create_quiz",
+                session,
+                "POST",
+                "/api/createQuiz/",
+                {"url": video_url},
+                expected=202,
+            )
+            job = wait_for_job(recorder, session, job, options["job_timeout"])
+        recorder.call("list", session, "GET", "/api/quizzes/")
+        quiz_id = job.get("quiz_id") if job else None
+        if quiz_id is not None:
+            path = f"/api/quizzes/{quiz_id}/"
+            recorder.call("detail", session, "GET", path)
+            recorder.call("patch", session, "PATCH", path, {"title": "Load test"})
+        recorder.call("refresh", session, "POST", "/api/token/refresh/")
+        recorder.call("logout", session, "POST", "/api/logout/")
+
+
+@contextmanager
+def in_process_server():
+    """Serve the app on a free local port with offline fakes; yield its URL."""
+    from django.core.servers.basehttp import (
+        ThreadedWSGIServer,
+        WSGIRequestHandler,
+        get_internal_wsgi_application,
+    )
+    from django.test import override_settings
+    from app_quiz.offline import offline_pipeline
+    from core.testing import temporary_database
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    with ExitStack() as stack:
+        stack.enter_context(temporary_database(sqlite_file=True))
+        stack.enter_context(offline_pipeline())
+        stack.enter_context(
+            override_settings(
+                ALLOWED_HOSTS=["127.0.0.1"],
+                QUIZ_JOBS_EAGER=True,
+                QUIZ_REUSE_EXISTING=False,
+                TRANSCRIPT_CACHE_ENABLED=False,
+                AUTH_THROTTLE_RATES=dict.fromkeys(settings.AUTH_THROTTLE_RATES),
+            )
+        )
+        server = ThreadedWSGIServer(
+            ("127.0.0.1", 0), QuietHandler, allow_reuse_address=False
+        )
+        server.set_app(get_internal_wsgi_application())
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.server_address[1]}"
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+
+class Command(BaseCommand):
+    help = "Run concurrent simulated users against the API and report latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=10,
+            help="Concurrent simulated users (default: 10).",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=1,
+            help="Scenario runs per user after registering (default: 1).",
+        )
+        parser.add_argument(
+            "--url",
+            help="Base URL of a running server; serve the app in-process if omitted.",
+        )
+        parser.add_argument(
+            "--video-url",
+            action="append",
+            dest="video_urls",
+            metavar="URL",
+            help=(
+                "YouTube video to create quizzes for with --url; repeat to "
+                "rotate through several. Without it the quiz steps are "
+                "skipped against a running server."
+            ),
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=30.0,
+            help="Per-request timeout in seconds (default: 30).",
+        )
+        parser.add_argument(
+            "--job-timeout",
+            type=float,
+            default=300.0,
+            help="How long to poll a quiz job before giving up (default: 300).",
+        )
+        parser.add_argument(
+            "--json", metavar="PATH", help="Also write the report as JSON to PATH."
+        )
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["iterations"] < 1:
+            raise CommandError("--users and --iterations must be at least 1.")
+        if options["url"]:
+            report = self.run(options["url"], options)
+        else:
+            with in_process_server() as base_url:
+                report = self.run(base_url, options)
+        report["users"] = options["users"]
+        report["iterations"] = options["iterations"]
+        report["target"] = options["url"] or "in-process"
+        report["skipped"] = (
+            list(QUIZ_STEPS) if options["url"] and not options["video_urls"] else []
+        )
+
+        self.write_table(report)
+        if options["json"]:
+            with open(options["json"], "w") as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+                fh.write("\n")
+
+    def run(self, base_url, options):
+        recorder = Recorder()
+        run_id = uuid.uuid4().hex[:4]
+        start = threading.Barrier(options["users"])
+
+        def user(index):
+            start.wait()
+            simulate_user(recorder, base_url, index, run_id, options)
+
+        threads = [
+            threading.Thread(target=user, args=(index,))
+            for index in range(options["users"])
+        ]
+        wall_start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return summarize(recorder, time.perf_counter() - wall_start)
+
+    def write_table(self, report):
+        self.stdout.write(
+            f"{'endpoint':<12}{'requests':>9}{'errors':>8}"
+            f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}"
+        )
+        for name, entry in report["endpoints"].items():
+            self.stdout.write(
+                f"{name:<12}{entry['requests']:>9}{entry['errors']:>8}"
+                f"{entry['p50_ms']:>10.1f}{entry['p95_ms']:>10.1f}"
+                f"{entry['p99_ms']:>10.1f}{entry['throughput_per_s']:>9.1f}"
+            )
+        summary = (
+            f"{report['requests']} requests in {report['wall_s']:.1f}s "
+            f"({report['throughput_per_s']:.1f} req/s), "
+            f"error rate {report['error_rate']:.1%}"
+        )
+        style = self.style.SUCCESS if not report["errors"] else self.style.WARNING
+        self.stdout.write(style(summary))
+        if report["skipped"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Skipped {', '.join(report['skipped'])}: pass --video-url "
+                    "to create quizzes on a running server."
+                )
+            )
@@ -0,0 +1,113 @@
+"""Run quiz-generation workers for the database job queue.
+
+Usage:
+    python manage.py run_quiz_workers [--concurrency 4] [--once]
+    python manage.py run_quiz_workers --requeue-dead
+
+Each worker thread claims `queued` jobs (see `app_quiz.api.job_queue`) and
+runs the download/transcribe/generate pipeline. A heartbeat thread renews
+the leases of running jobs; if this process dies, its jobs are reclaimed by
+other workers once their lease expires. SIGINT/SIGTERM stop claiming new
+jobs and wait for running ones to finish.
+
+Set `QUIZ_JOB_BACKEND=database` on the web processes so `createQuiz/`
+leaves jobs to these workers.
+"""
+
+import os
+import signal
+import socket
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from app_quiz.api import job_queue
+
+
+class Command(BaseCommand):
+    help = "Claim and run quiz-generation jobs from the database queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Worker threads in this process (default: 1).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of polling for new ones.",
+        )
+        parser.add_argument(
+            "--requeue-dead",
+            action="store_true",
+            help="Re-queue all dead-lettered jobs and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["requeue_dead"]:
+            count = job_queue.requeue_dead_jobs()
+            self.stdout.write(self.style.SUCCESS(f"Re-queued {count} jobs."))
+            return
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1.")
+
+        self.stop = threading.Event()
+        self.once = options["once"]
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self.worker_ids = [
+            f"{prefix}:{index}" for index in range(options["concurrency"])
+        ]
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.request_stop)
+            signal.signal(signal.SIGTERM, self.request_stop)
+
+        threads = [
+            threading.Thread(target=self.work, args=(worker_id,), name=worker_id)
+            for worker_id in self.worker_ids
+        ]
+        heartbeat = threading.Thread(
+            target=self.heartbeat, name=f"{prefix}:heartbeat", daemon=True
+        )
+        self.stdout.write(f"Starting {len(threads)} quiz workers ({prefix}).")
+        for thread in threads:
+            thread.start()
+        heartbeat.start()
+        for thread in threads:
+            # Joining with a timeout keeps the main thread responsive to signals.
+            while thread.is_alive():
+                thread.join(0.5)
+        self.stop.set()
+        self.stdout.write(self.style.SUCCESS("Quiz workers stopped."))
+
+    def request_stop(self, signum, frame):
+        self.stdout.write("Stopping after running jobs finish...")
+        self.stop.set()
+
+    def work(self, worker_id):
+        while not self.stop.is_set():
+            try:
+                ran = job_queue.process_next(worker_id)
+            except Exception:
+                # E.g. the database is unavailable; a claimed job is
+                # reclaimed once its lease expires.
+                job_queue.logger.exception("Quiz worker %s crashed", worker_id)
+                self.stop.wait(settings.QUIZ_JOB_POLL_INTERVAL)
+                continue
+            if not ran:
+                if self.once:
+                    return
+                self.stop.wait(settings.QUIZ_JOB_POLL_INTERVAL)
+
+    def heartbeat(self):
+        interval = max(settings.QUIZ_JOB_LEASE_SECONDS / 3, 0.1)
+        while not self.stop.wait(interval):
+            try:
+                job_queue.extend_leases(self.worker_ids)
+            except Exception:
+                job_queue.logger.exception("Renewing quiz job leases failed")
+            finally:
+                close_old_connections()
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:06
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_quiz", "0003_quizjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Transcript",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("video_id", models.CharField(max_length=11)),
+                ("model_name", models.CharField(max_length=50)),
+                ("language", models.CharField(blank=True, max_length=16)),
+                ("text", models.TextField()),
+                ("size_bytes", models.PositiveIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "last_used_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("video_id", "model_name", "language"),
+                        name="unique_transcript_per_model_language",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:09
+
+import re
+import urllib.parse
+
+from django.db import migrations, models
+
+
+def _video_id(url):
+    parsed = urllib.parse.urlparse(url or "")
+    domain = parsed.netloc.lower()
+    if domain == "youtu.be":
+        video_id = parsed.path.lstrip("/")
+    elif domain in ("www.youtube.com", "youtube.com", "m.youtube.com"):
+        video_id = urllib.parse.parse_qs(parsed.query).get("v", [None])[0]
+    else:
+        return ""
+    if not video_id or not re.match(r"^[\w-]{11}$", video_id):
+        return ""
+    return video_id
+
+
+def backfill_video_id(apps, schema_editor):
+    Quiz = apps.get_model("app_quiz", "Quiz")
+    for quiz in Quiz.objects.only("pk", "video_url").iterator():
+        video_id = _video_id(quiz.video_url)
+        if video_id:
+            Quiz.objects.filter(pk=quiz.pk).update(video_id=video_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_quiz", "0004_transcript"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="quiz",
+            name="video_id",
+            field=models.CharField(blank=True, db_index=True, max_length=11),
+        ),
+        migrations.RunPython(backfill_video_id, migrations.RunPython.noop),
+    ]
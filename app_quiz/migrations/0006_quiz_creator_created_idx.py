@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_quiz", "0005_quiz_video_id"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="quiz",
+            index=models.Index(
+                fields=["creator", "created_at"], name="quiz_creator_created_idx"
+            ),
+        ),
+    ]
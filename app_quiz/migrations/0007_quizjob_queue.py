@@ -0,0 +1,70 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:04
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_quiz", "0006_quiz_creator_created_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="quizjob",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="quizjob",
+            name="available_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name="quizjob",
+            name="dead_lettered_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="quizjob",
+            name="lease_expires_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="quizjob",
+            name="locked_by",
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name="quizjob",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("queued", "Queued"),
+                    ("claimed", "Claimed"),
+                    ("downloading", "Downloading"),
+                    ("transcribing", "Transcribing"),
+                    ("generating", "Generating"),
+                    ("done", "Done"),
+                    ("failed", "Failed"),
+                ],
+                default="queued",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="quizjob",
+            index=models.Index(
+                fields=["status", "available_at"], name="quizjob_claim_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="quizjob",
+            index=models.Index(
+                fields=["status", "lease_expires_at"], name="quizjob_lease_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+IN_FLIGHT = ["queued", "claimed", "downloading", "transcribing", "generating"]
+
+
+def link_duplicate_in_flight_jobs(apps, schema_editor):
+    """Make one in-flight job per video the leader of the others.
+
+    `quizjob_single_flight` allows one in-flight job without a leader per
+    video, so existing duplicates would make adding it fail. A job that
+    already started is preferred as leader, otherwise the oldest one. The
+    linked jobs receive a copy of the leader's quiz once it finishes.
+    """
+    QuizJob = apps.get_model("app_quiz", "QuizJob")
+    duplicates = (
+        QuizJob.objects.filter(status__in=IN_FLIGHT)
+        .values("video_id")
+        .annotate(jobs=models.Count("pk"))
+        .filter(jobs__gt=1)
+        .values_list("video_id", flat=True)
+    )
+    for video_id in list(duplicates):
+        jobs = list(
+            QuizJob.objects.filter(video_id=video_id, status__in=IN_FLIGHT)
+            .order_by("created_at", "pk")
+            .values_list("pk", "status")
+        )
+        jobs.sort(key=lambda job: job[1] == "queued")
+        leader_pk = jobs[0][0]
+        QuizJob.objects.filter(pk__in=[pk for pk, _ in jobs[1:]]).update(
+            leader_id=leader_pk
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_quiz", "0007_quizjob_queue"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="quizjob",
+            name="idempotency_key",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="quizjob",
+            name="leader",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="followers",
+                to="app_quiz.quizjob",
+            ),
+        ),
+        migrations.RunPython(link_duplicate_in_flight_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="quizjob",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(
+                    ("leader__isnull", True),
+                    (
+                        "status__in",
+                        [
+                            "queued",
+                            "claimed",
+                            "downloading",
+                            "transcribing",
+                            "generating",
+                        ],
+                    ),
+                ),
+                fields=("video_id",),
+                name="quizjob_single_flight",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="quizjob",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("idempotency_key", ""), _negated=True),
+                fields=("creator", "idempotency_key"),
+                name="quizjob_idempotency_key",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_quiz", "0008_quizjob_single_flight"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="quizjob",
+            name="timings",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
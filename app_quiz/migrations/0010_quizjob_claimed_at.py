@@ -0,0 +1,31 @@
+from django.db import migrations, models
+from django.db.models import F
+
+
+IN_PROGRESS = ["claimed", "downloading", "transcribing", "generating"]
+
+
+def backfill_claimed_at(apps, schema_editor):
+    """Treat the last update of running jobs as their claim time.
+
+    Without it, leases of jobs running during the upgrade would no longer
+    be renewed by `job_queue.extend_leases`.
+    """
+    QuizJob = apps.get_model("app_quiz", "QuizJob")
+    QuizJob.objects.filter(status__in=IN_PROGRESS).update(claimed_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_quiz", "0009_quizjob_timings"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="quizjob",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_claimed_at, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,26 @@
+import re
+import urllib.parse
+
 from django.db import models
+from django.utils import timezone
+
+
+YOUTUBE_DOMAINS = ("youtu.be", "www.youtube.com", "youtube.com", "m.youtube.com")
+
+
+def extract_youtube_video_id(url: str) -> str:
+    """Return the 11-character video id of a YouTube `url` or ""."""
+    parsed = urllib.parse.urlparse(url or "")
+    domain = parsed.netloc.lower()
+    if domain == "youtu.be":
+        video_id = parsed.path.lstrip("/")
+    elif domain in YOUTUBE_DOMAINS:
+        video_id = urllib.parse.parse_qs(parsed.query).get("v", [None])[0]
+    else:
+        return ""
+    if not video_id or not re.match(r"^[\w-]{11}$", video_id):
+        return ""
+    return video_id
 
 
 class Quiz(models.Model):
@@ -7,13 +29,29 @@ class Quiz(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     video_url = models.URLField()
+    video_id = models.CharField(max_length=11, blank=True, db_index=True)
     creator = models.ForeignKey(
         "auth.User", related_name="quizzes", on_delete=models.CASCADE
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["creator", "created_at"], name="quiz_creator_created_idx"
+            )
+        ]
+
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """Keep `video_id` in sync with `video_url` on every save."""
+        self.video_id = extract_youtube_video_id(self.video_url)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "video_url" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "video_id"}
+        super().save(*args, **kwargs)
+
 
 class Question(models.Model):
     quiz = models.ForeignKey(Quiz, related_name="questions", on_delete=models.CASCADE)
@@ -25,3 +63,109 @@ class Question(models.Model):
 
     def __str__(self):
         return f"Quiz: {self.quiz.title} - Question Title {self.question_title}"
+
+
+class QuizJob(models.Model):
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        CLAIMED = "claimed", "Claimed"
+        DOWNLOADING = "downloading", "Downloading"
+        TRANSCRIBING = "transcribing", "Transcribing"
+        GENERATING = "generating", "Generating"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    creator = models.ForeignKey(
+        "auth.User", related_name="quiz_jobs", on_delete=models.CASCADE
+    )
+    video_url = models.URLField()
+    video_id = models.CharField(max_length=11)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.QUEUED
+    )
+    error = models.TextField(blank=True)
+    quiz = models.ForeignKey(
+        Quiz,
+        related_name="jobs",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Queue bookkeeping for the database backend (see `app_quiz.api.job_queue`).
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    dead_lettered_at = models.DateTimeField(null=True, blank=True)
+
+    # Seconds spent per pipeline stage (see `app_quiz.api.pipeline_metrics`).
+    timings = models.JSONField(default=dict, blank=True)
+
+    # Single-flight coordination (see `app_quiz.api.single_flight`): jobs for
+    # a video that is already being processed wait for that leader's result.
+    leader = models.ForeignKey(
+        "self",
+        related_name="followers",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+    )
+    idempotency_key = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "available_at"], name="quizjob_claim_idx"),
+            models.Index(
+                fields=["status", "lease_expires_at"], name="quizjob_lease_idx"
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["video_id"],
+                condition=models.Q(
+                    leader__isnull=True,
+                    status__in=[
+                        "queued",
+                        "claimed",
+                        "downloading",
+                        "transcribing",
+                        "generating",
+                    ],
+                ),
+                name="quizjob_single_flight",
+            ),
+            models.UniqueConstraint(
+                fields=["creator", "idempotency_key"],
+                condition=~models.Q(idempotency_key=""),
+                name="quizjob_idempotency_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Job {self.pk} ({self.status}) for {self.video_id}"
+
+
+class Transcript(models.Model):
+    video_id = models.CharField(max_length=11)
+    model_name = models.CharField(max_length=50)
+    language = models.CharField(max_length=16, blank=True)
+    text = models.TextField()
+    size_bytes = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["video_id", "model_name", "language"],
+                name="unique_transcript_per_model_language",
+            )
+        ]
+
+    def __str__(self):
+        language = self.language or "auto"
+        return f"Transcript {self.video_id} ({self.model_name}, {language})"
@@ -0,0 +1,169 @@
+"""Deterministic offline stand-ins for yt-dlp, Whisper and Gemini.
+
+`offline_pipeline()` patches the quiz pipeline so benchmarks, tests and
+the in-process `loadtest` server need no network and produce the same work
+on every run:
+
+- `FakeYoutubeDL` "downloads" the bundled fixture `tones_3s.wav` (3 s of
+  sine tones, 16 kHz mono PCM) into the directory yt-dlp would use.
+- `fake_transcribe` returns a transcript of `transcript_words` words seeded
+  by the file name (i.e. the video id). With `real_whisper=True` the
+  configured Whisper model transcribes the fixture instead; the WAV is
+  decoded with the `wave` module, so no ffmpeg is needed, but the model
+  weights must already be in Whisper's download cache.
+- `FakeGenaiClient` answers `generate_content` with a quiz of ten
+  questions derived from a hash of the prompt.
+
+`percentile()` computes the latency percentiles of the benchmark and
+`loadtest` reports.
+"""
+
+import hashlib
+import json
+import os
+import random
+import shutil
+import wave
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy
+
+
+FIXTURE_AUDIO = os.path.join(os.path.dirname(__file__), "tones_3s.wav")
+
+WORDS = (
+    "energy system model cell signal network function data process memory "
+    "structure value market theory light water protein history language "
+    "reaction pressure current field growth balance sample pattern"
+).split()
+
+
+def percentile(samples, fraction):
+    """Return the `fraction` percentile (0..1) of `samples`."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def fixture_duration(path=FIXTURE_AUDIO) -> float:
+    with wave.open(path) as fh:
+        return fh.getnframes() / fh.getframerate()
+
+
+def load_wav(path, sr=16000):
+    """Decode a 16-bit mono WAV at `sr` Hz into Whisper's float32 format."""
+    with wave.open(path) as fh:
+        if fh.getframerate() != sr or fh.getnchannels() != 1:
+            raise ValueError(f"{path} must be mono {sr} Hz audio")
+        frames = fh.readframes(fh.getnframes())
+    return numpy.frombuffer(frames, numpy.int16).astype(numpy.float32) / 32768.0
+
+
+class FakeYoutubeDL:
+    """Replacement for `yt_dlp.YoutubeDL` that copies the audio fixture."""
+
+    def __init__(self, options):
+        self.options = options
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def extract_info(self, url, download=True):
+        from app_quiz.models import extract_youtube_video_id
+
+        video_id = extract_youtube_video_id(url)
+        path = self.options["outtmpl"] % {"id": video_id, "ext": "wav"}
+        shutil.copyfile(FIXTURE_AUDIO, path)
+        return {"id": video_id, "requested_downloads": [{"filepath": path}]}
+
+
+def fake_transcript(seed: str, words: int) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words)) + "."
+
+
+def fake_transcribe(transcript_words: int):
+    """Return a replacement for `whisper_registry.transcribe`."""
+    duration = fixture_duration()
+
+    def transcribe(audio, name=None, **options):
+        seed = os.path.basename(str(audio))
+        return {
+            "text": fake_transcript(seed, transcript_words),
+            "segments": [{"start": 0.0, "end": duration}],
+        }
+
+    return transcribe
+
+
+def fake_quiz(seed: str) -> dict:
+    rng = random.Random(seed)
+    questions = []
+    for index in range(10):
+        options = rng.sample(WORDS, 4)
+        questions.append(
+            {
+                "question_title": f"Question {index + 1} about {rng.choice(WORDS)}?",
+                "question_options": options,
+                "answer": rng.choice(options),
+            }
+        )
+    return {
+        "title": f"Quiz on {rng.choice(WORDS)}",
+        "description": "Generated offline for benchmarks.",
+        "questions": questions,
+    }
+
+
+def fake_response(prompt: str):
+    seed = hashlib.sha256(prompt.encode()).hexdigest()
+    text = "```json\n" + json.dumps(fake_quiz(seed)) + "\n```"
+    part = SimpleNamespace(text=text)
+    return SimpleNamespace(
+        candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))]
+    )
+
+
+class FakeGenaiClient:
+    """Replacement for `google.genai.Client` with sync and `aio` models."""
+
+    def __init__(self, api_key=None):
+        async def generate_async(model, contents):
+            return fake_response(contents)
+
+        self.models = SimpleNamespace(
+            generate_content=lambda model, contents: fake_response(contents)
+        )
+        self.aio = SimpleNamespace(
+            models=SimpleNamespace(generate_content=generate_async)
+        )
+
+
+@contextmanager
+def offline_pipeline(real_whisper=False, transcript_words=1500):
+    """Patch the pipeline's external services for the duration of the block.
+
+    Parameters:
+    - real_whisper (bool): Transcribe the fixture with the configured
+      Whisper model instead of returning a fake transcript.
+    - transcript_words (int): Length of fake transcripts.
+    """
+    with patch("app_quiz.api.utils.YoutubeDL", FakeYoutubeDL), patch(
+        "app_quiz.api.utils.genai.Client", FakeGenaiClient
+    ):
+        if real_whisper:
+            with patch("whisper.audio.load_audio", load_wav):
+                yield
+        else:
+            with patch(
+                "app_quiz.api.whisper_registry.transcribe",
+                fake_transcribe(transcript_words),
+            ):
+                yield
@@ -0,0 +1,53 @@
+"""Model signal handlers for `app_quiz`.
+
+Keeps the quiz payload cache (`app_quiz.api.payload_cache`) coherent with
+every write path: API views, background jobs, the admin and direct ORM use.
+The quiz owner's reads are also pinned to the primary database for a short
+while after each write (`core.db_router.mark_recent_write`).
+"""
+
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app_quiz.api import payload_cache
+from app_quiz.models import Question, Quiz
+from core import db_router
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def invalidate_quiz_payloads(sender, instance, **kwargs):
+    payload_cache.invalidate_quiz(instance.pk, instance.creator_id)
+    db_router.mark_recent_write(instance.creator_id)
+
+
+def _deleted_with_quiz(origin) -> bool:
+    """Return True if a deletion started from a quiz (instance or queryset)."""
+    if isinstance(origin, QuerySet):
+        return origin.model is Quiz
+    return isinstance(origin, Quiz)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question_payloads(sender, instance, origin=None, **kwargs):
+    if _deleted_with_quiz(origin):
+        # Cascade from a quiz deletion; `invalidate_quiz_payloads` runs for
+        # the quiz itself, so skip the owner lookup per question.
+        return
+    creator_id = (
+        Quiz.objects.filter(pk=instance.quiz_id)
+        .values_list("creator_id", flat=True)
+        .first()
+    )
+    payload_cache.invalidate_quiz(instance.quiz_id, creator_id)
+    db_router.mark_recent_write(creator_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_new_user_payloads(sender, instance, created, **kwargs):
+    """Start new users with an empty list namespace (ids may be reused)."""
+    if created:
+        payload_cache.invalidate_quiz(creator_id=instance.pk)
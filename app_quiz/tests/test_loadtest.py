@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import LiveServerTestCase, SimpleTestCase, override_settings
+from app_quiz.management.commands.loadtest import Session
+from app_quiz.models import Quiz
+from app_quiz.offline import offline_pipeline
+
+
+@override_settings(
+    QUIZ_JOBS_EAGER=True,
+    QUIZ_REUSE_EXISTING=False,
+    TRANSCRIPT_CACHE_ENABLED=False,
+    AUTH_THROTTLE_RATES={"login_ip": None, "login_username": None, "register_ip": None},
+)
+class TestLoadtestCommand(LiveServerTestCase):
+    """Runs the scenario against the live test server with offline fakes."""
+
+    def test_scenario_reports_every_endpoint(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "report.json")
+        out = StringIO()
+
+        with offline_pipeline(transcript_words=50):
+            call_command(
+                "loadtest",
+                "--url",
+                self.live_server_url,
+                "--users",
+                "1",
+                "--iterations",
+                "2",
+                "--video-url",
+                "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+                "--video-url",
+                "https://youtu.be/9bZkp7q19f0",
+                "--json",
+                path,
+                stdout=out,
+            )
+
+        with open(path) as fh:
+            report = json.load(fh)
+        self.assertEqual(report["errors"], 0, report)
+        expected = {
+            "register": 1,
+            "login": 2,
+            "create_quiz": 2,
+            "list": 2,
+            "detail": 2,
+            "patch": 2,
+            "refresh": 2,
+            "logout": 2,
+        }
+        for endpoint, requests in expected.items():
+            self.assertEqual(report["endpoints"][endpoint]["requests"], requests)
+            self.assertIn("p99_ms", report["endpoints"][endpoint])
+        self.assertEqual(Quiz.objects.filter(title="Load test").count(), 2)
+        self.assertEqual(report["skipped"], [])
+        self.assertIn("error rate 0.0%", out.getvalue())
+
+    def test_quiz_steps_are_skipped_without_video_url(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "report.json")
+        out = StringIO()
+
+        call_command(
+            "loadtest",
+            "--url",
+            self.live_server_url,
+            "--users",
+            "1",
+            "--json",
+            path,
+            stdout=out,
+        )
+
+        with open(path) as fh:
+            report = json.load(fh)
+        self.assertEqual(report["errors"], 0, report)
+        self.assertEqual(report["skipped"], ["create_quiz", "job", "detail", "patch"])
+        self.assertNotIn("create_quiz", report["endpoints"])
+        self.assertEqual(report["endpoints"]["list"]["requests"], 1)
+        self.assertFalse(Quiz.objects.exists())
+        self.assertIn("pass --video-url", out.getvalue())
+
+
+class TestLoadtestHelpers(SimpleTestCase):
+    def test_invalid_user_count(self):
+        with self.assertRaises(CommandError):
+            call_command("loadtest", "--users", "0", "--url", "http://127.0.0.1:9")
+
+    def test_session_keeps_and_drops_cookies(self):
+        session = Session("http://127.0.0.1:9", timeout=1)
+        session._store_cookies(
+            ["access_token=abc; HttpOnly; Path=/; Secure", "refresh_token=def; Path=/"]
+        )
+        self.assertEqual(
+            session.cookies, {"access_token": "abc", "refresh_token": "def"}
+        )
+
+        session._store_cookies(
+            ['access_token=""; expires=Thu, 01 Jan 1970 00:00:00 GMT; Max-Age=0']
+        )
+        self.assertEqual(session.cookies, {"refresh_token": "def"})
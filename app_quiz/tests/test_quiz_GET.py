@@ -32,8 +32,79 @@ class TestListAndDetailQuiz(APITestCase):
         response_data = response.json()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIsInstance(response_data, list)
-        self.assertGreaterEqual(len(response_data), 1)
+        self.assertIsInstance(response_data, dict)
+        self.assertIsInstance(response_data["results"], list)
+        self.assertGreaterEqual(len(response_data["results"]), 1)
+        self.assertIn("next", response_data)
+        self.assertIn("previous", response_data)
+
+    def test_get_quiz_list_only_own_quizzes(self):
+        url = reverse("quiz_list")
+        response = self.user_client.get(url, format="json")
+        quiz_ids = [quiz["id"] for quiz in response.json()["results"]]
+        self.assertEqual(quiz_ids, [self.quiz_1.id])
+
+    def test_get_quiz_list_query_count_is_constant(self):
+        """One query for the page, one prefetch for all its questions and
+        one aggregate for the ETag."""
+        for _ in range(5):
+            create_quiz_for_user1(self.user)
+        url = reverse("quiz_list")
+        with self.assertNumQueries(3):
+            response = self.user_client.get(url, format="json")
+        self.assertEqual(len(response.json()["results"]), 6)
+        for quiz in response.json()["results"]:
+            self.assertEqual(len(quiz["questions"]), 1)
+
+    def test_get_quiz_list_cursor_pagination(self):
+        for _ in range(4):
+            create_quiz_for_user1(self.user)
+        url = reverse("quiz_list")
+        seen = []
+        response = self.user_client.get(url, {"page_size": 2}, format="json")
+        while True:
+            response_data = response.json()
+            self.assertLessEqual(len(response_data["results"]), 2)
+            seen.extend(quiz["id"] for quiz in response_data["results"])
+            if not response_data["next"]:
+                break
+            response = self.user_client.get(response_data["next"], format="json")
+
+        expected = list(
+            self.user.quizzes.order_by("-created_at", "-id").values_list(
+                "id", flat=True
+            )
+        )
+        self.assertEqual(seen, expected)
+
+    def test_get_quiz_list_summary_200(self):
+        """`?view=summary` drops questions; one page query plus the ETag."""
+        url = reverse("quiz_list")
+        with self.assertNumQueries(2):
+            response = self.user_client.get(url, {"view": "summary"}, format="json")
+        quiz = response.json()["results"][0]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(quiz), {"id", "title", "created_at", "updated_at", "question_count"}
+        )
+        self.assertEqual(quiz["question_count"], 1)
+
+    def test_get_quiz_list_fields_200(self):
+        url = reverse("quiz_list")
+        response = self.user_client.get(url, {"fields": "id,title"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["results"],
+            [{"id": self.quiz_1.id, "title": self.quiz_1.title}],
+        )
+
+    def test_get_quiz_list_fields_400(self):
+        url = reverse("quiz_list")
+        for params in [{"fields": "id,secret"}, {"fields": ","}, {"view": "full"}]:
+            with self.subTest(params=params):
+                response = self.user_client.get(url, params, format="json")
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_get_quiz_list_401(self):
         """Unauthenticated clients should receive HTTP 401 for the list.
@@ -60,6 +131,26 @@ class TestListAndDetailQuiz(APITestCase):
         question_titles = [q["question_title"] for q in response_data["questions"]]
         self.assertIn(self.question_1.question_title, question_titles)
 
+    def test_get_quiz_detail_summary_200(self):
+        url = reverse("quiz_detail", kwargs={"id": self.quiz_1.id})
+        response = self.user_client.get(url, {"view": "summary"}, format="json")
+        response_data = response.json()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("questions", response_data)
+        self.assertEqual(response_data["question_count"], 1)
+
+    def test_get_quiz_detail_fields_200(self):
+        url = reverse("quiz_detail", kwargs={"id": self.quiz_1.id})
+        response = self.user_client.get(
+            url, {"fields": "title,questions"}, format="json"
+        )
+        response_data = response.json()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response_data), {"title", "questions"})
+        self.assertEqual(len(response_data["questions"]), 1)
+
     def test_get_quiz_detail_401(self):
         """Unauthenticated clients should receive HTTP 401 for detail.
 
@@ -1,18 +1,28 @@
+from django.test import override_settings
 from django.urls import reverse
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.test import APITestCase
 from unittest.mock import patch, Mock
 import json
-from .test_utils import create_user1, create_quiz_for_user1
+from app_quiz.api.serializers import QuizCreateSerializer
+from app_quiz.models import Quiz, QuizJob, extract_youtube_video_id
+from .test_utils import (
+    create_user1,
+    create_user2,
+    create_quiz_for_user1,
+    create_quiz_for_user2,
+)
 
 
+@override_settings(QUIZ_JOBS_EAGER=True)
 class TestCreateQuiz(APITestCase):
     """Tests for quiz creation endpoint.
 
     Includes happy-path creation and negative cases where the client is
     unauthenticated. The unauthenticated test clears forced
     authentication with `self.user_client.force_authenticate(user=None)`
-    and expects HTTP 401.
+    and expects HTTP 401. Jobs run eagerly so the background pipeline
+    completes before the 202 response is returned.
     """
 
     def setUp(self):
@@ -24,8 +34,7 @@ class TestCreateQuiz(APITestCase):
     @patch("app_quiz.api.utils.generate_quiz_from_text")
     @patch("app_quiz.api.utils.parse_audio_into_text")
     @patch("app_quiz.api.utils.download_audio")
-
-    def test_create_quiz_200(self, mock_download, mock_parse_audio, mock_generate):
+    def test_create_quiz_202(self, mock_download, mock_parse_audio, mock_generate):
         mock_download.return_value = "/tmp/test.m4a"
         mock_parse_audio.return_value = "dummy transcript"
         mock_generate.return_value = Mock(
@@ -62,9 +71,22 @@ class TestCreateQuiz(APITestCase):
         url = reverse("create_quiz")
         payload = {"url": "https://www.youtube.com/watch?v=ok-plXXHlWw"}
         response = self.user_client.post(url, payload, format="json")
-        response_data = response.json()
+        job_data = response.json()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(job_data["status"], QuizJob.Status.DONE)
+        self.assertIsNotNone(job_data["quiz_id"])
+        self.assertEqual(
+            response["Location"],
+            reverse("quiz_job_detail", kwargs={"id": job_data["id"]}),
+        )
 
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        detail_url = reverse("quiz_detail", kwargs={"id": job_data["quiz_id"]})
+        response_data = self.user_client.get(detail_url, format="json").json()
+        self.assertEqual(response_data["title"], "Test Quiz")
+        self.assertEqual(
+            response_data["video_url"], "https://www.youtube.com/watch?v=ok-plXXHlWw"
+        )
         self.assertIn("id", response_data)
         self.assertIn("title", response_data)
         self.assertIn("description", response_data)
@@ -84,6 +106,24 @@ class TestCreateQuiz(APITestCase):
         self.assertIsInstance(question["question_options"], list)
         self.assertEqual(len(question["question_options"]), 4)
 
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_create_quiz_job_failed(self, mock_download, mock_parse_audio):
+        """A failing pipeline stage marks the job `failed` with its error."""
+        mock_download.side_effect = serializers.ValidationError(
+            {"error": "Audio download failed: boom"}
+        )
+        url = reverse("create_quiz")
+        payload = {"url": "https://youtu.be/ok-plXXHlWw"}
+        response = self.user_client.post(url, payload, format="json")
+        job_data = response.json()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(job_data["status"], QuizJob.Status.FAILED)
+        self.assertEqual(job_data["error"], "Audio download failed: boom")
+        self.assertIsNone(job_data["quiz_id"])
+        mock_parse_audio.assert_not_called()
+
     def test_create_quiz_400(self):
         url = reverse("create_quiz")
         payloads = [
@@ -109,6 +149,19 @@ class TestCreateQuiz(APITestCase):
         for payload in payloads:
             response = self.user_client.post(url, payload, format="json")
             self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(QuizJob.objects.exists())
+
+    def test_create_quiz_url_matches_model_video_id(self):
+        """The serializer extracts the same `video_id` as the `Quiz` model."""
+        for url in (
+            "https://www.youtube.com/watch?v=ok-plXXHlWw",
+            "https://youtube.com/watch?v=ok-plXXHlWw&t=10",
+            "https://m.youtube.com/watch?v=ok-plXXHlWw",
+            "https://youtu.be/ok-plXXHlWw",
+        ):
+            serializer = QuizCreateSerializer(data={"url": url})
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+            self.assertEqual(serializer.video_id, extract_youtube_video_id(url))
 
     def test_create_quiz_401(self):
         """Unauthenticated POST requests must be rejected with 401.
@@ -121,3 +174,72 @@ class TestCreateQuiz(APITestCase):
         self.user_client.force_authenticate(user=None)
         response = self.user_client.post(url, payload, format="json")
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(QUIZ_JOBS_EAGER=True, QUIZ_REUSE_EXISTING=False)
+class TestCreateQuizReuse(APITestCase):
+    """Tests for reusing an existing quiz of the same video.
+
+    When reuse is requested and another user already has a quiz for the
+    submitted video, the quiz and its questions are copied for the caller
+    and no pipeline stage runs.
+    """
+
+    def setUp(self):
+        self.user, self.user_client = create_user1()
+        self.user2, _ = create_user2()
+        self.source_quiz, _ = create_quiz_for_user2(self.user2)
+        self.source_quiz.video_url = "https://www.youtube.com/watch?v=ok-plXXHlWw"
+        self.source_quiz.save()
+
+    def test_video_id_is_normalized(self):
+        self.assertEqual(self.source_quiz.video_id, "ok-plXXHlWw")
+
+    @patch("app_quiz.api.utils.generate_quiz_from_text")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_reuse_existing_quiz_202(
+        self, mock_download, mock_parse_audio, mock_generate
+    ):
+        url = reverse("create_quiz")
+        payload = {"url": "https://youtu.be/ok-plXXHlWw", "reuse_existing": True}
+        response = self.user_client.post(url, payload, format="json")
+        job_data = response.json()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(job_data["status"], QuizJob.Status.DONE)
+        mock_download.assert_not_called()
+        mock_parse_audio.assert_not_called()
+        mock_generate.assert_not_called()
+
+        clone = Quiz.objects.get(pk=job_data["quiz_id"])
+        self.assertNotEqual(clone.pk, self.source_quiz.pk)
+        self.assertEqual(clone.creator, self.user)
+        self.assertEqual(clone.title, self.source_quiz.title)
+        self.assertEqual(
+            list(clone.questions.values_list("question_title", "answer")),
+            list(self.source_quiz.questions.values_list("question_title", "answer")),
+        )
+
+    @override_settings(QUIZ_REUSE_EXISTING=True)
+    @patch("app_quiz.api.jobs.run_quiz_job")
+    def test_reuse_from_setting_and_opt_out(self, mock_run):
+        url = reverse("create_quiz")
+        payload = {"url": "https://youtu.be/ok-plXXHlWw"}
+        response = self.user_client.post(url, payload, format="json")
+        self.assertEqual(response.json()["status"], QuizJob.Status.DONE)
+        mock_run.assert_not_called()
+
+        payload["reuse_existing"] = False
+        response = self.user_client.post(url, payload, format="json")
+        self.assertEqual(response.json()["status"], QuizJob.Status.QUEUED)
+        mock_run.assert_called_once()
+
+    @patch("app_quiz.api.jobs.run_quiz_job")
+    def test_reuse_without_existing_quiz_runs_pipeline(self, mock_run):
+        url = reverse("create_quiz")
+        payload = {"url": "https://youtu.be/aaaaaaaaaaa", "reuse_existing": True}
+        response = self.user_client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.json()["status"], QuizJob.Status.QUEUED)
+        mock_run.assert_called_once()
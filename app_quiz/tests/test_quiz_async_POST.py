@@ -0,0 +1,224 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from app_quiz.api import async_jobs, single_flight
+from app_quiz.models import Quiz, QuizJob
+from .test_utils import create_user1
+
+QUIZ_JSON = {
+    "title": "Async Quiz",
+    "description": "Async description",
+    "questions": [
+        {
+            "question_title": "Q1",
+            "question_options": ["A", "B", "C", "D"],
+            "answer": "A",
+        }
+    ],
+}
+
+
+def gemini_response():
+    return Mock(
+        candidates=[Mock(content=Mock(parts=[Mock(text=json.dumps(QUIZ_JSON))]))]
+    )
+
+
+@override_settings(QUIZ_JOBS_EAGER=True)
+class TestAsyncCreateQuiz(APITestCase):
+    """The async endpoint validates and responds like `createQuiz/`."""
+
+    def setUp(self):
+        self.user, self.user_client = create_user1()
+        self.url = reverse("create_quiz_async")
+
+    @patch("app_quiz.api.utils.generate_quiz_from_text")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_create_quiz_202(self, mock_download, mock_parse_audio, mock_generate):
+        mock_download.return_value = "/tmp/test.m4a"
+        mock_parse_audio.return_value = "dummy transcript"
+        mock_generate.return_value = gemini_response()
+
+        response = self.user_client.post(
+            self.url,
+            {"url": "https://www.youtube.com/watch?v=ok-plXXHlWw"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.json()["status"], QuizJob.Status.DONE)
+        self.assertTrue(Quiz.objects.filter(title="Async Quiz").exists())
+
+    def test_create_quiz_400(self):
+        response = self.user_client.post(self.url, {"url": "not a url"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_quiz_401(self):
+        self.user_client.force_authenticate(user=None)
+        response = self.user_client.post(
+            self.url,
+            {"url": "https://www.youtube.com/watch?v=ok-plXXHlWw"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(
+    QUIZ_JOBS_EAGER=False,
+    QUIZ_CACHE_ENABLED=False,
+    TRANSCRIPT_CACHE_ENABLED=False,
+    QUIZ_TRANSCRIBE_WORKERS=1,
+    QUIZ_ASYNC_DB_WORKERS=1,
+)
+class TestAsyncQuizJobRunner(TransactionTestCase):
+    """Jobs run concurrently on the event loop with capped transcription."""
+
+    def setUp(self):
+        async_jobs.shutdown()
+        self.addCleanup(async_jobs.shutdown)
+        self.user, self.user_client = create_user1()
+        self.active_transcriptions = 0
+        self.max_transcriptions = 0
+        self.counter_lock = threading.Lock()
+
+    def transcribe(self, audio_path):
+        with self.counter_lock:
+            self.active_transcriptions += 1
+            self.max_transcriptions = max(
+                self.max_transcriptions, self.active_transcriptions
+            )
+        time.sleep(0.01)
+        with self.counter_lock:
+            self.active_transcriptions -= 1
+        return "dummy transcript"
+
+    @patch("app_quiz.api.utils.generate_quiz_from_text_async")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_jobs_overlap_while_transcription_is_capped(
+        self, mock_download, mock_parse_audio, mock_generate
+    ):
+        async def slow_generate(text):
+            await asyncio.sleep(0.5)
+            return gemini_response()
+
+        mock_download.return_value = "/tmp/test.m4a"
+        mock_parse_audio.side_effect = self.transcribe
+        mock_generate.side_effect = slow_generate
+
+        # Start the jobs only after all requests are done and wait on their
+        # futures: the shared-cache in-memory test database fails concurrent
+        # writers with "table is locked" instead of waiting for the lock.
+        job_ids = []
+        with patch.object(async_jobs, "start_quiz_job") as mock_start:
+            for i in range(10):
+                response = self.user_client.post(
+                    reverse("create_quiz_async"),
+                    {"url": f"https://www.youtube.com/watch?v=video{i:06d}"},
+                    format="json",
+                )
+                self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+                job_ids.append(response.json()["id"])
+        self.assertEqual(mock_start.call_count, len(job_ids))
+
+        start = time.monotonic()
+        futures = [async_jobs.start_quiz_job(job_id) for job_id in job_ids]
+        finished = [future.result(timeout=30) for future in futures]
+        elapsed = time.monotonic() - start
+
+        self.assertTrue(all(job.status == QuizJob.Status.DONE for job in finished))
+        # Ten 0.5s Gemini calls awaited concurrently, not one after another.
+        self.assertLess(elapsed, 3)
+        self.assertEqual(self.max_transcriptions, 1)
+        self.assertEqual(Quiz.objects.filter(creator=self.user).count(), 10)
+
+    @patch("app_quiz.api.utils.download_audio")
+    def test_failures_are_recorded(self, mock_download):
+        mock_download.side_effect = ValueError("boom")
+        job = QuizJob.objects.create(
+            creator=self.user,
+            video_id="ok-plXXHlWw",
+            video_url="https://www.youtube.com/watch?v=ok-plXXHlWw",
+        )
+
+        job = async_jobs.start_quiz_job(job.pk).result(timeout=30)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, QuizJob.Status.FAILED)
+        self.assertEqual(job.error, "boom")
+
+    @override_settings(QUIZ_ASYNC_MAX_IN_FLIGHT=1, QUIZ_SINGLE_FLIGHT_STALE_SECONDS=60)
+    @patch("app_quiz.api.utils.generate_quiz_from_text_async")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_job_waiting_for_a_slot_is_kept_fresh(
+        self, mock_download, mock_parse_audio, mock_generate
+    ):
+        download_started = threading.Event()
+        release_download = threading.Event()
+
+        def blocking_download(video_url):
+            download_started.set()
+            self.assertTrue(release_download.wait(timeout=30))
+            return "/tmp/test.m4a"
+
+        async def generate(text):
+            return gemini_response()
+
+        mock_download.side_effect = blocking_download
+        mock_parse_audio.return_value = "dummy transcript"
+        mock_generate.side_effect = generate
+        running, waiting = (
+            QuizJob.objects.create(
+                creator=self.user,
+                video_id=video_id,
+                video_url=f"https://www.youtube.com/watch?v={video_id}",
+            )
+            for video_id in ("ok-plXXHlWw", "aaaaaaaaaaa")
+        )
+
+        first = async_jobs.start_quiz_job(running.pk)
+        self.assertTrue(download_started.wait(timeout=30))
+        second = async_jobs.start_quiz_job(waiting.pk)
+        QuizJob.objects.filter(pk=waiting.pk).update(
+            updated_at=timezone.now() - timedelta(minutes=5)
+        )
+        try:
+            self.assertEqual(single_flight.refresh_alive_leaders(), 2)
+            waiting.refresh_from_db()
+            self.assertEqual(waiting.status, QuizJob.Status.QUEUED)
+            self.assertFalse(single_flight._is_stale(waiting))
+        finally:
+            release_download.set()
+
+        for future in (first, second):
+            self.assertEqual(future.result(timeout=30).status, QuizJob.Status.DONE)
+        self.assertEqual(single_flight.refresh_alive_leaders(), 0)
+
+    @patch("app_quiz.api.utils.download_audio")
+    def test_taken_over_job_is_not_run(self, mock_download):
+        job = QuizJob.objects.create(
+            creator=self.user,
+            video_id="ok-plXXHlWw",
+            video_url="https://www.youtube.com/watch?v=ok-plXXHlWw",
+        )
+        QuizJob.objects.filter(pk=job.pk).update(
+            status=QuizJob.Status.FAILED, error="interrupted"
+        )
+
+        job = async_jobs.start_quiz_job(job.pk).result(timeout=30)
+
+        mock_download.assert_not_called()
+        self.assertEqual(job.status, QuizJob.Status.FAILED)
+        self.assertEqual(job.error, "interrupted")
+        self.assertFalse(Quiz.objects.exists())
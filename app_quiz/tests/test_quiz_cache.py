@@ -0,0 +1,123 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from unittest.mock import patch
+from app_quiz.api import jobs
+from app_quiz.models import QuizJob
+from .test_utils import (
+    create_user1,
+    create_user2,
+    create_quiz_for_user1,
+)
+
+
+@override_settings(QUIZ_CACHE_ENABLED=True, QUIZ_CACHE_ALIAS="default")
+class TestQuizPayloadCache(APITestCase):
+    """Tests for the server-side cache of quiz payloads.
+
+    Repeated reads must be served without database queries, ownership is
+    still enforced on cache hits, and PATCH, DELETE and newly persisted
+    quizzes invalidate the cached detail and list payloads.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user, self.user_client = create_user1()
+        self.user2, self.user_client2 = create_user2()
+        self.quiz_1, questions1 = create_quiz_for_user1(self.user)
+        self.detail_url = reverse("quiz_detail", kwargs={"id": self.quiz_1.id})
+        self.list_url = reverse("quiz_list")
+
+    def test_detail_hit_without_queries(self):
+        first = self.user_client.get(self.detail_url, format="json")
+        with self.assertNumQueries(0):
+            second = self.user_client.get(self.detail_url, format="json")
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(first["ETag"], second["ETag"])
+
+        with self.assertNumQueries(0):
+            response = self.user_client.get(
+                self.detail_url, format="json", HTTP_IF_NONE_MATCH=first["ETag"]
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_hit_without_queries(self):
+        first = self.user_client.get(self.list_url, format="json")
+        with self.assertNumQueries(0):
+            second = self.user_client.get(self.list_url, format="json")
+        self.assertEqual(first.json(), second.json())
+
+    def test_empty_list_hit_without_queries(self):
+        first = self.user_client2.get(self.list_url, format="json")
+        self.assertEqual(first.json()["results"], [])
+        with self.assertNumQueries(0):
+            second = self.user_client2.get(self.list_url, format="json")
+        self.assertEqual(first.json(), second.json())
+
+    def test_cached_detail_still_checks_owner(self):
+        self.user_client.get(self.detail_url, format="json")
+        response = self.user_client2.get(self.detail_url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_fieldsets_cached_separately(self):
+        self.user_client.get(self.detail_url, format="json")
+        response = self.user_client.get(
+            self.detail_url, {"view": "summary"}, format="json"
+        )
+        self.assertNotIn("questions", response.json())
+
+    def test_patch_invalidates(self):
+        self.user_client.get(self.detail_url, format="json")
+        self.user_client.get(self.list_url, format="json")
+        self.user_client.patch(self.detail_url, {"title": "Changed"}, format="json")
+
+        response = self.user_client.get(self.detail_url, format="json")
+        self.assertEqual(response.json()["title"], "Changed")
+        response = self.user_client.get(self.list_url, format="json")
+        self.assertEqual(response.json()["results"][0]["title"], "Changed")
+
+    def test_delete_invalidates(self):
+        self.user_client.get(self.detail_url, format="json")
+        self.user_client.get(self.list_url, format="json")
+        self.user_client.delete(self.detail_url)
+
+        response = self.user_client.get(self.detail_url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.user_client.get(self.list_url, format="json")
+        self.assertEqual(response.json()["results"], [])
+
+    @patch("app_quiz.api.utils.parse_quiz_response")
+    @patch("app_quiz.api.utils.generate_quiz_from_text")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_new_quiz_invalidates_list(
+        self, mock_download, mock_parse_audio, mock_generate, mock_parse_quiz
+    ):
+        mock_parse_audio.return_value = "dummy transcript"
+        mock_parse_quiz.return_value = {
+            "title": "Generated",
+            "description": "Generated description",
+            "questions": [
+                {
+                    "question_title": "Q1",
+                    "question_options": ["A", "B", "C", "D"],
+                    "answer": "A",
+                }
+            ],
+        }
+        self.user_client.get(self.list_url, format="json")
+        job = QuizJob.objects.create(
+            creator=self.user,
+            video_id="ok-plXXHlWw",
+            video_url="https://www.youtube.com/watch?v=ok-plXXHlWw",
+        )
+        jobs.run_quiz_job(job)
+        self.assertEqual(job.status, QuizJob.Status.DONE)
+
+        response = self.user_client.get(self.list_url, format="json")
+        titles = [quiz["title"] for quiz in response.json()["results"]]
+        self.assertEqual(titles, ["Generated", self.quiz_1.title])
+        self.assertEqual(len(response.json()["results"][0]["questions"]), 1)
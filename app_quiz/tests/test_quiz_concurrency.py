@@ -0,0 +1,103 @@
+import threading
+from django.contrib.auth.models import User
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from app_quiz.api import jobs
+from app_quiz.models import Quiz, QuizJob
+from .test_utils import create_user1, create_quiz_for_user1
+
+
+class TestWritesDuringQuizCreation(TransactionTestCase):
+    """Other writers must not be blocked while a quiz is being generated.
+
+    A job is started in a worker thread and held inside `download_audio`
+    (standing in for a slow network download). While it is in flight the
+    test registers a user, patches and deletes quizzes through the API. If
+    the pipeline held a write transaction, SQLite would reject these writes
+    with "database table is locked". Once released, the job must complete.
+    """
+
+    def setUp(self):
+        (self.user, self.user_client) = create_user1()
+        (self.quiz_1, questions1) = create_quiz_for_user1(self.user)
+        (self.quiz_2, questions2) = create_quiz_for_user1(self.user)
+        self.job = QuizJob.objects.create(
+            creator=self.user,
+            video_id="ok-plXXHlWw",
+            video_url="https://www.youtube.com/watch?v=ok-plXXHlWw",
+        )
+        self.download_started = threading.Event()
+        self.release_download = threading.Event()
+
+    def _blocking_download(self, video_url):
+        self.download_started.set()
+        self.assertTrue(self.release_download.wait(timeout=30))
+        return "/tmp/test.m4a"
+
+    @patch("app_quiz.api.utils.parse_quiz_response")
+    @patch("app_quiz.api.utils.generate_quiz_from_text")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_writes_proceed_while_job_in_flight(
+        self, mock_download, mock_parse_audio, mock_generate, mock_parse_quiz
+    ):
+        mock_download.side_effect = self._blocking_download
+        mock_parse_audio.return_value = "dummy transcript"
+        mock_parse_quiz.return_value = {
+            "title": "Generated",
+            "description": "Generated description",
+            "questions": [
+                {
+                    "question_title": "Q1",
+                    "question_options": ["A", "B", "C", "D"],
+                    "answer": "A",
+                }
+            ],
+        }
+        worker = threading.Thread(target=jobs._run_in_worker, args=(self.job.pk,))
+        worker.start()
+        try:
+            self.assertTrue(self.download_started.wait(timeout=30))
+
+            job_url = reverse("quiz_job_detail", kwargs={"id": self.job.id})
+            response = self.user_client.get(job_url, format="json")
+            self.assertEqual(response.json()["status"], QuizJob.Status.DOWNLOADING)
+
+            response = APIClient().post(
+                reverse("registration"),
+                {
+                    "username": "user_concurrent",
+                    "password": "password123",
+                    "confirmed_password": "password123",
+                    "email": "concurrent@mail.de",
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+            response = self.user_client.patch(
+                reverse("quiz_detail", kwargs={"id": self.quiz_1.id}),
+                {"title": "Updated while generating"},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            response = self.user_client.delete(
+                reverse("quiz_detail", kwargs={"id": self.quiz_2.id})
+            )
+            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        finally:
+            self.release_download.set()
+            worker.join(timeout=30)
+
+        self.assertFalse(worker.is_alive())
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, QuizJob.Status.DONE)
+        self.assertTrue(User.objects.filter(username="user_concurrent").exists())
+        self.assertEqual(
+            Quiz.objects.get(pk=self.quiz_1.pk).title, "Updated while generating"
+        )
+        self.assertFalse(Quiz.objects.filter(pk=self.quiz_2.pk).exists())
@@ -0,0 +1,127 @@
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+from app_quiz.models import Question
+from .test_utils import (
+    create_user1,
+    create_user2,
+    create_quiz_for_user1,
+    create_quiz_for_user2,
+)
+
+
+@override_settings(QUIZ_CACHE_ENABLED=False)
+class TestConditionalGetQuiz(APITestCase):
+    """Tests for ETag / Last-Modified handling on quiz list and detail.
+
+    Verifies that responses carry validators, that matching conditional
+    requests get HTTP 304 from a single query, and that any change to a
+    quiz or its questions produces a new ETag. The payload cache is
+    disabled so the aggregate query path is exercised.
+    """
+
+    def setUp(self):
+        self.user, self.user_client = create_user1()
+        self.user2, self.user_client2 = create_user2()
+        self.quiz_1, questions1 = create_quiz_for_user1(self.user)
+        self.quiz_2, questions2 = create_quiz_for_user2(self.user2)
+        self.question_1 = questions1[0]
+
+    def test_detail_304_if_none_match(self):
+        url = reverse("quiz_detail", kwargs={"id": self.quiz_1.id})
+        response = self.user_client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+        with self.assertNumQueries(1):
+            response = self.user_client.get(
+                url, format="json", HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_detail_304_if_modified_since(self):
+        url = reverse("quiz_detail", kwargs={"id": self.quiz_1.id})
+        response = self.user_client.get(url, format="json")
+        response = self.user_client.get(
+            url, format="json", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_etag_changes_on_update(self):
+        url = reverse("quiz_detail", kwargs={"id": self.quiz_1.id})
+        etag = self.user_client.get(url, format="json")["ETag"]
+
+        self.user_client.patch(url, {"title": "New title"}, format="json")
+        response = self.user_client.get(url, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        etag = response["ETag"]
+        self.question_1.answer = "5"
+        self.question_1.save()
+        response = self.user_client.get(url, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_detail_etag_depends_on_fieldset(self):
+        url = reverse("quiz_detail", kwargs={"id": self.quiz_1.id})
+        etag = self.user_client.get(url, format="json")["ETag"]
+        response = self.user_client.get(
+            url, {"view": "summary"}, format="json", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_other_user_gets_403_not_304(self):
+        url = reverse("quiz_detail", kwargs={"id": self.quiz_1.id})
+        etag = self.user_client.get(url, format="json")["ETag"]
+        response = self.user_client2.get(url, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_detail_missing_quiz_404(self):
+        url = reverse("quiz_detail", kwargs={"id": 99999})
+        response = self.user_client.get(url, format="json", HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_304_and_change_detection(self):
+        url = reverse("quiz_list")
+        etag = self.user_client.get(url, format="json")["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.user_client.get(url, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Question.objects.filter(pk=self.question_1.pk).delete()
+        response = self.user_client.get(url, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response["ETag"]
+        create_quiz_for_user1(self.user)
+        response = self.user_client.get(url, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_changes_after_delete_with_if_modified_since(self):
+        url = reverse("quiz_list")
+        quiz, questions = create_quiz_for_user1(self.user)
+        response = self.user_client.get(url, format="json")
+        self.assertNotIn("Last-Modified", response)
+        since = http_date()
+
+        self.user_client.delete(reverse("quiz_detail", kwargs={"id": quiz.id}))
+        response = self.user_client.get(
+            url, format="json", HTTP_IF_MODIFIED_SINCE=since
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [item["id"] for item in response.json()["results"]]
+        self.assertEqual(ids, [self.quiz_1.id])
+
+    def test_list_etag_not_affected_by_other_users(self):
+        url = reverse("quiz_list")
+        etag = self.user_client.get(url, format="json")["ETag"]
+        create_quiz_for_user2(self.user2)
+        response = self.user_client.get(url, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,67 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from app_quiz.models import QuizJob
+from .test_utils import (
+    create_user1,
+    create_user2,
+    create_quiz_for_user1,
+)
+
+
+class TestQuizJobDetail(APITestCase):
+    """Tests for polling the state of a quiz-generation job.
+
+    Covers the owner reading a queued and a finished job, and negative
+    cases for unauthenticated clients (401), other users (403) and
+    non-existent jobs (404).
+    """
+
+    def setUp(self):
+        """Create two users and a queued job belonging to the first one."""
+        (self.user, self.user_client) = create_user1()
+        (self.user2, self.user_client2) = create_user2()
+        (self.quiz_1, questions1) = create_quiz_for_user1(self.user)
+        self.job = QuizJob.objects.create(
+            creator=self.user,
+            video_id="ok-plXXHlWw",
+            video_url="https://www.youtube.com/watch?v=ok-plXXHlWw",
+        )
+
+    def test_get_job_queued_200(self):
+        url = reverse("quiz_job_detail", kwargs={"id": self.job.id})
+        response = self.user_client.get(url, format="json")
+        response_data = response.json()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response_data["id"], self.job.id)
+        self.assertEqual(response_data["status"], "queued")
+        self.assertIsNone(response_data["quiz_id"])
+
+    def test_get_job_done_200(self):
+        self.job.status = QuizJob.Status.DONE
+        self.job.quiz = self.quiz_1
+        self.job.save()
+        url = reverse("quiz_job_detail", kwargs={"id": self.job.id})
+        response = self.user_client.get(url, format="json")
+        response_data = response.json()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response_data["status"], "done")
+        self.assertEqual(response_data["quiz_id"], self.quiz_1.id)
+
+    def test_get_job_401(self):
+        url = reverse("quiz_job_detail", kwargs={"id": self.job.id})
+        self.user_client.force_authenticate(user=None)
+        response = self.user_client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_get_job_403(self):
+        url = reverse("quiz_job_detail", kwargs={"id": self.job.id})
+        response = self.user_client2.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_get_job_404(self):
+        url = reverse("quiz_job_detail", kwargs={"id": 99999})
+        response = self.user_client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
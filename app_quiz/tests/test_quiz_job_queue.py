@@ -0,0 +1,365 @@
+import json
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers, status
+from app_quiz.api import job_queue, single_flight
+from app_quiz.models import Quiz, QuizJob
+from .test_utils import create_user1
+
+QUIZ_JSON = {
+    "title": "Queued Quiz",
+    "description": "Queued description",
+    "questions": [
+        {
+            "question_title": "Q1",
+            "question_options": ["A", "B", "C", "D"],
+            "answer": "A",
+        }
+    ],
+}
+
+
+def gemini_response():
+    return Mock(
+        candidates=[Mock(content=Mock(parts=[Mock(text=json.dumps(QUIZ_JSON))]))]
+    )
+
+
+def create_job(user, **fields):
+    # Distinct videos: jobs for one video would follow a single leader.
+    video_id = f"video{QuizJob.objects.count():06d}"
+    return QuizJob.objects.create(
+        creator=user,
+        video_id=video_id,
+        video_url=f"https://www.youtube.com/watch?v={video_id}",
+        **fields,
+    )
+
+
+@override_settings(
+    QUIZ_JOB_BACKEND="database",
+    QUIZ_JOB_MAX_ATTEMPTS=3,
+    QUIZ_JOB_LEASE_SECONDS=60,
+    QUIZ_JOB_RETRY_BACKOFF_SECONDS=10,
+    TRANSCRIPT_CACHE_ENABLED=False,
+)
+class TestDatabaseJobQueue(TestCase):
+    def setUp(self):
+        self.user, self.user_client = create_user1()
+
+    def test_create_quiz_leaves_job_queued(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.user_client.post(
+                reverse("create_quiz"),
+                {"url": "https://www.youtube.com/watch?v=ok-plXXHlWw"},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = QuizJob.objects.get(pk=response.json()["id"])
+        self.assertEqual(job.status, QuizJob.Status.QUEUED)
+        self.assertEqual(job.attempts, 0)
+
+    def test_claim_sets_lease_and_attempt(self):
+        job = create_job(self.user)
+
+        claimed = job_queue.claim_job("worker-a")
+
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.status, QuizJob.Status.CLAIMED)
+        self.assertEqual(claimed.locked_by, "worker-a")
+        self.assertEqual(claimed.attempts, 1)
+        self.assertGreater(claimed.lease_expires_at, timezone.now())
+        self.assertIsNone(job_queue.claim_job("worker-b"))
+
+    def test_jobs_are_claimed_oldest_first_and_not_before_available(self):
+        later = create_job(
+            self.user, available_at=timezone.now() + timedelta(minutes=5)
+        )
+        first = create_job(self.user)
+
+        self.assertEqual(job_queue.claim_job("worker-a").pk, first.pk)
+        self.assertIsNone(job_queue.claim_job("worker-a"))
+        QuizJob.objects.filter(pk=later.pk).update(available_at=timezone.now())
+        self.assertEqual(job_queue.claim_job("worker-a").pk, later.pk)
+
+    def test_expired_lease_is_reclaimed(self):
+        job = create_job(
+            self.user,
+            status=QuizJob.Status.TRANSCRIBING,
+            locked_by="crashed-worker",
+            attempts=1,
+            lease_expires_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        claimed = job_queue.claim_job("worker-b")
+
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.locked_by, "worker-b")
+        self.assertEqual(claimed.attempts, 2)
+
+    def test_active_lease_is_not_reclaimed_and_can_be_extended(self):
+        lease = timezone.now() + timedelta(seconds=5)
+        job = create_job(
+            self.user,
+            status=QuizJob.Status.DOWNLOADING,
+            locked_by="worker-a",
+            attempts=1,
+            claimed_at=timezone.now(),
+            lease_expires_at=lease,
+        )
+
+        self.assertIsNone(job_queue.claim_job("worker-b"))
+        self.assertEqual(job_queue.extend_leases(["worker-a"]), 1)
+        job.refresh_from_db()
+        self.assertGreater(job.lease_expires_at, lease)
+
+    @override_settings(QUIZ_JOB_MAX_RUNTIME_SECONDS=600)
+    def test_lease_of_hung_job_is_not_extended(self):
+        lease = timezone.now() + timedelta(seconds=5)
+        job = create_job(
+            self.user,
+            status=QuizJob.Status.DOWNLOADING,
+            locked_by="worker-a",
+            attempts=1,
+            claimed_at=timezone.now() - timedelta(seconds=601),
+            lease_expires_at=lease,
+        )
+
+        self.assertEqual(job_queue.extend_leases(["worker-a"]), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.lease_expires_at, lease)
+
+    def test_reclaimed_job_without_attempts_left_is_dead_lettered(self):
+        job = create_job(
+            self.user,
+            status=QuizJob.Status.GENERATING,
+            locked_by="crashed-worker",
+            attempts=3,
+            lease_expires_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        self.assertIsNone(job_queue.claim_job("worker-b"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, QuizJob.Status.FAILED)
+        self.assertEqual(job.attempts, 3)
+        self.assertIsNotNone(job.dead_lettered_at)
+
+    @patch("app_quiz.api.utils.generate_quiz_from_text")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_process_next_runs_pipeline(
+        self, mock_download, mock_parse_audio, mock_generate
+    ):
+        mock_download.return_value = "/tmp/test.m4a"
+        mock_parse_audio.return_value = "dummy transcript"
+        mock_generate.return_value = gemini_response()
+        job = create_job(self.user)
+
+        self.assertTrue(job_queue.process_next("worker-a"))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, QuizJob.Status.DONE)
+        self.assertEqual(job.quiz.title, "Queued Quiz")
+        self.assertEqual(job.locked_by, "")
+        self.assertIsNone(job.lease_expires_at)
+        self.assertFalse(job_queue.process_next("worker-a"))
+
+    @patch("app_quiz.api.utils.download_audio")
+    def test_failure_is_retried_with_backoff_then_dead_lettered(self, mock_download):
+        mock_download.side_effect = serializers.ValidationError(
+            {"error": "Audio download failed: boom"}
+        )
+        job = create_job(self.user)
+
+        for attempt, delay in [(1, 10), (2, 20)]:
+            before = timezone.now()
+            self.assertTrue(job_queue.process_next("worker-a"))
+            job.refresh_from_db()
+            self.assertEqual(job.status, QuizJob.Status.QUEUED)
+            self.assertEqual(job.attempts, attempt)
+            self.assertEqual(job.error, "Audio download failed: boom")
+            self.assertGreaterEqual(job.available_at, before + timedelta(seconds=delay))
+            QuizJob.objects.filter(pk=job.pk).update(available_at=timezone.now())
+
+        self.assertTrue(job_queue.process_next("worker-a"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, QuizJob.Status.FAILED)
+        self.assertEqual(job.attempts, 3)
+        self.assertIsNotNone(job.dead_lettered_at)
+        self.assertFalse(job_queue.process_next("worker-a"))
+
+        self.assertEqual(job_queue.requeue_dead_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, QuizJob.Status.QUEUED)
+        self.assertEqual(job.attempts, 0)
+        self.assertIsNone(job.dead_lettered_at)
+
+    @patch("app_quiz.api.utils.generate_quiz_from_text")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_lost_lease_does_not_store_a_quiz(
+        self, mock_download, mock_parse_audio, mock_generate
+    ):
+        mock_download.return_value = "/tmp/test.m4a"
+        mock_parse_audio.return_value = "dummy transcript"
+        mock_generate.return_value = gemini_response()
+        create_job(self.user)
+        job = job_queue.claim_job("worker-a")
+
+        def reclaim(transcript):
+            # Another worker takes over after worker-a's lease expired.
+            QuizJob.objects.filter(pk=job.pk).update(
+                lease_expires_at=timezone.now() - timedelta(seconds=1)
+            )
+            job_queue.claim_job("worker-b")
+            return gemini_response()
+
+        mock_generate.side_effect = reclaim
+        job_queue.run_job(job)
+
+        self.assertFalse(Quiz.objects.exists())
+        job.refresh_from_db()
+        self.assertEqual(job.locked_by, "worker-b")
+        self.assertEqual(job.attempts, 2)
+
+    @patch("app_quiz.api.utils.generate_quiz_from_text")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_lost_lease_does_not_overwrite_status(
+        self, mock_download, mock_parse_audio, mock_generate
+    ):
+        mock_download.return_value = "/tmp/test.m4a"
+        create_job(self.user)
+        job = job_queue.claim_job("worker-a")
+
+        def reclaim(audio_path):
+            QuizJob.objects.filter(pk=job.pk).update(
+                lease_expires_at=timezone.now() - timedelta(seconds=1)
+            )
+            job_queue.claim_job("worker-b")
+            return "dummy transcript"
+
+        mock_parse_audio.side_effect = reclaim
+        job_queue.run_job(job)
+
+        mock_generate.assert_not_called()
+        job.refresh_from_db()
+        self.assertEqual(job.status, QuizJob.Status.CLAIMED)
+        self.assertEqual(job.locked_by, "worker-b")
+
+
+@override_settings(
+    QUIZ_JOB_BACKEND="database",
+    QUIZ_JOB_LEASE_SECONDS=60,
+    TRANSCRIPT_CACHE_ENABLED=False,
+)
+class TestLeasedPersist(TransactionTestCase):
+    """Followers are completed once the lease transaction has committed."""
+
+    def setUp(self):
+        self.user, _ = create_user1()
+
+    @patch("app_quiz.api.utils.generate_quiz_from_text")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_followers_are_completed_outside_the_lease_transaction(
+        self, mock_download, mock_parse_audio, mock_generate
+    ):
+        mock_download.return_value = "/tmp/test.m4a"
+        mock_parse_audio.return_value = "dummy transcript"
+        mock_generate.return_value = gemini_response()
+        leader = create_job(self.user)
+        follower = QuizJob.objects.create(
+            creator=self.user,
+            video_id=leader.video_id,
+            video_url=leader.video_url,
+            leader=leader,
+        )
+        in_transaction = []
+        complete_followers = single_flight.complete_followers
+
+        def record(job, quiz):
+            in_transaction.append(connection.in_atomic_block)
+            return complete_followers(job, quiz)
+
+        with patch.object(single_flight, "complete_followers", side_effect=record):
+            self.assertTrue(job_queue.process_next("worker-a"))
+
+        self.assertEqual(in_transaction, [False])
+        follower.refresh_from_db()
+        self.assertEqual(follower.status, QuizJob.Status.DONE)
+
+
+@override_settings(
+    QUIZ_JOB_BACKEND="database",
+    QUIZ_JOB_LEASE_SECONDS=60,
+    TRANSCRIPT_CACHE_ENABLED=False,
+)
+class TestConcurrentWorkers(TransactionTestCase):
+    """Concurrent workers never claim the same job twice."""
+
+    def setUp(self):
+        self.user, _ = create_user1()
+
+    @patch("app_quiz.api.utils.generate_quiz_from_text")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_run_quiz_workers_once_drains_queue(
+        self, mock_download, mock_parse_audio, mock_generate
+    ):
+        mock_download.return_value = "/tmp/test.m4a"
+        mock_parse_audio.return_value = "dummy transcript"
+        mock_generate.return_value = gemini_response()
+        for _ in range(5):
+            create_job(self.user)
+
+        out = StringIO()
+        call_command("run_quiz_workers", "--once", "--concurrency", "1", stdout=out)
+
+        self.assertEqual(QuizJob.objects.filter(status=QuizJob.Status.DONE).count(), 5)
+        self.assertIn("Quiz workers stopped.", out.getvalue())
+
+    def test_each_job_is_claimed_once(self):
+        job_ids = {create_job(self.user).pk for _ in range(20)}
+        claims = []
+        claims_lock = threading.Lock()
+        start = threading.Barrier(4)
+
+        def worker(worker_id):
+            start.wait()
+            try:
+                while True:
+                    try:
+                        job = job_queue.claim_job(worker_id)
+                    except OperationalError:
+                        # The shared-cache in-memory test database reports
+                        # "table is locked" instead of waiting for the lock.
+                        time.sleep(0.01)
+                        continue
+                    if job is None:
+                        return
+                    with claims_lock:
+                        claims.append(job.pk)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(f"worker-{index}",))
+            for index in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+
+        self.assertEqual(sorted(claims), sorted(job_ids))
@@ -0,0 +1,105 @@
+import json
+import tempfile
+from unittest.mock import Mock, patch
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from app_quiz.models import QuizJob
+from core import metrics
+from .test_utils import create_user1
+
+QUIZ_JSON = {
+    "title": "Timed Quiz",
+    "description": "Timed description",
+    "questions": [
+        {
+            "question_title": "Q1",
+            "question_options": ["A", "B", "C", "D"],
+            "answer": "A",
+        }
+    ],
+}
+
+STAGES = ["download", "transcribe", "generate", "parse", "store"]
+
+
+def gemini_response():
+    return Mock(
+        candidates=[Mock(content=Mock(parts=[Mock(text=json.dumps(QUIZ_JSON))]))]
+    )
+
+
+@override_settings(
+    QUIZ_JOBS_EAGER=True,
+    QUIZ_REUSE_EXISTING=False,
+    TRANSCRIPT_CACHE_ENABLED=False,
+    METRICS_ENABLED=True,
+    METRICS_TOKEN="",
+)
+class TestPipelineMetrics(APITestCase):
+    """Stage timings reach Server-Timing headers, the job and `/metrics`."""
+
+    def setUp(self):
+        self.user, self.user_client = create_user1()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(METRICS_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        metrics.clear()
+        self.addCleanup(metrics.clear)
+
+    @patch("app_quiz.api.utils.generate_quiz_from_text")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_stage_timings_are_reported(
+        self, mock_download, mock_parse_audio, mock_generate
+    ):
+        mock_download.return_value = "/tmp/test.m4a"
+        mock_parse_audio.return_value = "dummy transcript"
+        mock_generate.return_value = gemini_response()
+
+        response = self.user_client.post(
+            reverse("create_quiz"),
+            {"url": "https://www.youtube.com/watch?v=ok-plXXHlWw"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        header = response["Server-Timing"]
+        for stage in STAGES + ["total"]:
+            self.assertIn(f"{stage};dur=", header)
+
+        job = QuizJob.objects.get(pk=response.json()["id"])
+        self.assertEqual(sorted(job.timings), sorted(STAGES))
+        detail = self.user_client.get(
+            reverse("quiz_job_detail", kwargs={"id": job.pk})
+        )
+        for stage in STAGES:
+            self.assertIn(f"job_{stage};dur=", detail["Server-Timing"])
+
+        text = self.client.get(reverse("metrics")).content.decode()
+        for stage in STAGES:
+            self.assertIn(
+                f'quizly_pipeline_stage_seconds_count{{stage="{stage}"}} 1', text
+            )
+        self.assertIn("quizly_transcript_characters_sum 16", text)
+        self.assertIn('quizly_quiz_jobs_total{outcome="done"} 1', text)
+
+    @patch("app_quiz.api.utils.download_audio")
+    def test_failed_job_keeps_timings_of_finished_stages(self, mock_download):
+        mock_download.side_effect = RuntimeError("boom")
+
+        response = self.user_client.post(
+            reverse("create_quiz"),
+            {"url": "https://www.youtube.com/watch?v=ok-plXXHlWw"},
+            format="json",
+        )
+
+        job = QuizJob.objects.get(pk=response.json()["id"])
+        self.assertEqual(job.status, QuizJob.Status.FAILED)
+        self.assertEqual(list(job.timings), ["download"])
+        text = metrics.render()
+        self.assertIn('quizly_quiz_jobs_total{outcome="failed"} 1', text)
@@ -0,0 +1,67 @@
+from django.test import TestCase
+from app_quiz.api import utils
+from app_quiz.models import Question
+from .test_utils import create_user1, create_quiz_for_user1
+
+
+def make_question(index):
+    return {
+        "question_title": f"Question {index}",
+        "question_options": ["A", "B", "C", "D"],
+        "answer": "B",
+    }
+
+
+class TestCreateQuizQuestions(TestCase):
+    """Tests for persisting generated questions.
+
+    Ensures all questions are stored with one batched INSERT regardless of
+    their number and that an invalid payload is rejected before any row is
+    written.
+    """
+
+    def setUp(self):
+        self.user, _ = create_user1()
+        self.quiz, _ = create_quiz_for_user1(self.user)
+
+    def test_single_insert_for_all_questions(self):
+        quiz_dict = {"questions": [make_question(i) for i in range(10)]}
+        with self.assertNumQueries(1):
+            created = utils.create_quiz_questions(self.quiz, quiz_dict)
+
+        self.assertEqual(len(created), 10)
+        self.assertTrue(all(question.pk for question in created))
+        self.assertEqual(self.quiz.questions.count(), 11)
+
+    def test_invalid_payload_writes_nothing(self):
+        invalid_questions = [
+            {"question_options": ["A", "B", "C", "D"], "answer": "A"},
+            {"question_title": "Q", "question_options": ["A", "B"], "answer": "A"},
+            {"question_title": "Q", "question_options": "ABCD", "answer": "A"},
+            {"question_title": "Q", "question_options": ["A", "B", "C", "D"]},
+            {
+                "question_title": "Q",
+                "question_options": ["A", "B", "C", "D"],
+                "answer": "E",
+            },
+            {
+                "question_title": "Q" * 256,
+                "question_options": ["A", "B", "C", "D"],
+                "answer": "A",
+            },
+            "not a question",
+        ]
+        before = Question.objects.count()
+        for invalid in invalid_questions:
+            with self.subTest(question=invalid):
+                quiz_dict = {"questions": [make_question(1), invalid]}
+                with self.assertNumQueries(0):
+                    with self.assertRaises(ValueError):
+                        utils.create_quiz_questions(self.quiz, quiz_dict)
+        self.assertEqual(Question.objects.count(), before)
+
+    def test_empty_payload(self):
+        for quiz_dict in [{}, {"questions": []}, {"questions": None}]:
+            with self.subTest(quiz_dict=quiz_dict):
+                with self.assertRaises(ValueError):
+                    utils.create_quiz_questions(self.quiz, quiz_dict)
@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from core import db_router
+from .test_utils import create_user1, create_quiz_for_user1
+
+
+@override_settings(QUIZ_CACHE_ENABLED=False)
+class TestQuizReplicaRouting(APITestCase):
+    """Quiz reads run inside `read_from_replica`, writes pin the owner."""
+
+    def setUp(self):
+        cache.clear()
+        self.user, self.user_client = create_user1()
+        self.quiz, questions = create_quiz_for_user1(self.user)
+        self.detail_url = reverse("quiz_detail", kwargs={"id": self.quiz.id})
+
+    def test_get_requests_read_from_replica(self):
+        with patch.object(
+            db_router, "read_from_replica", wraps=db_router.read_from_replica
+        ) as read_from_replica:
+            self.user_client.get(reverse("quiz_list"))
+            self.user_client.get(self.detail_url)
+        self.assertEqual(read_from_replica.call_count, 2)
+        read_from_replica.assert_called_with(self.user.id)
+
+    def test_writes_do_not_read_from_replica(self):
+        with patch.object(db_router, "read_from_replica") as read_from_replica:
+            self.user_client.patch(self.detail_url, {"title": "New"}, format="json")
+            self.user_client.delete(self.detail_url)
+        read_from_replica.assert_not_called()
+
+    @override_settings(DATABASE_READ_REPLICAS=["replica_0"])
+    def test_write_pins_owner_to_primary(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.user_client.patch(
+                self.detail_url, {"title": "New"}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(db_router.has_recent_write(self.user.id))
+
+
+@unittest.skipUnless(
+    settings.DATABASE_READ_REPLICAS, "set DATABASE_REPLICA_URLS to run"
+)
+@override_settings(QUIZ_CACHE_ENABLED=False, READ_REPLICA_STICKY_SECONDS=60)
+class TestQuizReadReplicaQueries(TransactionTestCase):
+    """End-to-end check against the configured (mirrored) replicas."""
+
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        self.user, self.user_client = create_user1()
+        self.quiz, questions = create_quiz_for_user1(self.user)
+        cache.clear()
+        self.detail_url = reverse("quiz_detail", kwargs={"id": self.quiz.id})
+
+    def replica_queries(self, method, *args, **kwargs):
+        contexts = [
+            CaptureQueriesContext(connections[alias])
+            for alias in settings.DATABASE_READ_REPLICAS
+        ]
+        for context in contexts:
+            context.__enter__()
+        try:
+            response = getattr(self.user_client, method)(*args, **kwargs)
+        finally:
+            for context in contexts:
+                context.__exit__(None, None, None)
+        return response, sum(len(context) for context in contexts)
+
+    def test_reads_hit_replica_until_owner_writes(self):
+        response, queries = self.replica_queries("get", self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(queries, 0)
+
+        self.user_client.patch(self.detail_url, {"title": "New"}, format="json")
+        response, queries = self.replica_queries("get", self.detail_url)
+        self.assertEqual(response.json()["title"], "New")
+        self.assertEqual(queries, 0)
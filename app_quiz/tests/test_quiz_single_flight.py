@@ -0,0 +1,373 @@
+import json
+import os
+from datetime import timedelta
+from unittest.mock import MagicMock, Mock, patch
+
+from django.db import IntegrityError, transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.test import APITestCase
+from app_quiz.api import jobs, single_flight, utils
+from app_quiz.models import Quiz, QuizJob
+from .test_utils import create_user1, create_user2
+
+QUIZ_JSON = {
+    "title": "Shared Quiz",
+    "description": "Shared description",
+    "questions": [
+        {
+            "question_title": "Q1",
+            "question_options": ["A", "B", "C", "D"],
+            "answer": "A",
+        }
+    ],
+}
+
+URL = "https://www.youtube.com/watch?v=ok-plXXHlWw"
+
+
+def gemini_response():
+    return Mock(
+        candidates=[Mock(content=Mock(parts=[Mock(text=json.dumps(QUIZ_JSON))]))]
+    )
+
+
+@override_settings(
+    QUIZ_JOBS_EAGER=False,
+    QUIZ_REUSE_EXISTING=False,
+    TRANSCRIPT_CACHE_ENABLED=False,
+)
+class TestSingleFlight(APITestCase):
+    """Concurrent submissions of one video share a single pipeline run.
+
+    Jobs are not executed by the requests (on-commit callbacks do not run
+    inside a test transaction); tests run the leader explicitly.
+    """
+
+    def setUp(self):
+        self.user1, self.client1 = create_user1()
+        self.user2, self.client2 = create_user2()
+        self.url = reverse("create_quiz")
+
+    def post(self, client, url=URL, **headers):
+        return client.post(self.url, {"url": url}, format="json", headers=headers)
+
+    @patch("app_quiz.api.utils.generate_quiz_from_text")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_followers_receive_copy_of_leader_quiz(
+        self, mock_download, mock_parse_audio, mock_generate
+    ):
+        mock_download.return_value = "/tmp/test.m4a"
+        mock_parse_audio.return_value = "dummy transcript"
+        mock_generate.return_value = gemini_response()
+
+        with patch.object(jobs, "enqueue_quiz_job") as mock_enqueue:
+            first = self.post(self.client1)
+            second = self.post(self.client2)
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(second.status_code, status.HTTP_202_ACCEPTED)
+        mock_enqueue.assert_called_once()
+
+        leader = QuizJob.objects.get(pk=first.json()["id"])
+        follower = QuizJob.objects.get(pk=second.json()["id"])
+        self.assertIsNone(leader.leader)
+        self.assertEqual(follower.leader, leader)
+        self.assertEqual(follower.status, QuizJob.Status.QUEUED)
+
+        jobs.run_quiz_job(leader)
+
+        mock_download.assert_called_once()
+        mock_generate.assert_called_once()
+        follower.refresh_from_db()
+        self.assertEqual(leader.status, QuizJob.Status.DONE)
+        self.assertEqual(follower.status, QuizJob.Status.DONE)
+        self.assertEqual(leader.quiz.creator, self.user1)
+        self.assertEqual(follower.quiz.creator, self.user2)
+        self.assertNotEqual(follower.quiz_id, leader.quiz_id)
+        self.assertEqual(follower.quiz.questions.count(), 1)
+
+    @patch("app_quiz.api.utils.download_audio")
+    def test_followers_fail_with_leader(self, mock_download):
+        mock_download.side_effect = serializers.ValidationError(
+            {"error": "Audio download failed: boom"}
+        )
+        with patch.object(jobs, "enqueue_quiz_job"):
+            leader_id = self.post(self.client1).json()["id"]
+            follower_id = self.post(self.client2).json()["id"]
+
+        jobs.run_quiz_job(QuizJob.objects.get(pk=leader_id))
+
+        follower = QuizJob.objects.get(pk=follower_id)
+        self.assertEqual(follower.status, QuizJob.Status.FAILED)
+        self.assertEqual(follower.error, "Audio download failed: boom")
+
+    def test_finished_leader_is_not_followed(self):
+        with patch.object(jobs, "enqueue_quiz_job") as mock_enqueue:
+            first_id = self.post(self.client1).json()["id"]
+            QuizJob.objects.filter(pk=first_id).update(status=QuizJob.Status.DONE)
+            second_id = self.post(self.client2).json()["id"]
+
+        self.assertEqual(mock_enqueue.call_count, 2)
+        self.assertIsNone(QuizJob.objects.get(pk=second_id).leader)
+
+    def test_one_in_flight_leader_per_video(self):
+        QuizJob.objects.create(
+            creator=self.user1, video_id="ok-plXXHlWw", video_url=URL
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            QuizJob.objects.create(
+                creator=self.user2, video_id="ok-plXXHlWw", video_url=URL
+            )
+
+    def test_lost_leader_race_attaches_as_follower(self):
+        leader = QuizJob.objects.create(
+            creator=self.user1, video_id="ok-plXXHlWw", video_url=URL
+        )
+        job = QuizJob(creator=self.user2, video_id="ok-plXXHlWw", video_url=URL)
+        lookups = [None, leader]
+
+        with patch.object(
+            single_flight, "_in_flight_leader", side_effect=lambda _: lookups.pop(0)
+        ):
+            job, is_leader = single_flight.submit(job)
+
+        self.assertFalse(is_leader)
+        self.assertEqual(job.leader, leader)
+
+    @override_settings(QUIZ_SINGLE_FLIGHT_STALE_SECONDS=60)
+    def test_stale_leader_is_taken_over(self):
+        stale = QuizJob.objects.create(
+            creator=self.user1, video_id="ok-plXXHlWw", video_url=URL
+        )
+        waiting = QuizJob.objects.create(
+            creator=self.user2, video_id="ok-plXXHlWw", video_url=URL, leader=stale
+        )
+        QuizJob.objects.filter(pk=stale.pk).update(
+            updated_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        with patch.object(jobs, "enqueue_quiz_job") as mock_enqueue:
+            new_id = self.post(self.client1).json()["id"]
+
+        mock_enqueue.assert_called_once()
+        stale.refresh_from_db()
+        waiting.refresh_from_db()
+        self.assertEqual(stale.status, QuizJob.Status.FAILED)
+        self.assertEqual(waiting.leader_id, new_id)
+
+    @override_settings(QUIZ_SINGLE_FLIGHT_STALE_SECONDS=60)
+    def test_running_leader_is_kept_fresh(self):
+        """A leader in a long stage is refreshed instead of taken over."""
+        leader = QuizJob.objects.create(
+            creator=self.user1,
+            video_id="ok-plXXHlWw",
+            video_url=URL,
+            status=QuizJob.Status.TRANSCRIBING,
+        )
+        QuizJob.objects.filter(pk=leader.pk).update(
+            updated_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        with single_flight.keep_alive(leader):
+            self.assertEqual(single_flight.refresh_alive_leaders(), 1)
+            response = self.post(self.client2)
+
+        self.assertEqual(QuizJob.objects.get(pk=response.json()["id"]).leader, leader)
+        leader.refresh_from_db()
+        self.assertEqual(leader.status, QuizJob.Status.TRANSCRIBING)
+        self.assertEqual(single_flight.refresh_alive_leaders(), 0)
+
+
+    @override_settings(QUIZ_SINGLE_FLIGHT_STALE_SECONDS=60)
+    def test_enqueued_leader_is_kept_fresh(self):
+        """A leader waiting for a free worker is not taken over."""
+        with patch.object(jobs, "get_executor") as mock_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                leader_id = self.post(self.client1).json()["id"]
+        mock_executor.return_value.submit.assert_called_once_with(
+            jobs._run_in_worker, leader_id
+        )
+        self.addCleanup(single_flight.release, leader_id)
+        QuizJob.objects.filter(pk=leader_id).update(
+            updated_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        self.assertEqual(single_flight.refresh_alive_leaders(), 1)
+        with patch.object(jobs, "enqueue_quiz_job") as mock_enqueue:
+            follower_id = self.post(self.client2).json()["id"]
+
+        mock_enqueue.assert_not_called()
+        self.assertEqual(QuizJob.objects.get(pk=follower_id).leader_id, leader_id)
+        self.assertEqual(
+            QuizJob.objects.get(pk=leader_id).status, QuizJob.Status.QUEUED
+        )
+
+    def test_leader_started_after_lookup_is_not_taken_over(self):
+        leader = QuizJob.objects.create(
+            creator=self.user1, video_id="ok-plXXHlWw", video_url=URL
+        )
+        seen = QuizJob.objects.get(pk=leader.pk)
+        self.assertTrue(jobs.claim_job(leader))
+        job = QuizJob(creator=self.user2, video_id="ok-plXXHlWw", video_url=URL)
+
+        self.assertFalse(single_flight._take_over(seen, job))
+
+        self.assertIsNone(job.pk)
+        leader.refresh_from_db()
+        self.assertEqual(leader.status, QuizJob.Status.DOWNLOADING)
+
+
+@override_settings(
+    QUIZ_JOBS_EAGER=False,
+    QUIZ_REUSE_EXISTING=False,
+    TRANSCRIPT_CACHE_ENABLED=False,
+    QUIZ_SINGLE_FLIGHT_STALE_SECONDS=60,
+)
+class TestTakenOverLeaderWorker(TransactionTestCase):
+    """A queued leader that was taken over is skipped by its worker.
+
+    The stale leader is taken over while its worker still waits in the
+    executor queue; the executor is drained afterwards.
+    """
+
+    def setUp(self):
+        self.user1, self.client1 = create_user1()
+        self.user2, self.client2 = create_user2()
+        patcher = patch.multiple(
+            utils,
+            download_audio=Mock(return_value="/tmp/test.m4a"),
+            parse_audio_into_text=Mock(return_value="dummy transcript"),
+            generate_quiz_from_text=Mock(return_value=gemini_response()),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.stale = QuizJob.objects.create(
+            creator=self.user1, video_id="ok-plXXHlWw", video_url=URL
+        )
+        QuizJob.objects.filter(pk=self.stale.pk).update(
+            updated_at=timezone.now() - timedelta(minutes=5)
+        )
+        self.new, is_leader = single_flight.submit(
+            QuizJob(creator=self.user2, video_id="ok-plXXHlWw", video_url=URL)
+        )
+        self.assertTrue(is_leader)
+
+    def drain(self, *job_ids):
+        executor = jobs.get_executor()
+        for job_id in job_ids:
+            executor.submit(jobs._run_in_worker, job_id).result(timeout=30)
+
+    def assert_stale_untouched(self):
+        self.stale.refresh_from_db()
+        self.assertEqual(self.stale.status, QuizJob.Status.FAILED)
+        self.assertEqual(
+            self.stale.error, "Quiz generation was interrupted. Please try again."
+        )
+        self.assertIsNone(self.stale.quiz_id)
+
+    def test_worker_of_taken_over_leader_runs_after_new_leader(self):
+        self.drain(self.new.pk, self.stale.pk)
+
+        self.assert_stale_untouched()
+        self.new.refresh_from_db()
+        self.assertEqual(self.new.status, QuizJob.Status.DONE)
+        utils.generate_quiz_from_text.assert_called_once()
+        self.assertEqual(Quiz.objects.count(), 1)
+
+    def test_worker_of_taken_over_leader_runs_first(self):
+        self.drain(self.stale.pk)
+
+        self.assert_stale_untouched()
+        utils.download_audio.assert_not_called()
+        self.assertEqual(
+            QuizJob.objects.get(pk=self.new.pk).status, QuizJob.Status.QUEUED
+        )
+
+
+@override_settings(QUIZ_JOBS_EAGER=False, QUIZ_REUSE_EXISTING=False)
+class TestIdempotencyKey(APITestCase):
+    def setUp(self):
+        self.user1, self.client1 = create_user1()
+        self.user2, self.client2 = create_user2()
+        self.url = reverse("create_quiz")
+
+    def post(self, client, url=URL, key="retry-1"):
+        return client.post(
+            self.url, {"url": url}, format="json", headers={"Idempotency-Key": key}
+        )
+
+    def test_retry_returns_original_job(self):
+        with patch.object(jobs, "enqueue_quiz_job") as mock_enqueue:
+            first = self.post(self.client1)
+            retry = self.post(self.client1)
+
+        self.assertEqual(retry.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(retry.json()["id"], first.json()["id"])
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertNotIn("Idempotent-Replayed", first)
+        self.assertEqual(QuizJob.objects.count(), 1)
+        mock_enqueue.assert_called_once()
+
+    def test_keys_are_scoped_per_user(self):
+        with patch.object(jobs, "enqueue_quiz_job"):
+            first = self.post(self.client1)
+            other = self.post(self.client2)
+
+        self.assertNotEqual(other.json()["id"], first.json()["id"])
+
+    def test_key_reused_for_other_video_422(self):
+        with patch.object(jobs, "enqueue_quiz_job"):
+            self.post(self.client1)
+            response = self.post(self.client1, url="https://youtu.be/aaaaaaaaaaa")
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_key_too_long_400(self):
+        response = self.post(self.client1, key="x" * 256)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(QuizJob.objects.exists())
+
+    def test_concurrent_duplicate_key_returns_winner(self):
+        with patch.object(jobs, "enqueue_quiz_job"):
+            winner = self.post(self.client1)
+            with patch.object(single_flight, "find_idempotent_job") as mock_find:
+                # The first lookup misses as if the winner had not committed.
+                winner_job = QuizJob.objects.get(pk=winner.json()["id"])
+                mock_find.side_effect = [None, winner_job, winner_job]
+                response = self.post(self.client1)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.json()["id"], winner_job.pk)
+        self.assertEqual(QuizJob.objects.count(), 1)
+
+
+class TestDownloadPaths(SimpleTestCase):
+    @patch("app_quiz.api.utils.YoutubeDL")
+    def test_downloads_use_separate_directories(self, mock_ydl):
+        def fake_ydl(options):
+            ydl = MagicMock()
+            path = options["outtmpl"].replace("%(id)s.%(ext)s", "ok-plXXHlWw.m4a")
+            ydl.__enter__.return_value.extract_info.return_value = {
+                "requested_downloads": [{"filepath": path}]
+            }
+            open(path, "w").close()
+            return ydl
+
+        mock_ydl.side_effect = fake_ydl
+
+        first = utils.download_audio(URL)
+        second = utils.download_audio(URL)
+
+        self.assertNotEqual(os.path.dirname(first), os.path.dirname(second))
+        for path in (first, second):
+            self.assertTrue(os.path.exists(path))
+            utils.remove_audio(path)
+            self.assertFalse(os.path.exists(os.path.dirname(path)))
+
+    def test_remove_audio_ignores_foreign_paths(self):
+        with patch("app_quiz.api.utils.shutil.rmtree") as mock_rmtree:
+            utils.remove_audio("/tmp/test.m4a")
+        mock_rmtree.assert_not_called()
@@ -0,0 +1,109 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from unittest.mock import patch
+from app_quiz.api import jobs, transcript_cache
+from app_quiz.models import QuizJob, Transcript
+from .test_utils import create_user1
+
+
+@override_settings(
+    WHISPER_MODEL="tiny",
+    WHISPER_LANGUAGE="",
+    TRANSCRIPT_CACHE_ENABLED=True,
+    TRANSCRIPT_CACHE_MAX_BYTES=1024,
+)
+class TestTranscriptCache(TestCase):
+    """Tests for the transcript cache and its use by quiz jobs.
+
+    Covers lookups keyed by video id, model and language, LRU eviction by
+    total size, and that a cache hit skips download and transcription.
+    """
+
+    def setUp(self):
+        self.user, _ = create_user1()
+
+    def test_put_and_get(self):
+        self.assertIsNone(transcript_cache.get("ok-plXXHlWw"))
+        transcript_cache.put("ok-plXXHlWw", "hello world")
+        self.assertEqual(transcript_cache.get("ok-plXXHlWw"), "hello world")
+        self.assertEqual(Transcript.objects.get().size_bytes, 11)
+
+    def test_key_includes_model_and_language(self):
+        transcript_cache.put("ok-plXXHlWw", "tiny transcript")
+        with self.settings(WHISPER_MODEL="base"):
+            self.assertIsNone(transcript_cache.get("ok-plXXHlWw"))
+        with self.settings(WHISPER_LANGUAGE="de"):
+            self.assertIsNone(transcript_cache.get("ok-plXXHlWw"))
+
+    def test_evicts_least_recently_used(self):
+        now = timezone.now()
+        for index, video_id in enumerate(["aaaaaaaaaaa", "bbbbbbbbbbb"]):
+            transcript_cache.put(video_id, "x" * 400)
+            Transcript.objects.filter(video_id=video_id).update(
+                last_used_at=now - timedelta(minutes=10 - index)
+            )
+        transcript_cache.get("aaaaaaaaaaa")
+        transcript_cache.put("ccccccccccc", "x" * 400)
+
+        remaining = set(Transcript.objects.values_list("video_id", flat=True))
+        self.assertEqual(remaining, {"aaaaaaaaaaa", "ccccccccccc"})
+
+    @override_settings(TRANSCRIPT_CACHE_ENABLED=False)
+    def test_disabled(self):
+        transcript_cache.put("ok-plXXHlWw", "hello world")
+        self.assertIsNone(transcript_cache.get("ok-plXXHlWw"))
+        self.assertFalse(Transcript.objects.exists())
+
+    @patch("app_quiz.api.utils.parse_quiz_response")
+    @patch("app_quiz.api.utils.generate_quiz_from_text")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_job_cache_hit_skips_download_and_transcription(
+        self, mock_download, mock_parse_audio, mock_generate, mock_parse_quiz
+    ):
+        mock_parse_quiz.return_value = {
+            "title": "Cached",
+            "description": "From cache",
+            "questions": [
+                {
+                    "question_title": "Q1",
+                    "question_options": ["A", "B", "C", "D"],
+                    "answer": "A",
+                }
+            ],
+        }
+        transcript_cache.put("ok-plXXHlWw", "cached transcript")
+        job = QuizJob.objects.create(
+            creator=self.user,
+            video_id="ok-plXXHlWw",
+            video_url="https://www.youtube.com/watch?v=ok-plXXHlWw",
+        )
+
+        jobs.run_quiz_job(job)
+
+        self.assertEqual(job.status, QuizJob.Status.DONE)
+        mock_download.assert_not_called()
+        mock_parse_audio.assert_not_called()
+        mock_generate.assert_called_once_with("cached transcript")
+
+    @patch("app_quiz.api.utils.parse_quiz_response")
+    @patch("app_quiz.api.utils.generate_quiz_from_text")
+    @patch("app_quiz.api.utils.parse_audio_into_text")
+    @patch("app_quiz.api.utils.download_audio")
+    def test_job_cache_miss_stores_transcript(
+        self, mock_download, mock_parse_audio, mock_generate, mock_parse_quiz
+    ):
+        mock_parse_audio.return_value = "fresh transcript"
+        mock_parse_quiz.side_effect = ValueError("AI Response is empty")
+        job = QuizJob.objects.create(
+            creator=self.user,
+            video_id="ok-plXXHlWw",
+            video_url="https://www.youtube.com/watch?v=ok-plXXHlWw",
+        )
+
+        jobs.run_quiz_job(job)
+
+        self.assertEqual(job.status, QuizJob.Status.FAILED)
+        mock_download.assert_called_once()
+        self.assertEqual(transcript_cache.get("ok-plXXHlWw"), "fresh transcript")
@@ -0,0 +1,60 @@
+from django.test import SimpleTestCase, override_settings
+from unittest.mock import patch, MagicMock
+from app_quiz.api import utils, whisper_registry
+from core import metrics
+
+
+@override_settings(WHISPER_MODEL="tiny")
+class TestWhisperRegistry(SimpleTestCase):
+    """Tests for the process-wide Whisper model registry.
+
+    `whisper.load_model` is patched so no weights are read; the tests check
+    that each model size is loaded exactly once and that load statistics
+    and warm-up timings are recorded.
+    """
+
+    def setUp(self):
+        whisper_registry.clear()
+        self.addCleanup(whisper_registry.clear)
+        patcher = patch("app_quiz.api.whisper_registry.whisper.load_model")
+        self.mock_load = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.model = MagicMock()
+        self.model.transcribe.return_value = {"text": "hello"}
+        self.mock_load.return_value = self.model
+
+    def test_model_loaded_once(self):
+        first = whisper_registry.get_model()
+        second = whisper_registry.get_model("tiny")
+        self.assertIs(first, second)
+        self.mock_load.assert_called_once_with("tiny")
+
+    def test_parse_audio_into_text_reuses_model(self):
+        self.assertEqual(utils.parse_audio_into_text("/tmp/a.m4a"), "hello")
+        self.assertEqual(utils.parse_audio_into_text("/tmp/b.m4a"), "hello")
+        self.mock_load.assert_called_once()
+        self.model.transcribe.assert_called_with("/tmp/b.m4a", fp16=False)
+
+    @override_settings(WHISPER_MODEL="base")
+    def test_model_size_from_settings(self):
+        whisper_registry.get_model()
+        self.mock_load.assert_called_once_with("base")
+
+    def test_warm_up_records_stats(self):
+        whisper_registry.warm_up()
+        stats = whisper_registry.model_stats()["tiny"]
+        self.assertGreaterEqual(stats["load_seconds"], 0)
+        self.assertGreaterEqual(stats["warmup_seconds"], 0)
+        self.assertIn("rss_bytes", stats)
+        audio = self.model.transcribe.call_args.args[0]
+        self.assertEqual(len(audio), 16000)
+
+    def test_stats_are_exposed_as_gauges(self):
+        whisper_registry.warm_up()
+
+        text = metrics.render()
+
+        self.assertIn("# TYPE quizly_whisper_load_seconds gauge", text)
+        self.assertIn('quizly_whisper_load_seconds{model="tiny"} ', text)
+        self.assertIn('quizly_whisper_warmup_seconds{model="tiny"} ', text)
+        self.assertIn('quizly_whisper_rss_bytes{model="tiny"} ', text)
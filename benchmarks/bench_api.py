@@ -0,0 +1,144 @@
+"""Benchmark quiz list/detail and login latency at several dataset sizes.
+
+For every size N in `--sizes` the database is grown to N users and N
+quizzes (with `--questions` questions each) owned by the benchmark user,
+then the endpoints are timed through the full middleware stack with cookie
+authentication:
+
+- `list`: First page of `quizzes/`.
+- `detail`: `quizzes/<id>/` of a quiz in the middle of the data set.
+- `login`: `login/` of the benchmark user (throttles disabled).
+
+List and detail are measured with the payload cache disabled (`uncached`,
+every request hits the database) and enabled (`cached`).
+
+Usage:
+    python -m benchmarks.bench_api --sizes 10,100,1000 --iterations 100 \
+        [--json report.json]
+"""
+
+from benchmarks.common import (
+    base_parser,
+    benchmark_database,
+    emit_report,
+    measure,
+    setup_django,
+)
+
+
+def grow_users(count, password_hash):
+    from django.contrib.auth.models import User
+
+    existing = User.objects.filter(username__startswith="bench_user_").count()
+    User.objects.bulk_create(
+        User(
+            username=f"bench_user_{index}",
+            email=f"bench_user_{index}@mail.de",
+            password=password_hash,
+        )
+        for index in range(existing, count)
+    )
+
+
+def grow_quizzes(user, count, questions):
+    from app_quiz.models import Question, Quiz
+
+    existing = Quiz.objects.filter(creator=user).count()
+    quizzes = Quiz.objects.bulk_create(
+        Quiz(
+            creator=user,
+            title=f"Quiz {index}",
+            description="Benchmark quiz",
+            video_url=f"https://www.youtube.com/watch?v=bench{index:06d}",
+            video_id=f"bench{index:06d}",
+        )
+        for index in range(existing, count)
+    )
+    Question.objects.bulk_create(
+        Question(
+            quiz=quiz,
+            question_title=f"Question {number}",
+            question_options=["A", "B", "C", "D"],
+            answer="A",
+        )
+        for quiz in quizzes
+        for number in range(questions)
+    )
+
+
+def get(client, url):
+    def call():
+        response = client.get(url)
+        assert response.status_code == 200, response.status_code
+
+    return call
+
+
+def run(sizes, iterations, login_iterations, questions):
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from django.core.cache import cache
+    from django.test import override_settings
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from app_quiz.models import Quiz
+
+    password = "bench_password"
+    password_hash = make_password(password)
+    credentials = {"username": "bench_user_0", "password": password}
+    throttles_off = override_settings(
+        AUTH_THROTTLE_RATES={
+            "login_ip": None,
+            "login_username": None,
+            "register_ip": None,
+        }
+    )
+
+    report = {}
+    with throttles_off:
+        for size in sorted(sizes):
+            grow_users(size, password_hash)
+            user = User.objects.get(username="bench_user_0")
+            grow_quizzes(user, size, questions)
+            client = APIClient()
+
+            def login():
+                response = client.post(reverse("login"), credentials, format="json")
+                assert response.status_code == 200, response.status_code
+
+            entry = {"login": measure(login, login_iterations)}
+            middle = Quiz.objects.filter(creator=user).order_by("pk")[size // 2]
+            urls = {
+                "list": reverse("quiz_list"),
+                "detail": reverse("quiz_detail", kwargs={"id": middle.pk}),
+            }
+            for name, url in urls.items():
+                entry[name] = {}
+                for mode, enabled in (("uncached", False), ("cached", True)):
+                    cache.clear()
+                    with override_settings(QUIZ_CACHE_ENABLED=enabled):
+                        entry[name][mode] = measure(get(client, url), iterations)
+            report[str(size)] = entry
+    return {"questions_per_quiz": questions, "sizes": report}
+
+
+def main():
+    parser = base_parser(__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default="10,100,1000",
+        help="Comma-separated numbers of users and quizzes.",
+    )
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--login-iterations", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=10)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    setup_django()
+    with benchmark_database():
+        report = run(sizes, args.iterations, args.login_iterations, args.questions)
+    emit_report({"api": report}, args.json)
+
+
+if __name__ == "__main__":
+    main()
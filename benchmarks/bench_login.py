@@ -0,0 +1,89 @@
+"""Benchmark login throughput: single-pass `LoginView` vs. the old flow.
+
+The previous `LoginView.post` validated `TokenObtainPairSerializer`, called
+`authenticate()` again and then ran `TokenObtainPairView.post`, which built
+and validated another serializer: three password hashes per login.
+`LegacyLoginView` below reproduces that flow so both can be compared on the
+same machine and password hasher.
+
+Usage:
+    python -m benchmarks.bench_login --iterations 20 [--json report.json]
+"""
+
+from benchmarks.common import (
+    base_parser,
+    benchmark_database,
+    emit_report,
+    measure,
+    setup_django,
+)
+
+
+def build_legacy_view():
+    from django.contrib.auth import authenticate
+    from rest_framework import status
+    from rest_framework.response import Response
+    from app_auth.api.views import LoginView
+
+    class LegacyLoginView(LoginView):
+        """The pre-optimisation login flow (three password hashes)."""
+
+        def post(self, request, *args, **kwargs):
+            serializer = self.get_serializer(data=request.data)
+            try:
+                serializer.is_valid(raise_exception=True)
+            except Exception:
+                return Response(status=status.HTTP_401_UNAUTHORIZED)
+            user = authenticate(
+                username=request.data.get("username"),
+                password=request.data.get("password"),
+            )
+            if not user:
+                return Response(status=status.HTTP_401_UNAUTHORIZED)
+            return super(LoginView, self).post(request, *args, **kwargs)
+
+    return LegacyLoginView
+
+
+def run(iterations):
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIRequestFactory
+    from app_auth.api.views import LoginView
+
+    User.objects.create_user(
+        username="bench_user", password="bench_password", email="bench@mail.de"
+    )
+    factory = APIRequestFactory()
+    payload = {"username": "bench_user", "password": "bench_password"}
+    views = {
+        "legacy": build_legacy_view().as_view(),
+        "single_pass": LoginView.as_view(),
+    }
+
+    report = {}
+    for name, view in views.items():
+
+        def login():
+            request = factory.post("/api/login/", payload, format="json")
+            response = view(request)
+            assert response.status_code == 200, response.status_code
+
+        report[name] = measure(login, iterations)
+    report["speedup"] = (
+        report["single_pass"]["ops_per_s"] / report["legacy"]["ops_per_s"]
+    )
+    return report
+
+
+def main():
+    parser = base_parser(__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    setup_django()
+    with benchmark_database():
+        report = run(args.iterations)
+    emit_report({"login": report}, args.json)
+
+
+if __name__ == "__main__":
+    main()
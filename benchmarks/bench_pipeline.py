@@ -0,0 +1,120 @@
+"""Benchmark the quiz pipeline stages and `createQuiz/` throughput offline.
+
+yt-dlp, Whisper and Gemini are replaced by the deterministic fakes from
+`app_quiz.offline`, so the numbers reflect the project's own overhead
+(temporary files, status updates, parsing, validation, storing) unless
+`--whisper` transcribes the bundled audio fixture with the real model.
+
+- `stages`: Jobs run with `jobs.run_quiz_job`; the per-stage durations are
+  taken from `QuizJob.timings` (see `app_quiz.api.pipeline_metrics`).
+- `create_quiz`: `--requests` sequential POSTs to `createQuiz/` with eager
+  jobs, each for a different video, so every request runs the full
+  pipeline. Reports per-request latency and end-to-end throughput.
+
+Usage:
+    python -m benchmarks.bench_pipeline --jobs 50 --requests 50 [--whisper] \
+        [--json report.json]
+"""
+
+import time
+
+from benchmarks.common import (
+    base_parser,
+    benchmark_database,
+    emit_report,
+    setup_django,
+    summarize,
+)
+
+
+def video_url(index):
+    return f"https://www.youtube.com/watch?v=bench{index:06d}"
+
+
+def pipeline_settings():
+    from django.test import override_settings
+
+    return override_settings(
+        QUIZ_JOBS_EAGER=True,
+        QUIZ_JOB_BACKEND="thread",
+        QUIZ_REUSE_EXISTING=False,
+        TRANSCRIPT_CACHE_ENABLED=False,
+    )
+
+
+def bench_stages(user, count, offset=0):
+    from app_quiz.api import jobs
+    from app_quiz.models import QuizJob
+
+    samples = {}
+    for index in range(offset, offset + count):
+        url = video_url(index)
+        job = QuizJob.objects.create(
+            creator=user, video_url=url, video_id=url.rsplit("=", 1)[1]
+        )
+        jobs.run_quiz_job(job)
+        assert job.status == QuizJob.Status.DONE, job.error
+        for stage, seconds in job.timings.items():
+            samples.setdefault(stage, []).append(seconds)
+    return {stage: summarize(values) for stage, values in samples.items()}
+
+
+def bench_create_quiz(user, count, offset=0):
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = reverse("create_quiz")
+    samples = []
+    wall_start = time.perf_counter()
+    for index in range(offset, offset + count):
+        start = time.perf_counter()
+        response = client.post(url, {"url": video_url(index)}, format="json")
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 202, response.status_code
+        assert response.json()["status"] == "done", response.json()
+    wall = time.perf_counter() - wall_start
+    report = summarize(samples)
+    report["wall_s"] = wall
+    report["throughput_quizzes_per_s"] = count / wall if wall else 0.0
+    return report
+
+
+def run(job_count, request_count, real_whisper=False, transcript_words=1500):
+    from django.contrib.auth.models import User
+    from app_quiz.offline import offline_pipeline
+
+    user = User.objects.create_user(
+        username="bench_user", password="bench_password", email="bench@mail.de"
+    )
+    with pipeline_settings(), offline_pipeline(real_whisper, transcript_words):
+        # Warm up imports, the Whisper model and the first queries.
+        bench_stages(user, 1, offset=900000)
+        return {
+            "transcriber": "whisper" if real_whisper else "fake",
+            "transcript_words": None if real_whisper else transcript_words,
+            "stages": bench_stages(user, job_count),
+            "create_quiz": bench_create_quiz(user, request_count, offset=job_count),
+        }
+
+
+def main():
+    parser = base_parser(__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--transcript-words", type=int, default=1500)
+    parser.add_argument(
+        "--whisper",
+        action="store_true",
+        help="Transcribe the audio fixture with the real Whisper model.",
+    )
+    args = parser.parse_args()
+    setup_django()
+    with benchmark_database():
+        report = run(args.jobs, args.requests, args.whisper, args.transcript_words)
+    emit_report({"pipeline": report}, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark refresh latency with a large refresh-token revocation list.
+
+Fills `RevokedToken` with `--revoked` entries (one million by default) and
+times `CookieTokenRefreshView` for a token that is not revoked (the common
+case, answered by the in-process Bloom filter) and for a revoked one. For
+comparison `db_lookup` checks the table on every refresh, which is what a
+plain database blacklist does. The report also contains the time and
+memory needed to build the filter.
+
+Usage:
+    python -m benchmarks.bench_refresh --revoked 1000000 --iterations 200 \
+        [--json report.json]
+"""
+
+import time
+import uuid
+from datetime import timedelta
+
+from benchmarks.common import (
+    base_parser,
+    benchmark_database,
+    emit_report,
+    measure,
+    setup_django,
+)
+
+
+def fill_revocations(count, batch_size=20000):
+    from django.utils import timezone
+    from app_auth.models import RevokedToken
+
+    expires_at = timezone.now() + timedelta(days=1)
+    for offset in range(0, count, batch_size):
+        RevokedToken.objects.bulk_create(
+            RevokedToken(jti=uuid.uuid4().hex, expires_at=expires_at)
+            for _ in range(min(batch_size, count - offset))
+        )
+
+
+def build_db_lookup_view():
+    from rest_framework_simplejwt.exceptions import TokenError
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from app_auth.api.serializers import CookieTokenRefreshSerializer
+    from app_auth.api.views import CookieTokenRefreshView
+    from app_auth.models import RevokedToken
+
+    class DbLookupRefreshToken(RefreshToken):
+        def verify(self):
+            super().verify()
+            if RevokedToken.objects.filter(jti=self["jti"]).exists():
+                raise TokenError("Token is revoked")
+
+    class DbLookupSerializer(CookieTokenRefreshSerializer):
+        token_class = DbLookupRefreshToken
+
+    class DbLookupRefreshView(CookieTokenRefreshView):
+        serializer_class = DbLookupSerializer
+
+    return DbLookupRefreshView
+
+
+def run(revoked, iterations):
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from app_auth import revocation
+    from app_auth.api.views import CookieTokenRefreshView
+
+    user = User.objects.create_user(
+        username="bench_user", password="bench_password", email="bench@mail.de"
+    )
+    start = time.perf_counter()
+    fill_revocations(revoked)
+    fill_seconds = time.perf_counter() - start
+
+    revoked_token = RefreshToken.for_user(user)
+    revocation.revoke(revoked_token)
+    revocation.clear()
+    start = time.perf_counter()
+    revocation.is_revoked("warm-up")
+    build_seconds = time.perf_counter() - start
+    bloom = revocation._state.bloom
+
+    factory = APIRequestFactory()
+    valid_cookie = str(RefreshToken.for_user(user))
+    revoked_cookie = str(revoked_token)
+
+    def refresh(view, cookie, expected_status):
+        def call():
+            request = factory.post("/api/token/refresh/")
+            request.COOKIES["refresh_token"] = cookie
+            response = view(request)
+            assert response.status_code == expected_status, response.status_code
+
+        return call
+
+    bloom_view = CookieTokenRefreshView.as_view()
+    db_view = build_db_lookup_view().as_view()
+    report = {
+        "revoked_entries": revoked + 1,
+        "fill_seconds": fill_seconds,
+        "bloom": {
+            "build_seconds": build_seconds,
+            "bytes": len(bloom.bits),
+            "hash_count": bloom.hash_count,
+        },
+        "bloom_not_revoked": measure(
+            refresh(bloom_view, valid_cookie, 200), iterations
+        ),
+        "bloom_revoked": measure(refresh(bloom_view, revoked_cookie, 401), iterations),
+        "db_lookup_not_revoked": measure(
+            refresh(db_view, valid_cookie, 200), iterations
+        ),
+    }
+    return report
+
+
+def main():
+    parser = base_parser(__doc__.splitlines()[0])
+    parser.add_argument("--revoked", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    setup_django()
+    with benchmark_database():
+        report = run(args.revoked, args.iterations)
+    emit_report({"refresh": report}, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Benchmark concurrent SQLite access: bare settings vs. production profile.
+
+Worker threads run a mix of short reads and read-then-write transactions
+(like quiz job status updates) against a temporary database file:
+
+- `development`: What the bare Django SQLite config does: rollback journal,
+  deferred transactions, 5s busy timeout, a new connection per operation
+  (`CONN_MAX_AGE=0`).
+- `production`: The pragmas from `core.database.sqlite_pragmas`, `BEGIN
+  IMMEDIATE` transactions and one persistent connection per thread.
+
+Deferred transactions that read before writing cannot wait out a lock
+upgrade, so the bare config reports "database is locked" errors under
+write contention; those are counted per profile.
+
+Usage:
+    python -m benchmarks.bench_sqlite_concurrency --threads 8 --ops 300 \
+        [--write-ratio 0.2] [--json report.json]
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from benchmarks.common import base_parser, emit_report, summarize
+from core.database import sqlite_pragmas
+
+ROWS = 1000
+
+
+class Profile:
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.production = name == "production"
+        self.local = threading.local()
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        if self.production:
+            for pragma in sqlite_pragmas():
+                connection.execute(pragma)
+        return connection
+
+    def connection(self):
+        if not self.production:
+            return self.connect()
+        if getattr(self.local, "connection", None) is None:
+            self.local.connection = self.connect()
+        return self.local.connection
+
+    def release(self, connection):
+        if not self.production:
+            connection.close()
+
+    def begin(self):
+        return "BEGIN IMMEDIATE" if self.production else "BEGIN"
+
+
+def create_database(path):
+    connection = sqlite3.connect(path, isolation_level=None)
+    connection.execute(
+        "CREATE TABLE jobs (id INTEGER PRIMARY KEY, status TEXT, updated REAL)"
+    )
+    connection.executemany(
+        "INSERT INTO jobs (id, status, updated) VALUES (?, 'queued', 0)",
+        [(i,) for i in range(1, ROWS + 1)],
+    )
+    connection.close()
+
+
+def worker(profile, ops, write_ratio, samples, errors, seed):
+    rng = random.Random(seed)
+    for _ in range(ops):
+        job_id = rng.randint(1, ROWS)
+        start = time.perf_counter()
+        connection = profile.connection()
+        try:
+            if rng.random() < write_ratio:
+                connection.execute(profile.begin())
+                try:
+                    connection.execute(
+                        "SELECT status FROM jobs WHERE id = ?", (job_id,)
+                    ).fetchone()
+                    connection.execute(
+                        "UPDATE jobs SET status = ?, updated = ? WHERE id = ?",
+                        ("running", time.time(), job_id),
+                    )
+                    connection.execute("COMMIT")
+                except sqlite3.OperationalError:
+                    connection.execute("ROLLBACK")
+                    raise
+            else:
+                connection.execute(
+                    "SELECT id, status, updated FROM jobs WHERE id = ?", (job_id,)
+                ).fetchone()
+        except sqlite3.OperationalError:
+            errors.append(1)
+            continue
+        finally:
+            profile.release(connection)
+        samples.append(time.perf_counter() - start)
+
+
+def run_profile(name, threads, ops, write_ratio):
+    directory = tempfile.mkdtemp(prefix="bench-sqlite-")
+    path = os.path.join(directory, "bench.sqlite3")
+    create_database(path)
+    profile = Profile(name, path)
+    samples, errors = [], []
+    workers = [
+        threading.Thread(
+            target=worker, args=(profile, ops, write_ratio, samples, errors, i)
+        )
+        for i in range(threads)
+    ]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    for filename in os.listdir(directory):
+        os.remove(os.path.join(directory, filename))
+    os.rmdir(directory)
+
+    report = summarize(samples)
+    report["errors"] = len(errors)
+    report["error_rate"] = len(errors) / (threads * ops)
+    report["wall_s"] = elapsed
+    report["throughput_ops_per_s"] = len(samples) / elapsed if elapsed else 0.0
+    return report
+
+
+def main():
+    parser = base_parser(__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=300, help="Operations per thread.")
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+    report = {
+        name: run_profile(name, args.threads, args.ops, args.write_ratio)
+        for name in ("development", "production")
+    }
+    emit_report({"sqlite_concurrency": report}, args.json)
+
+
+if __name__ == "__main__":
+    main()
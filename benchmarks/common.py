@@ -0,0 +1,74 @@
+"""Shared helpers for the benchmark scripts in `benchmarks/`.
+
+Benchmarks run against a throw-away test database created from the
+project's migrations (`benchmark_database`, see `core.testing`), never
+against `db.sqlite3`. Each script is a module that can be executed with
+`python -m benchmarks.<name>` from the project root.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from app_quiz.offline import percentile
+
+
+def setup_django():
+    """Configure settings and populate the app registry."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+
+    django.setup()
+
+
+def benchmark_database(sqlite_file=False):
+    """`core.testing.temporary_database`; import it after `setup_django()`."""
+    from core.testing import temporary_database
+
+    return temporary_database(sqlite_file=sqlite_file)
+
+
+def summarize(samples):
+    """Summarize a list of durations in seconds."""
+    total = sum(samples)
+    return {
+        "count": len(samples),
+        "total_s": total,
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "ops_per_s": len(samples) / total if total else 0.0,
+    }
+
+
+def measure(func, iterations, warmup=1):
+    """Call `func` `iterations` times and return `summarize()` of the timings."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def base_parser(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--json", metavar="PATH", help="Also write the report as JSON to PATH."
+    )
+    return parser
+
+
+def emit_report(report, json_path=None):
+    """Print `report` and optionally write it to `json_path`."""
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if json_path:
+        with open(json_path, "w") as fh:
+            fh.write(text + "\n")
+    sys.stdout.write(text + "\n")
@@ -0,0 +1,107 @@
+"""Run the offline benchmark suite and write one JSON report per release.
+
+Runs `bench_pipeline` and `bench_api` in a single throw-away database and
+adds the environment (git commit, Python and Django versions, database
+engine) to the report. With `--compare` the p50/p95 latencies and
+throughputs are printed next to those of an earlier report, so two
+releases can be compared on the same machine.
+
+Usage:
+    python -m benchmarks.suite --json report.json [--compare baseline.json] \
+        [--quick] [--whisper]
+"""
+
+import json
+import platform
+import subprocess
+import sys
+
+from benchmarks import bench_api, bench_pipeline
+from benchmarks.common import (
+    base_parser,
+    benchmark_database,
+    emit_report,
+    setup_django,
+)
+
+COMPARED_KEYS = ("p50_ms", "p95_ms", "ops_per_s", "throughput_quizzes_per_s")
+
+
+def environment():
+    import django
+    from django.db import connection
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "machine": platform.machine(),
+    }
+
+
+def flatten(report, prefix=""):
+    """Yield `(path, value)` for the compared numbers in `report`."""
+    for key, value in sorted(report.items()):
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from flatten(value, path)
+        elif key in COMPARED_KEYS:
+            yield path, value
+
+
+def compare(baseline, report):
+    """Return lines comparing `report` with `baseline` (ratio new/old)."""
+    old = dict(flatten(baseline))
+    lines = []
+    for path, value in flatten(report):
+        if path not in old:
+            continue
+        ratio = value / old[path] if old[path] else float("inf")
+        lines.append(f"{path}: {old[path]:.3f} -> {value:.3f} ({ratio:.2f}x)")
+    return lines
+
+
+def main():
+    parser = base_parser(__doc__.splitlines()[0])
+    parser.add_argument(
+        "--compare", metavar="PATH", help="Earlier report to compare against."
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Fewer iterations and smaller sizes."
+    )
+    parser.add_argument(
+        "--whisper",
+        action="store_true",
+        help="Transcribe the audio fixture with the real Whisper model.",
+    )
+    args = parser.parse_args()
+    if args.quick:
+        jobs, sizes, iterations, login_iterations = 10, [10, 100], 20, 3
+    else:
+        jobs, sizes, iterations, login_iterations = 50, [10, 100, 1000], 100, 10
+    setup_django()
+    with benchmark_database():
+        report = {
+            "environment": environment(),
+            "pipeline": bench_pipeline.run(jobs, jobs, args.whisper),
+            "api": bench_api.run(sizes, iterations, login_iterations, questions=10),
+        }
+    emit_report(report, args.json)
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        sys.stdout.write("\n".join(compare(baseline, report)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
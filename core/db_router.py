@@ -0,0 +1,95 @@
+"""Route quiz reads to read replicas with read-your-writes stickiness.
+
+Views opt in by running their read path inside `read_from_replica()` (see
+`app_quiz.api.mixins.ReplicaReadMixin`); every other query, and every
+write, uses the primary (`default`). A replica is not used when:
+
+- No replicas are configured (`DATABASE_READ_REPLICAS` is empty).
+- The primary connection is inside a transaction, whose own writes a
+  replica cannot see.
+- The requesting user wrote quiz data within the last
+  `READ_REPLICA_STICKY_SECONDS` (`mark_recent_write()`), so replication lag
+  cannot hide their own changes from them.
+
+Settings:
+- `DATABASE_READ_REPLICAS`: Aliases in `DATABASES` to read from.
+- `READ_REPLICA_STICKY_SECONDS`: Length of the read-your-writes window.
+- `READ_REPLICA_CACHE_ALIAS`: Cache holding the recent-write markers; use a
+  shared backend with several worker processes.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+_read_alias = ContextVar("replica_read_alias", default=None)
+
+
+def get_cache():
+    return caches[settings.READ_REPLICA_CACHE_ALIAS]
+
+
+def _recent_write_key(user_id) -> str:
+    return f"db:recent-write:{user_id}"
+
+
+def mark_recent_write(user_id) -> None:
+    """Pin `user_id`'s reads to the primary once the current write commits."""
+    if user_id is None or not settings.DATABASE_READ_REPLICAS:
+        return
+
+    def mark():
+        get_cache().set(
+            _recent_write_key(user_id), True, settings.READ_REPLICA_STICKY_SECONDS
+        )
+
+    transaction.on_commit(mark)
+
+
+def has_recent_write(user_id) -> bool:
+    return user_id is not None and bool(get_cache().get(_recent_write_key(user_id)))
+
+
+def choose_read_alias(user_id=None) -> str | None:
+    """Return a replica alias for reads by `user_id`, or None for the primary."""
+    replicas = settings.DATABASE_READ_REPLICAS
+    if not replicas or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return None
+    if has_recent_write(user_id):
+        return None
+    return random.choice(replicas)
+
+
+@contextmanager
+def read_from_replica(user_id=None):
+    """Send reads inside the block to a replica chosen by `choose_read_alias`.
+
+    Yields the chosen alias (None when the primary is used).
+    """
+    token = _read_alias.set(choose_read_alias(user_id))
+    try:
+        yield _read_alias.get()
+    finally:
+        _read_alias.reset(token)
+
+
+class ReadReplicaRouter:
+    """Database router backing `read_from_replica()`."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication.
+        return db == DEFAULT_DB_ALIAS
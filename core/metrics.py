@@ -0,0 +1,353 @@
+"""Process-safe metrics with a Prometheus text endpoint and Server-Timing.
+
+Counters and histograms are kept in memory per process and written to
+`METRICS_DIR/<pid>.json` at most every `METRICS_FLUSH_INTERVAL` seconds
+(write to a temporary file, then an atomic rename), on exit and before a
+scrape. `metrics_view` merges the files of all worker processes on each
+scrape: counter values, bucket counts and sums are added up, so the
+endpoint reports totals no matter which process serves it. Files of
+processes that are no longer running are deleted while merging, so like
+any Prometheus counter the totals drop when a worker exits (`rate()`
+treats that as a reset).
+
+Values that already live in a shared store are exposed through collectors
+(`register_collector`) evaluated at scrape time instead.
+
+`ServerTimingMiddleware` reports the timings recorded with `record_timing`
+while a request is handled in a `Server-Timing` response header (durations
+in milliseconds), followed by the total time spent in the view.
+
+Settings:
+- `METRICS_ENABLED`: Serve `/metrics` (off by default); otherwise it
+  returns 404.
+- `METRICS_TOKEN`: If set, `/metrics` requires the header
+  `Authorization: Bearer <token>` and returns 403 without it.
+- `METRICS_DIR`: Directory shared by all worker processes of a host.
+- `METRICS_FLUSH_INTERVAL`: Max. seconds between writes of a process's
+  file (0 writes after every update).
+"""
+
+import atexit
+import contextvars
+import hmac
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+_definitions = {}
+_collectors = []
+_values = {}
+_lock = threading.Lock()
+_write_lock = threading.Lock()
+_owner_pid = None
+_dirty = False
+_flush_timer = None
+_timings = contextvars.ContextVar("server_timings", default=None)
+
+
+class Metric:
+    """Handle to a registered counter or histogram."""
+
+    def __init__(self, name: str, kind: str, help_text: str, buckets=None):
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.buckets = tuple(buckets) if buckets else None
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        _update(self, amount, labels)
+
+    def observe(self, value: float, **labels) -> None:
+        _update(self, value, labels)
+
+
+def counter(name: str, help_text: str) -> Metric:
+    """Register (or return) the counter `name`."""
+    return _register(Metric(name, "counter", help_text))
+
+
+def histogram(name: str, help_text: str, buckets=DURATION_BUCKETS) -> Metric:
+    """Register (or return) the histogram `name` with upper bounds `buckets`."""
+    return _register(Metric(name, "histogram", help_text, buckets))
+
+
+def _register(metric: Metric) -> Metric:
+    with _lock:
+        return _definitions.setdefault(metric.name, metric)
+
+
+def register_collector(name: str, kind: str, help_text: str, collect) -> None:
+    """Expose a metric whose samples are computed at scrape time.
+
+    Parameters:
+    - name (str): Metric name.
+    - kind (str): Prometheus type, e.g. "counter" or "gauge".
+    - help_text (str): HELP line.
+    - collect (callable): Returns `(labels_dict, value)` pairs; it should
+      read a store shared by all processes (e.g. the cache).
+    """
+    with _lock:
+        if all(existing[0] != name for existing in _collectors):
+            _collectors.append((name, kind, help_text, collect))
+
+
+def _path(pid: int) -> str:
+    return os.path.join(settings.METRICS_DIR, f"{pid}.json")
+
+
+def _labels_key(labels: dict) -> str:
+    return json.dumps(labels, sort_keys=True)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # E.g. PermissionError: the process runs as another user.
+        return True
+    return True
+
+
+def _claim_values() -> None:
+    """Drop values inherited from a parent process (caller holds `_lock`)."""
+    global _owner_pid, _dirty, _flush_timer
+    if _owner_pid != os.getpid():
+        _values.clear()
+        _owner_pid = os.getpid()
+        _dirty = False
+        _flush_timer = None
+
+
+def _update(metric: Metric, value: float, labels: dict) -> None:
+    global _dirty, _flush_timer
+    with _lock:
+        _claim_values()
+        series = _values.setdefault(
+            metric.name,
+            {"kind": metric.kind, "buckets": metric.buckets, "samples": {}},
+        )
+        key = _labels_key(labels)
+        if metric.kind == "counter":
+            series["samples"][key] = series["samples"].get(key, 0) + value
+        else:
+            sample = series["samples"].setdefault(
+                key, {"counts": [0] * len(metric.buckets), "sum": 0.0, "count": 0}
+            )
+            for index, bound in enumerate(metric.buckets):
+                if value <= bound:
+                    sample["counts"][index] += 1
+            sample["sum"] += value
+            sample["count"] += 1
+        _dirty = True
+        interval = settings.METRICS_FLUSH_INTERVAL
+        if interval > 0 and _flush_timer is None:
+            _flush_timer = threading.Timer(interval, flush)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+    if interval <= 0:
+        flush()
+
+
+def flush() -> None:
+    """Write this process's values to its file if they changed."""
+    global _dirty, _flush_timer
+    with _write_lock:
+        with _lock:
+            if _flush_timer is not None:
+                _flush_timer.cancel()
+                _flush_timer = None
+            if not _dirty or _owner_pid != os.getpid():
+                return
+            data = json.dumps(_values)
+            _dirty = False
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=settings.METRICS_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w") as fh:
+            fh.write(data)
+        os.replace(tmp_path, _path(os.getpid()))
+
+
+atexit.register(flush)
+
+
+def merged_values() -> dict:
+    """Return the metric values of all running processes, added up.
+
+    Files of processes that are no longer running are deleted.
+    """
+    flush()
+    merged = {}
+    try:
+        names = sorted(os.listdir(settings.METRICS_DIR))
+    except OSError:
+        names = []
+    for name in names:
+        stem, extension = os.path.splitext(name)
+        if extension != ".json" or not stem.isdigit():
+            continue
+        path = os.path.join(settings.METRICS_DIR, name)
+        if not _pid_alive(int(stem)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        try:
+            with open(path) as fh:
+                values = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        for metric_name, series in values.items():
+            target = merged.setdefault(metric_name, {**series, "samples": {}})
+            if target["buckets"] != series["buckets"]:
+                # Bucket bounds changed between deployments; skip old data.
+                continue
+            for key, sample in series["samples"].items():
+                if series["kind"] == "counter":
+                    target["samples"][key] = target["samples"].get(key, 0) + sample
+                    continue
+                merged_sample = target["samples"].setdefault(
+                    key,
+                    {"counts": [0] * len(series["buckets"]), "sum": 0.0, "count": 0},
+                )
+                for index, count in enumerate(sample["counts"]):
+                    merged_sample["counts"][index] += count
+                merged_sample["sum"] += sample["sum"]
+                merged_sample["count"] += sample["count"]
+    return merged
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in sorted(labels.items())
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render() -> str:
+    """Return all metrics in the Prometheus text exposition format."""
+    lines = []
+    merged = merged_values()
+    for name in sorted(merged):
+        series = merged[name]
+        definition = _definitions.get(name)
+        help_text = definition.help_text if definition else name
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {series['kind']}")
+        for key in sorted(series["samples"]):
+            labels = json.loads(key)
+            sample = series["samples"][key]
+            if series["kind"] == "counter":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(sample)}")
+                continue
+            for bound, count in zip(series["buckets"], sample["counts"]):
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{name}_bucket{bucket_labels} {count}")
+            inf_labels = _format_labels({**labels, "le": "+Inf"})
+            lines.append(f"{name}_bucket{inf_labels} {sample['count']}")
+            lines.append(
+                f"{name}_sum{_format_labels(labels)} {_format_value(sample['sum'])}"
+            )
+            lines.append(f"{name}_count{_format_labels(labels)} {sample['count']}")
+    for name, kind, help_text, collect in list(_collectors):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in collect():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    """Serve `render()` as `text/plain; version=0.0.4`.
+
+    Raises:
+    - Http404: If `METRICS_ENABLED` is off.
+    - PermissionDenied: If `METRICS_TOKEN` is set and the request does not
+      carry it as a bearer token.
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        given = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(given.encode(), expected.encode()):
+            raise PermissionDenied
+    return HttpResponse(render(), content_type="text/plain; version=0.0.4")
+
+
+def clear() -> None:
+    """Forget this process's values and remove its file (used by tests)."""
+    global _owner_pid, _dirty, _flush_timer
+    with _lock:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+        _values.clear()
+        _owner_pid = None
+        _dirty = False
+        _flush_timer = None
+        try:
+            os.remove(_path(os.getpid()))
+        except OSError:
+            pass
+
+
+def record_timing(name: str, seconds: float) -> None:
+    """Add a `Server-Timing` entry to the response of the current request.
+
+    Does nothing outside a request handled by `ServerTimingMiddleware`
+    (e.g. in background workers).
+    """
+    timings = _timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+def server_timing_header(timings) -> str:
+    """Format `(name, seconds)` pairs as a `Server-Timing` header value."""
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings)
+
+
+class ServerTimingMiddleware:
+    """Report timings recorded during the request in `Server-Timing`."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = []
+        token = _timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _timings.reset(token)
+        timings.append(("total", time.perf_counter() - start))
+        header = server_timing_header(timings)
+        if response.has_header("Server-Timing"):
+            header = f"{response['Server-Timing']}, {header}"
+        response["Server-Timing"] = header
+        return response
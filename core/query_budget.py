@@ -0,0 +1,144 @@
+"""Per-request SQL query budgets for the API endpoints.
+
+`QueryBudgetMiddleware` counts the SQL queries of every request and the
+time spent executing them (via `connection.execute_wrapper` on all
+database aliases) and records them per URL name and HTTP method. Each
+endpoint declares the most queries it may run in `QUERY_BUDGETS`; a
+request that runs more is reported together with its SQL.
+
+The test runner `core.test_runner.QueryBudgetRunner` switches the mode to
+"raise", so every request made by any test is checked against its budget.
+`core/tests/test_query_budgets.py` additionally runs each endpoint at two
+dataset sizes and fails if the query count grows with the number of rows
+(N+1 queries).
+
+Settings:
+- `QUERY_BUDGET_MODE`: "off" (default) skips counting, "warn" logs
+  requests over budget, "raise" raises `QueryBudgetExceeded`.
+"""
+
+import logging
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+# URL name -> HTTP method -> maximum number of queries per request.
+QUERY_BUDGETS = {
+    "registration": {"POST": 2},
+    "login": {"POST": 1},
+    # Revoking a token and rebuilding the revocation Bloom filter.
+    "logout": {"POST": 5},
+    "token_refresh": {"POST": 4},
+    # With `QUIZ_JOBS_EAGER` the whole pipeline runs inside the request.
+    "create_quiz": {"POST": 13},
+    "create_quiz_async": {"POST": 13},
+    "quiz_list": {"GET": 4},
+    "quiz_detail": {"GET": 4, "PATCH": 5, "DELETE": 6},
+    "quiz_job_detail": {"GET": 1},
+    "metrics": {"GET": 0},
+}
+
+_SAVEPOINT_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+_stats = {}
+_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in "raise" mode when a request runs more queries than allowed."""
+
+
+class QueryRecorder:
+    """`execute_wrapper` that counts queries and the time spent in them.
+
+    Savepoint statements are not counted: they only appear when a request
+    runs inside an outer transaction, as in `TestCase`.
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            if not sql.startswith(_SAVEPOINT_STATEMENTS):
+                self.queries.append(sql)
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        return False
+
+
+def budget_for(url_name: str, method: str) -> int | None:
+    """Return the declared budget of an endpoint, or None if it has none."""
+    return QUERY_BUDGETS.get(url_name, {}).get(method)
+
+
+def record(url_name: str, method: str, recorder: QueryRecorder) -> None:
+    with _lock:
+        entry = _stats.setdefault(
+            (url_name, method),
+            {"requests": 0, "max_queries": 0, "queries": 0, "sql_seconds": 0.0},
+        )
+        entry["requests"] += 1
+        entry["queries"] += len(recorder.queries)
+        entry["max_queries"] = max(entry["max_queries"], len(recorder.queries))
+        entry["sql_seconds"] += recorder.seconds
+
+
+def stats() -> dict:
+    """Return the recorded figures per `(url_name, method)`."""
+    with _lock:
+        return {key: dict(entry) for key, entry in _stats.items()}
+
+
+def clear() -> None:
+    with _lock:
+        _stats.clear()
+
+
+class QueryBudgetMiddleware:
+    """Count the queries of each request and enforce `QUERY_BUDGETS`."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = settings.QUERY_BUDGET_MODE
+        if mode == "off":
+            return self.get_response(request)
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        match = request.resolver_match
+        if match is None or not match.url_name:
+            return response
+        record(match.url_name, request.method, recorder)
+        budget = budget_for(match.url_name, request.method)
+        if budget is not None and len(recorder.queries) > budget:
+            message = "{} {} ran {} queries, budget is {}:\n{}".format(
+                request.method,
+                match.url_name,
+                len(recorder.queries),
+                budget,
+                "\n".join(recorder.queries),
+            )
+            if mode == "raise":
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
@@ -12,8 +12,11 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 from dotenv import load_dotenv
 
+from core.database import database_config
+
 load_dotenv()
 
 
@@ -54,6 +57,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.metrics.ServerTimingMiddleware",
+    "core.query_budget.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -87,10 +92,62 @@ WSGI_APPLICATION = "core.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# `DATABASE_URL` switches to a server database; otherwise SQLite is used,
+# tuned for concurrency by the "production" profile (see core/database.py).
+
 DATABASES = {
+    "default": database_config(
+        BASE_DIR / "db.sqlite3",
+        url=os.environ.get("DATABASE_URL", ""),
+        profile=os.environ.get("DATABASE_PROFILE", "production"),
+        conn_max_age=int(os.environ.get("CONN_MAX_AGE", "60")),
+        busy_timeout_ms=int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        mmap_size=int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        cache_size_kib=int(os.environ.get("SQLITE_CACHE_SIZE_KIB", "65536")),
+    )
+}
+
+# Read replicas for quiz reads (see core/db_router.py). Comma-separated
+# database URLs; pointing one at the primary's own SQLite file
+# (e.g. "sqlite:///db.sqlite3") gives a local stand-in. In tests replicas
+# mirror the test database.
+
+for index, replica_url in enumerate(
+    url for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if url
+):
+    DATABASES[f"replica_{index}"] = {
+        **database_config(
+            BASE_DIR / "db.sqlite3",
+            url=replica_url,
+            profile=os.environ.get("DATABASE_PROFILE", "production"),
+            conn_max_age=int(os.environ.get("CONN_MAX_AGE", "60")),
+        ),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_READ_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["core.db_router.ReadReplicaRouter"]
+READ_REPLICA_STICKY_SECONDS = int(os.environ.get("READ_REPLICA_STICKY_SECONDS", "5"))
+READ_REPLICA_CACHE_ALIAS = os.environ.get("READ_REPLICA_CACHE_ALIAS", "default")
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The local-memory backend is per process. Deployments with several worker
+# processes should use a shared backend, e.g.
+# CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache with
+# CACHE_LOCATION=/var/tmp/quizly_cache.
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "quizly"),
+        "TIMEOUT": int(os.environ.get("CACHE_TIMEOUT", "300")),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", "5000")),
+        },
     }
 }
 
@@ -147,3 +204,135 @@ REST_FRAMEWORK = {
 }
 
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+
+# Authentication
+# `AUTH_USER_RESOLUTION` controls how `CookieJWTAuthentication` loads the
+# request user: "db" (query per request), "cache" (per-process cache keyed by
+# user id and token iat) or "claims" (token-only user for safe methods).
+# Logout/password-change/deactivation state lives in `AUTH_STATE_CACHE_ALIAS`.
+
+AUTH_USER_RESOLUTION = os.environ.get("AUTH_USER_RESOLUTION", "db")
+AUTH_USER_CACHE_TTL = int(os.environ.get("AUTH_USER_CACHE_TTL", "30"))
+AUTH_USER_CACHE_SIZE = int(os.environ.get("AUTH_USER_CACHE_SIZE", "10000"))
+AUTH_STATE_CACHE_ALIAS = os.environ.get("AUTH_STATE_CACHE_ALIAS", "default")
+
+# Sliding-window limits for login/registration (see app_auth.api.throttles)
+
+AUTH_THROTTLE_RATES = {
+    "login_ip": os.environ.get("LOGIN_IP_THROTTLE_RATE", "30/min"),
+    "login_username": os.environ.get("LOGIN_USERNAME_THROTTLE_RATE", "10/min"),
+    "register_ip": os.environ.get("REGISTER_IP_THROTTLE_RATE", "20/min"),
+}
+
+# Refresh-token revocation (see app_auth.revocation)
+
+REFRESH_REVOCATION_BLOOM_CAPACITY = int(
+    os.environ.get("REFRESH_REVOCATION_BLOOM_CAPACITY", "100000")
+)
+REFRESH_REVOCATION_FALSE_POSITIVE_RATE = float(
+    os.environ.get("REFRESH_REVOCATION_FALSE_POSITIVE_RATE", "0.001")
+)
+REFRESH_REVOCATION_SYNC_INTERVAL = float(
+    os.environ.get("REFRESH_REVOCATION_SYNC_INTERVAL", "5")
+)
+REFRESH_REVOCATION_SYNC_OVERLAP = float(
+    os.environ.get("REFRESH_REVOCATION_SYNC_OVERLAP", "60")
+)
+REFRESH_REVOCATION_PRUNE_INTERVAL = float(
+    os.environ.get("REFRESH_REVOCATION_PRUNE_INTERVAL", "3600")
+)
+
+# Quiz generation jobs
+# `QUIZ_JOB_WORKERS` sizes the in-process pool that runs the download,
+# transcription and generation pipeline. `QUIZ_JOBS_EAGER` runs jobs inline
+# in the request thread instead (useful for tests and debugging).
+
+QUIZ_JOB_WORKERS = int(os.environ.get("QUIZ_JOB_WORKERS", "2"))
+QUIZ_JOBS_EAGER = os.environ.get("QUIZ_JOBS_EAGER") == "True"
+
+# Durable job queue (see app_quiz.api.job_queue). With
+# `QUIZ_JOB_BACKEND=database` jobs stay in the `QuizJob` table until a
+# `manage.py run_quiz_workers` process claims them under a lease. Failed
+# attempts are retried with exponential backoff and dead-lettered after
+# `QUIZ_JOB_MAX_ATTEMPTS`; jobs whose lease expires (crashed worker) are
+# reclaimed automatically. Leases are not renewed past
+# `QUIZ_JOB_MAX_RUNTIME_SECONDS` after the claim, so hung jobs are reclaimed too.
+
+QUIZ_JOB_BACKEND = os.environ.get("QUIZ_JOB_BACKEND", "thread")
+QUIZ_JOB_MAX_ATTEMPTS = int(os.environ.get("QUIZ_JOB_MAX_ATTEMPTS", "3"))
+QUIZ_JOB_LEASE_SECONDS = int(os.environ.get("QUIZ_JOB_LEASE_SECONDS", "300"))
+QUIZ_JOB_MAX_RUNTIME_SECONDS = int(os.environ.get("QUIZ_JOB_MAX_RUNTIME_SECONDS", "1800"))
+QUIZ_JOB_RETRY_BACKOFF_SECONDS = int(os.environ.get("QUIZ_JOB_RETRY_BACKOFF_SECONDS", "30"))
+QUIZ_JOB_POLL_INTERVAL = float(os.environ.get("QUIZ_JOB_POLL_INTERVAL", "1.0"))
+
+# Concurrent submissions of the same video share one pipeline run (see
+# app_quiz.api.single_flight). With the thread backend, a leading job without
+# progress for this many seconds is treated as orphaned and replaced; running
+# leaders are refreshed by a heartbeat every third of this time.
+
+QUIZ_SINGLE_FLIGHT_STALE_SECONDS = int(os.environ.get("QUIZ_SINGLE_FLIGHT_STALE_SECONDS", "900"))
+
+# Asyncio job runner behind `createQuiz/async/` (see app_quiz.api.async_jobs).
+# Jobs are coroutines; blocking stages use the bounded thread pools below.
+
+QUIZ_ASYNC_MAX_IN_FLIGHT = int(os.environ.get("QUIZ_ASYNC_MAX_IN_FLIGHT", "500"))
+QUIZ_ASYNC_DOWNLOAD_WORKERS = int(os.environ.get("QUIZ_ASYNC_DOWNLOAD_WORKERS", "8"))
+QUIZ_TRANSCRIBE_WORKERS = int(os.environ.get("QUIZ_TRANSCRIBE_WORKERS", "1"))
+QUIZ_ASYNC_DB_WORKERS = int(os.environ.get("QUIZ_ASYNC_DB_WORKERS", "4"))
+
+# Copy an existing quiz generated for the same video instead of running the
+# pipeline again. Clients can override this per request with
+# `reuse_existing`.
+
+QUIZ_REUSE_EXISTING = os.environ.get("QUIZ_REUSE_EXISTING") == "True"
+
+# Cursor pagination of `quizzes/` (clients may pass `?page_size=`).
+
+QUIZ_PAGE_SIZE = int(os.environ.get("QUIZ_PAGE_SIZE", "20"))
+QUIZ_MAX_PAGE_SIZE = int(os.environ.get("QUIZ_MAX_PAGE_SIZE", "100"))
+
+# Cache of rendered quiz detail and list payloads (see
+# `app_quiz.api.payload_cache`).
+
+QUIZ_CACHE_ENABLED = os.environ.get("QUIZ_CACHE_ENABLED", "True") == "True"
+QUIZ_CACHE_ALIAS = os.environ.get("QUIZ_CACHE_ALIAS", "default")
+QUIZ_CACHE_TIMEOUT = int(os.environ.get("QUIZ_CACHE_TIMEOUT", "60"))
+
+# Whisper transcription
+# `WHISPER_MODEL` selects the model size loaded once per process.
+# `WHISPER_PREWARM` loads it and runs a dummy transcription at start-up.
+# `WHISPER_LANGUAGE` forces a transcription language (empty = auto-detect).
+
+WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "tiny")
+WHISPER_PREWARM = os.environ.get("WHISPER_PREWARM") == "True"
+WHISPER_LANGUAGE = os.environ.get("WHISPER_LANGUAGE", "")
+
+# Transcript cache
+# Transcripts are stored per (video_id, WHISPER_MODEL, WHISPER_LANGUAGE) and
+# evicted least-recently-used once their total size exceeds the limit.
+
+TRANSCRIPT_CACHE_ENABLED = (
+    os.environ.get("TRANSCRIPT_CACHE_ENABLED", "True") == "True"
+)
+TRANSCRIPT_CACHE_MAX_BYTES = int(
+    os.environ.get("TRANSCRIPT_CACHE_MAX_BYTES", str(100 * 1024 * 1024))
+)
+
+# Metrics (see core.metrics). Worker processes write their values to
+# `METRICS_DIR` at most every `METRICS_FLUSH_INTERVAL` seconds; `/metrics`
+# merges the files of running processes into one Prometheus text response.
+# The endpoint is off by default; set `METRICS_TOKEN` to require a bearer
+# token from the scraper.
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "False") == "True"
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_DIR = os.environ.get(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), "quizly-metrics")
+)
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "1.0"))
+
+# SQL query budgets per endpoint (see core.query_budget). The test runner
+# enforces them on every test request; "warn" logs violations elsewhere.
+
+QUERY_BUDGET_MODE = os.environ.get("QUERY_BUDGET_MODE", "off")
+TEST_RUNNER = "core.test_runner.QueryBudgetRunner"
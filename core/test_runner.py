@@ -0,0 +1,55 @@
+"""Test runner that enforces the per-endpoint SQL query budgets.
+
+Every request made through the test client runs with
+`QUERY_BUDGET_MODE = "raise"`, so a change that adds queries to an
+endpoint fails the test that exercises it (see `core.query_budget`). With
+`--verbosity 2` or higher the recorded query counts and SQL time per
+endpoint are printed after the run.
+
+Metrics (see `core.metrics`) are written to a temporary `METRICS_DIR` that
+is removed after the run, so test traffic never reaches the shared
+directory of a development server.
+"""
+
+import shutil
+import sys
+import tempfile
+
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+from core import metrics, query_budget
+
+
+class QueryBudgetRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        query_budget.clear()
+        self._metrics_dir = tempfile.mkdtemp(prefix="quizly-test-metrics-")
+        self._test_settings = override_settings(
+            QUERY_BUDGET_MODE="raise", METRICS_DIR=self._metrics_dir
+        )
+        self._test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        metrics.clear()
+        self._test_settings.disable()
+        shutil.rmtree(self._metrics_dir, ignore_errors=True)
+        if self.verbosity >= 2:
+            self.write_query_report(sys.stderr)
+        super().teardown_test_environment(**kwargs)
+
+    def write_query_report(self, stream):
+        stream.write("\nSQL queries per request:\n")
+        stream.write(
+            f"{'endpoint':<28}{'method':<8}{'requests':>9}{'max':>5}"
+            f"{'budget':>8}{'mean SQL ms':>13}\n"
+        )
+        for (url_name, method), entry in sorted(query_budget.stats().items()):
+            budget = query_budget.budget_for(url_name, method)
+            mean_ms = entry["sql_seconds"] / entry["requests"] * 1000
+            stream.write(
+                f"{url_name:<28}{method:<8}{entry['requests']:>9}"
+                f"{entry['max_queries']:>5}{budget if budget is not None else '-':>8}"
+                f"{mean_ms:>13.2f}\n"
+            )
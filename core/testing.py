@@ -0,0 +1,53 @@
+"""Throw-away databases for benchmarks and the in-process load test.
+
+`temporary_database()` creates a test database from the project's
+migrations, like the test runner does, so tools such as
+`manage.py loadtest` and the scripts in `benchmarks/` never touch the
+configured database.
+"""
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core import metrics
+
+
+@contextmanager
+def temporary_database(sqlite_file: bool = False):
+    """Create a fresh test database for the duration of the block.
+
+    SQLite test databases live in memory by default. With `sqlite_file`
+    a temporary file is used instead, so concurrent threads get their own
+    connections and locking behaves like in production. Metrics go to a
+    temporary `METRICS_DIR` that is removed afterwards.
+    """
+    setup_test_environment()
+    metrics_dir = tempfile.mkdtemp(prefix="quizly-metrics-")
+    metrics_settings = override_settings(METRICS_DIR=metrics_dir)
+    metrics_settings.enable()
+    old_name = connection.settings_dict["NAME"]
+    old_test_name = connection.settings_dict["TEST"]["NAME"]
+    directory = None
+    if sqlite_file and connection.vendor == "sqlite":
+        directory = tempfile.mkdtemp(prefix="quizly-db-")
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(
+            directory, "db.sqlite3"
+        )
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        metrics.clear()
+        metrics_settings.disable()
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        teardown_test_environment()
+        if directory is not None:
+            connection.settings_dict["TEST"]["NAME"] = old_test_name
+            shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from app_quiz.models import Quiz
+from core import db_router
+
+
+@override_settings(DATABASE_READ_REPLICAS=["replica_0"], READ_REPLICA_STICKY_SECONDS=5)
+class TestReadReplicaRouter(SimpleTestCase):
+    """Tests for replica selection and read-your-writes stickiness."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.router = db_router.ReadReplicaRouter()
+
+    def test_reads_use_replica_only_inside_block(self):
+        self.assertIsNone(self.router.db_for_read(Quiz))
+        with db_router.read_from_replica(user_id=1) as alias:
+            self.assertEqual(alias, "replica_0")
+            self.assertEqual(self.router.db_for_read(Quiz), "replica_0")
+            self.assertEqual(self.router.db_for_write(Quiz), "default")
+        self.assertIsNone(self.router.db_for_read(Quiz))
+
+    def test_recent_writer_reads_from_primary(self):
+        with patch("core.db_router.transaction.on_commit", lambda func: func()):
+            db_router.mark_recent_write(1)
+        with db_router.read_from_replica(user_id=1) as alias:
+            self.assertIsNone(alias)
+        with db_router.read_from_replica(user_id=2) as alias:
+            self.assertEqual(alias, "replica_0")
+
+    @override_settings(DATABASE_READ_REPLICAS=[])
+    def test_without_replicas_reads_use_primary(self):
+        with db_router.read_from_replica(user_id=1) as alias:
+            self.assertIsNone(alias)
+
+    def test_migrations_only_on_primary(self):
+        self.assertTrue(self.router.allow_migrate("default", "app_quiz"))
+        self.assertFalse(self.router.allow_migrate("replica_0", "app_quiz"))
@@ -0,0 +1,142 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from app_auth.api import throttles
+from core import metrics
+
+
+class MetricsDirMixin:
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.metrics_dir = directory.name
+        settings_override = override_settings(METRICS_DIR=self.metrics_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        metrics.clear()
+        self.addCleanup(metrics.clear)
+
+
+class TestMetrics(MetricsDirMixin, SimpleTestCase):
+    """Tests for per-process metric files and their merged rendering."""
+
+    def test_histogram_renders_buckets_sum_and_count(self):
+        histogram = metrics.histogram(
+            "test_stage_seconds", "Stage time.", buckets=[0.1, 1]
+        )
+        histogram.observe(0.05, stage="a")
+        histogram.observe(0.5, stage="a")
+
+        text = metrics.render()
+
+        self.assertIn("# TYPE test_stage_seconds histogram", text)
+        self.assertIn('test_stage_seconds_bucket{le="0.1",stage="a"} 1', text)
+        self.assertIn('test_stage_seconds_bucket{le="1",stage="a"} 2', text)
+        self.assertIn('test_stage_seconds_bucket{le="+Inf",stage="a"} 2', text)
+        self.assertIn('test_stage_seconds_sum{stage="a"} 0.55', text)
+        self.assertIn('test_stage_seconds_count{stage="a"} 2', text)
+
+    def test_values_of_all_processes_are_added_up(self):
+        counter = metrics.counter("test_jobs_total", "Jobs.")
+        counter.inc(outcome="done")
+        other = {
+            "test_jobs_total": {
+                "kind": "counter",
+                "buckets": None,
+                "samples": {'{"outcome": "done"}': 2, '{"outcome": "failed"}': 1},
+            }
+        }
+        # The parent process is alive, so its file is merged.
+        with open(os.path.join(self.metrics_dir, f"{os.getppid()}.json"), "w") as fh:
+            json.dump(other, fh)
+
+        text = metrics.render()
+
+        self.assertIn('test_jobs_total{outcome="done"} 3', text)
+        self.assertIn('test_jobs_total{outcome="failed"} 1', text)
+
+    def test_files_of_exited_processes_are_removed(self):
+        process = subprocess.Popen([sys.executable, "-c", ""])
+        process.wait()
+        path = os.path.join(self.metrics_dir, f"{process.pid}.json")
+        old = {"test_old_total": {"kind": "counter", "buckets": None, "samples": {}}}
+        with open(path, "w") as fh:
+            json.dump(old, fh)
+
+        self.assertNotIn("test_old_total", metrics.render())
+        self.assertFalse(os.path.exists(path))
+
+    @override_settings(METRICS_FLUSH_INTERVAL=60)
+    def test_updates_are_written_in_batches(self):
+        counter = metrics.counter("test_batched_total", "Batched.")
+        path = os.path.join(self.metrics_dir, f"{os.getpid()}.json")
+        with patch.object(metrics.os, "replace", wraps=os.replace) as mock_replace:
+            for _ in range(100):
+                counter.inc()
+            self.assertFalse(os.path.exists(path))
+            self.assertIn("test_batched_total 100", metrics.render())
+        mock_replace.assert_called_once()
+        self.assertTrue(os.path.exists(path))
+
+    def test_collectors_are_evaluated_on_scrape(self):
+        with patch.object(
+            throttles, "rejection_counts", return_value={"login": 4, "register": 0}
+        ):
+            text = metrics.render()
+
+        self.assertIn("# TYPE quizly_throttle_rejections_total counter", text)
+        self.assertIn('quizly_throttle_rejections_total{scope="login"} 4', text)
+
+    @override_settings(METRICS_ENABLED=True, METRICS_TOKEN="")
+    def test_metrics_endpoint(self):
+        metrics.counter("test_requests_total", "Requests.").inc()
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(b"test_requests_total 1", response.content)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_metrics_endpoint_disabled_404(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 404)
+
+    @override_settings(METRICS_ENABLED=True, METRICS_TOKEN="scrape-secret")
+    def test_metrics_endpoint_rejects_anonymous_requests(self):
+        url = reverse("metrics")
+
+        self.assertEqual(self.client.get(url).status_code, 403)
+        wrong = self.client.get(url, headers={"Authorization": "Bearer guess"})
+        self.assertEqual(wrong.status_code, 403)
+        response = self.client.get(
+            url, headers={"Authorization": "Bearer scrape-secret"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+class TestServerTimingMiddleware(SimpleTestCase):
+    def test_recorded_timings_and_total_are_reported(self):
+        def view(request):
+            metrics.record_timing("download", 0.25)
+            response = HttpResponse()
+            response["Server-Timing"] = "cache;dur=1.0"
+            return response
+
+        middleware = metrics.ServerTimingMiddleware(view)
+        response = middleware(RequestFactory().get("/"))
+
+        entries = [entry.strip() for entry in response["Server-Timing"].split(",")]
+        self.assertEqual(entries[:2], ["cache;dur=1.0", "download;dur=250.0"])
+        self.assertTrue(entries[2].startswith("total;dur="))
+
+    def test_record_timing_outside_request_is_ignored(self):
+        metrics.record_timing("download", 1)
+        self.assertEqual(metrics.server_timing_header([("a", 0.0015)]), "a;dur=1.5")
@@ -0,0 +1,240 @@
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from app_auth import revocation
+from app_auth.models import RevokedToken
+from app_quiz.api import jobs
+from app_quiz.models import Question, Quiz, QuizJob
+from core import query_budget
+
+SMALL, LARGE = 2, 8
+
+
+def named_patterns(patterns, skip=("admin",)):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace not in skip:
+                yield from named_patterns(pattern.url_patterns, skip)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield pattern.name
+
+
+def create_quiz(user, questions, video_id="ok-plXXHlWw"):
+    quiz = Quiz.objects.create(
+        creator=user,
+        title="Quiz",
+        description="Description",
+        video_url=f"https://www.youtube.com/watch?v={video_id}",
+    )
+    Question.objects.bulk_create(
+        Question(
+            quiz=quiz,
+            question_title=f"Question {index}",
+            question_options=["A", "B", "C", "D"],
+            answer="A",
+        )
+        for index in range(questions)
+    )
+    return quiz
+
+
+def create_user(name):
+    user = User.objects.create_user(
+        username=name, password="password", email=f"{name}@mail.de"
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return user, client
+
+
+class TestQueryBudgetDeclarations(SimpleTestCase):
+    def test_every_api_endpoint_has_a_budget(self):
+        names = set(named_patterns(get_resolver().url_patterns))
+        self.assertIn("quiz_list", names)
+        self.assertEqual(names - set(query_budget.QUERY_BUDGETS), set())
+
+
+@override_settings(
+    QUIZ_JOBS_EAGER=False,
+    QUIZ_CACHE_ENABLED=False,
+    AUTH_THROTTLE_RATES={"login_ip": None, "login_username": None, "register_ip": None},
+)
+class TestQueriesDoNotGrowWithRows(APITestCase):
+    """Each endpoint runs the same number of queries for small and large data.
+
+    Every scenario builds its data set for `SMALL` and `LARGE` rows and
+    requests the endpoint once per size; a difference means an N+1 query.
+    """
+
+    def setUp(self):
+        cache.clear()
+        revocation.clear()
+        self.addCleanup(revocation.clear)
+
+    def test_request_over_budget_raises_or_warns(self):
+        user, client = create_user("owner")
+        job = QuizJob.objects.create(
+            creator=user, video_id="ok-plXXHlWw", video_url="https://x.y/"
+        )
+        url = reverse("quiz_job_detail", kwargs={"id": job.pk})
+
+        with patch.dict(query_budget.QUERY_BUDGETS, {"quiz_job_detail": {"GET": 0}}):
+            with override_settings(QUERY_BUDGET_MODE="raise"):
+                with self.assertRaisesMessage(
+                    query_budget.QueryBudgetExceeded, "GET quiz_job_detail ran 1"
+                ):
+                    client.get(url)
+            with override_settings(QUERY_BUDGET_MODE="warn"):
+                with self.assertLogs("core.query_budget", "WARNING"):
+                    self.assertEqual(client.get(url).status_code, 200)
+
+    def assertConstantQueries(self, url_name, method, prepare):
+        """`prepare(size)` builds the data and returns the request to time."""
+        counts = {}
+        for size in (SMALL, LARGE):
+            send = prepare(size)
+            with query_budget.QueryRecorder() as recorder:
+                response = send()
+            self.assertLess(response.status_code, 400, response.content)
+            counts[size] = len(recorder.queries)
+        self.assertEqual(
+            counts[SMALL],
+            counts[LARGE],
+            f"{method} {url_name} queries grow with rows: {counts}",
+        )
+        self.assertLessEqual(counts[LARGE], query_budget.budget_for(url_name, method))
+
+    def test_quiz_list(self):
+        for view in ("full", "summary"):
+            with self.subTest(view=view):
+
+                def prepare(size, view=view):
+                    user, client = create_user(f"list_{view}_{size}")
+                    for _ in range(size):
+                        create_quiz(user, questions=size)
+                    query = "?view=summary" if view == "summary" else ""
+                    return lambda: client.get(reverse("quiz_list") + query)
+
+                self.assertConstantQueries("quiz_list", "GET", prepare)
+
+    def test_quiz_detail(self):
+        user, client = create_user("owner")
+        calls = {
+            "GET": lambda url: client.get(url),
+            "PATCH": lambda url: client.patch(url, {"title": "New"}, format="json"),
+            "DELETE": lambda url: client.delete(url),
+        }
+        for method, call in calls.items():
+            with self.subTest(method=method):
+
+                def prepare(size, call=call):
+                    quiz = create_quiz(user, questions=size)
+                    url = reverse("quiz_detail", kwargs={"id": quiz.pk})
+                    return lambda: call(url)
+
+                self.assertConstantQueries("quiz_detail", method, prepare)
+
+    def test_quiz_job_detail(self):
+        user, client = create_user("owner")
+
+        def prepare(size):
+            leader = QuizJob.objects.create(
+                creator=user, video_id=f"video{size:06d}", video_url="https://x.y/"
+            )
+            for index in range(size):
+                follower, _ = create_user(f"follower_{size}_{index}")
+                QuizJob.objects.create(
+                    creator=follower,
+                    video_id=leader.video_id,
+                    video_url="https://x.y/",
+                    leader=leader,
+                )
+            url = reverse("quiz_job_detail", kwargs={"id": leader.pk})
+            return lambda: client.get(url)
+
+        self.assertConstantQueries("quiz_job_detail", "GET", prepare)
+
+    def test_create_quiz_reusing_existing_quiz(self):
+        def prepare(size):
+            owner, _ = create_user(f"source_{size}")
+            video_id = f"video{size:06d}"
+            create_quiz(owner, questions=size, video_id=video_id)
+            _, client = create_user(f"creator_{size}")
+            payload = {
+                "url": f"https://www.youtube.com/watch?v={video_id}",
+                "reuse_existing": True,
+            }
+            return lambda: client.post(reverse("create_quiz"), payload, format="json")
+
+        self.assertConstantQueries("create_quiz", "POST", prepare)
+
+    @patch.object(jobs, "enqueue_quiz_job")
+    def test_create_quiz_following_in_flight_job(self, mock_enqueue):
+        def prepare(size):
+            payload = {"url": f"https://www.youtube.com/watch?v=video{size:06d}"}
+            for index in range(size):
+                _, client = create_user(f"waiting_{size}_{index}")
+                client.post(reverse("create_quiz"), payload, format="json")
+            _, client = create_user(f"creator_{size}")
+            return lambda: client.post(reverse("create_quiz"), payload, format="json")
+
+        self.assertConstantQueries("create_quiz", "POST", prepare)
+
+    def test_registration_and_login(self):
+        def fill_users(size):
+            User.objects.bulk_create(
+                User(username=name, email=f"{name}@mail.de")
+                for name in (uuid.uuid4().hex for _ in range(size))
+            )
+
+        def prepare_register(size):
+            fill_users(size)
+            payload = {
+                "username": f"new_{size}",
+                "email": f"new_{size}@mail.de",
+                "password": "password",
+                "confirmed_password": "password",
+            }
+            return lambda: APIClient().post(
+                reverse("registration"), payload, format="json"
+            )
+
+        def prepare_login(size):
+            fill_users(size)
+            User.objects.create_user(
+                username=f"login_{size}", password="password", email=f"l{size}@x.de"
+            )
+            payload = {"username": f"login_{size}", "password": "password"}
+            return lambda: APIClient().post(reverse("login"), payload, format="json")
+
+        self.assertConstantQueries("registration", "POST", prepare_register)
+        self.assertConstantQueries("login", "POST", prepare_login)
+
+    def test_token_refresh_and_logout(self):
+        def prepare(url_name):
+            def prepare_size(size):
+                expires_at = timezone.now() + timedelta(days=1)
+                RevokedToken.objects.bulk_create(
+                    RevokedToken(jti=uuid.uuid4().hex, expires_at=expires_at)
+                    for _ in range(size)
+                )
+                revocation.clear()
+                user, _ = create_user(f"{url_name}_{size}")
+                refresh = RefreshToken.for_user(user)
+                client = APIClient()
+                client.cookies["refresh_token"] = str(refresh)
+                client.cookies["access_token"] = str(refresh.access_token)
+                return lambda: client.post(reverse(url_name))
+
+            return prepare_size
+
+        self.assertConstantQueries("token_refresh", "POST", prepare("token_refresh"))
+        self.assertConstantQueries("logout", "POST", prepare("logout"))
@@ -1,8 +1,11 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from core.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("app_auth.api.urls")),
     path("api/", include("app_quiz.api.urls")),
+    path("metrics", metrics_view, name="metrics"),
 ]